@@ -9,34 +9,215 @@ Improvements from v2.2:
   - Support for dynamic renovation and geotechnical queries
 """
 
-import yaml
 import os
+import sys
+import time
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 
+# Shared estimation tooling (matrix cache, etc.) lives in <repo>/Tools
+TOOLS_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Tools"))
+if TOOLS_DIR not in sys.path:
+    sys.path.insert(0, TOOLS_DIR)
+
+from canonical_keys import BUILDING_TYPES, REGIONS, STAGES
+from context_builder import DEFAULT_CONTEXT_BUDGET, ContextBuilder, ContextSource
+from instrumentation import INSTRUMENTATION
+from matrix_cache import SharedMatrixCache, get_shared_cache
+from matrix_overlays import MatrixOverlays
+from prompt_content_cache import PromptContentCache, get_prompt_content_cache
+from registry_resolver import LocalPathIndex, find_latest_registry, get_local_path_index, validate_registry
+from renovation_cost_factors import DEFAULT_RENOVATION_MATRIX_FILE, RenovationCostFactors
+
+# Fields copied into each pre-built index entry, per registry section
+_LAYER1_FIELDS = ("name", "version", "file_path", "status", "description")
+_PROMPT_FIELDS = ("name", "version", "file_path", "status", "type", "description")
+_GC_FIELDS = ("name", "version", "file_path", "status", "gc_type", "building_type", "description")
+
+def _fold(value: Any) -> str:
+    """Case-fold an index key component."""
+    return str(value).casefold()
+
+def _canonical(keys, value: Any) -> Any:
+    """Canonical spelling of a region / building type / stage (unknown values pass through)."""
+    canonical = keys.canonical(value)
+    return value if canonical is None else canonical
+
+def _first_entry(config: Any) -> Optional[Dict[str, Any]]:
+    """Return the first (active) entry of a registry list, if well-formed."""
+    if isinstance(config, list) and config and isinstance(config[0], dict):
+        return config[0]
+    return None
+
+def _freeze(entry: Dict[str, Any], fields: tuple, local_paths: Dict[str, str]) -> MappingProxyType:
+    """Build an immutable index entry with the given fields and the entry's resolved local_path."""
+    frozen = {field: entry.get(field) for field in fields}
+    frozen["local_path"] = local_paths.get(entry.get("file_path"))
+    return MappingProxyType(frozen)
+
 class KnowledgePromptsRouter:
     """
     Dynamic router for knowledge prompts based on project parameters.
     Supports LAYER 1, LAYER 2, LAYER 3, and GC-specific knowledge.
+    
+    Prompt entries are resolved through an index built once per registry load,
+    keyed on case-folded (layer, building_type, prompt/tool/gc type). Returned
+    entries are shared, read-only mappings; use dict(entry) for a mutable copy.
+    
+    Registry file_path values are authoring-machine paths; each entry also
+    carries the local_path they resolve to in this checkout (None if missing),
+    validated once per registry load.
     """
     
-    def __init__(self, registry_path: str = "KNOWLEDGE_PROMPT_REGISTRY_v4.3.yaml"):
+    def __init__(
+        self,
+        registry_path: Optional[str] = None,
+        cache: Optional[SharedMatrixCache] = None,
+        auto_reload: bool = True,
+        content_cache: Optional[PromptContentCache] = None,
+        renovation_engine: Optional[RenovationCostFactors] = None,
+        path_index: Optional[LocalPathIndex] = None,
+        overlays: Optional[MatrixOverlays] = None
+    ):
         """
         Initialize the router with the knowledge prompt registry.
         
         Args:
-            registry_path: Path to the YAML registry file
+            registry_path: Path to the YAML registry file (defaults to the
+                highest-versioned Config/KNOWLEDGE_PROMPT_REGISTRY_*.yaml)
+            cache: Registry cache (defaults to the process-wide shared cache)
+            auto_reload: Pick up registry file changes on the next query
+            content_cache: Prompt file cache used by load_content()
+                (defaults to the process-wide prompt content cache)
+            renovation_engine: Engine evaluating get_renovation_factor() queries
+                (created on first use from the renovation cost factor matrix)
+            path_index: Local file index used to resolve registry file paths
+                (defaults to the process-wide index of this repository)
+            overlays: Per-GC matrix overrides; get_renovation_factor() queries
+                with a registered gc_type are evaluated on that GC's view
         """
+        if registry_path is None:
+            try:
+                registry_path = find_latest_registry()
+            except FileNotFoundError as e:
+                print(f"Warning: {e}")
         self.registry_path = registry_path
-        self.registry = self._load_registry()
+        self.auto_reload = auto_reload
+        self._cache = cache or get_shared_cache()
+        self._content_cache = content_cache or get_prompt_content_cache()
+        self._renovation_engine = renovation_engine
+        self._overlays = overlays
+        self._context_builder = None
+        self._path_index = path_index or get_local_path_index()
+        self._handlers = {
+            "LAYER1": self._get_layer1,
+            "LAYER2": self._get_layer2,
+            "LAYER3": self._get_layer3,
+            "GC_SPECIFIC": self._get_gc_specific,
+            "RENOVATION_FACTORS": self.get_renovation_factor,
+            "GEOTECHNICAL_FACTORS": self.get_geotechnical_factor
+        }
+        self._bind(self._load_registry())
     
     def _load_registry(self) -> Dict[str, Any]:
-        """Load the knowledge prompt registry from YAML file."""
+        """Load the knowledge prompt registry from YAML file (shared across routers)."""
+        if not self.registry_path:
+            return {}
+        start = time.perf_counter() if INSTRUMENTATION.enabled else None
         try:
-            with open(self.registry_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            registry = self._cache.get(self.registry_path)
         except FileNotFoundError:
             print(f"Warning: Registry file not found at {self.registry_path}")
             return {}
+        if start is not None:
+            INSTRUMENTATION.observe("registry_load_seconds", time.perf_counter() - start,
+                                    file=os.path.basename(self.registry_path))
+        return registry
+    
+    def _bind(self, registry: Dict[str, Any]) -> None:
+        """Point the router at a registry, resolve its files and rebuild its lookup index."""
+        self.registry = registry
+        start = time.perf_counter() if INSTRUMENTATION.enabled else None
+        self.validation = validate_registry(registry or {}, self._path_index)
+        if start is not None:
+            INSTRUMENTATION.observe("registry_validation_seconds", time.perf_counter() - start)
+        self.validation.report()
+        self._index = self._build_index(registry or {}, self.validation.resolved)
+    
+    def refresh(self) -> bool:
+        """
+        Re-bind to the current registry if the file changed on disk.
+        
+        Returns:
+            True if a newer registry was picked up
+        """
+        if not self.registry_path:
+            return False
+        start = time.perf_counter() if INSTRUMENTATION.enabled else None
+        try:
+            registry = self._cache.get(self.registry_path)
+        except FileNotFoundError:
+            return False
+        if registry is self.registry:
+            return False
+        if start is not None:
+            INSTRUMENTATION.observe("registry_load_seconds", time.perf_counter() - start,
+                                    file=os.path.basename(self.registry_path))
+        # A registry update may reference newly added prompt files
+        self._path_index.rebuild()
+        self._bind(registry)
+        return True
+    
+    @staticmethod
+    def _build_index(registry: Dict[str, Any], local_paths: Optional[Dict[str, str]] = None) -> Dict[tuple, MappingProxyType]:
+        """
+        Build the normalized prompt index for a registry.
+        
+        Args:
+            registry: Parsed registry
+            local_paths: Registry file_path -> local file, from validate_registry()
+        
+        Returns:
+            Dictionary keyed on case-folded (layer, building_type, prompt_type)
+            tuples; building_type is "" for sections that are not split by it
+        """
+        index = {}
+        local_paths = local_paths or {}
+        
+        layer1 = registry.get("LAYER1") or {}
+        if isinstance(layer1, dict):
+            for section, config in layer1.items():
+                entry = _first_entry(config)
+                if entry is None:
+                    continue
+                fields = _LAYER1_FIELDS if section == "CORE_ENGINE" else _PROMPT_FIELDS
+                index[("layer1", "", _fold(section))] = _freeze(entry, fields, local_paths)
+        
+        layer2 = registry.get("LAYER2") or {}
+        if isinstance(layer2, dict):
+            for building_type, building_config in layer2.items():
+                if not isinstance(building_config, dict):
+                    continue
+                for prompt_type, config in building_config.items():
+                    entry = _first_entry(config)
+                    if entry is not None:
+                        index[("layer2", _fold(building_type), _fold(prompt_type))] = _freeze(entry, _PROMPT_FIELDS, local_paths)
+        
+        layer3 = registry.get("LAYER3") or {}
+        if isinstance(layer3, dict):
+            for tool_type, config in layer3.items():
+                entry = _first_entry(config)
+                if entry is not None:
+                    index[("layer3", "", _fold(tool_type))] = _freeze(entry, _PROMPT_FIELDS, local_paths)
+        
+        gc_specific = registry.get("GC_SPECIFIC") or {}
+        if isinstance(gc_specific, dict):
+            for gc_type, config in gc_specific.items():
+                entry = _first_entry(config)
+                if entry is not None:
+                    index[("gc_specific", "", _fold(gc_type))] = _freeze(entry, _GC_FIELDS, local_paths)
+        
+        return index
     
     def get_knowledge_prompt(self, layer: str, **kwargs) -> Dict[str, Any]:
         """
@@ -49,102 +230,43 @@ class KnowledgePromptsRouter:
         Returns:
             Dictionary containing the knowledge prompt information
         """
+        if self.auto_reload:
+            self.refresh()
         
         # Route to appropriate handler based on layer
-        if layer == "LAYER1":
-            return self._get_layer1(kwargs)
-        elif layer == "LAYER2":
-            return self._get_layer2(kwargs)
-        elif layer == "LAYER3":
-            return self._get_layer3(kwargs)
-        elif layer == "GC_SPECIFIC":
-            return self._get_gc_specific(kwargs)
-        elif layer == "RENOVATION_FACTORS":
-            return self.get_renovation_factor(kwargs)
-        elif layer == "GEOTECHNICAL_FACTORS":
-            return self.get_geotechnical_factor(kwargs)
-        else:
+        handler = self._handlers.get(layer) or self._handlers.get(str(layer).upper())
+        if handler is None:
             return {"error": f"Unknown layer: {layer}"}
+        if not INSTRUMENTATION.enabled:
+            return handler(kwargs)
+        start = time.perf_counter()
+        try:
+            return handler(kwargs)
+        finally:
+            INSTRUMENTATION.observe("router_handler_seconds", time.perf_counter() - start, layer=str(layer))
     
     def _get_layer1(self, params: Dict) -> Dict[str, Any]:
         """Get LAYER 1 (Core Estimation Engine) knowledge prompt."""
-        try:
-            layer1 = self.registry.get("LAYER1", {})
-            core_engine = layer1.get("CORE_ENGINE", [])
-            if core_engine:
-                return {
-                    "name": core_engine[0].get("name"),
-                    "version": core_engine[0].get("version"),
-                    "file_path": core_engine[0].get("file_path"),
-                    "status": core_engine[0].get("status"),
-                    "description": core_engine[0].get("description")
-                }
-        except Exception as e:
-            return {"error": f"Error retrieving LAYER1: {str(e)}"}
+        return self._index.get(("layer1", "", "core_engine"))
     
     def _get_layer2(self, params: Dict) -> Dict[str, Any]:
         """Get LAYER 2 (Domain-Specific Knowledge) prompts."""
-        building_type = params.get("building_type", "warehouse").upper()
+        building_type = params.get("building_type", "warehouse")
         prompt_type = params.get("prompt_type", "KNOWLEDGE")  # KNOWLEDGE, CASE_DATABASE, DECISION_MATRIX
-        
-        try:
-            layer2 = self.registry.get("LAYER2", {})
-            building_config = layer2.get(building_type, {})
-            prompt_config = building_config.get(prompt_type, [])
-            
-            if prompt_config:
-                return {
-                    "name": prompt_config[0].get("name"),
-                    "version": prompt_config[0].get("version"),
-                    "file_path": prompt_config[0].get("file_path"),
-                    "status": prompt_config[0].get("status"),
-                    "type": prompt_config[0].get("type"),
-                    "description": prompt_config[0].get("description")
-                }
-        except Exception as e:
-            return {"error": f"Error retrieving LAYER2: {str(e)}"}
+        return self._index.get(("layer2", _fold(building_type), _fold(prompt_type)))
     
     def _get_layer3(self, params: Dict) -> Dict[str, Any]:
         """Get LAYER 3 (Optional Deep Verification Tools) prompts."""
         tool_type = params.get("tool_type", "CASE_FEATURE_EXTRACTION")
-        
-        try:
-            layer3 = self.registry.get("LAYER3", {})
-            tool_config = layer3.get(tool_type, [])
-            
-            if tool_config:
-                return {
-                    "name": tool_config[0].get("name"),
-                    "version": tool_config[0].get("version"),
-                    "file_path": tool_config[0].get("file_path"),
-                    "status": tool_config[0].get("status"),
-                    "type": tool_config[0].get("type"),
-                    "description": tool_config[0].get("description")
-                }
-        except Exception as e:
-            return {"error": f"Error retrieving LAYER3: {str(e)}"}
+        return self._index.get(("layer3", "", _fold(tool_type)))
     
     def _get_gc_specific(self, params: Dict) -> Dict[str, Any]:
         """Get GC-specific knowledge prompts."""
-        gc_type = params.get("gc_type", "UPRITE").upper()
-        building_type = params.get("building_type", "WAREHOUSE").upper()
-        
-        try:
-            gc_specific = self.registry.get("GC_SPECIFIC", {})
-            gc_config = gc_specific.get(gc_type, [])
-            
-            if gc_config:
-                return {
-                    "name": gc_config[0].get("name"),
-                    "version": gc_config[0].get("version"),
-                    "file_path": gc_config[0].get("file_path"),
-                    "status": gc_config[0].get("status"),
-                    "gc_type": gc_config[0].get("gc_type"),
-                    "building_type": gc_config[0].get("building_type"),
-                    "description": gc_config[0].get("description")
-                }
-        except Exception as e:
-            return {"error": f"Error retrieving GC_SPECIFIC: {str(e)}"}
+        gc_type = params.get("gc_type", "UPRITE")
+        entry = self._index.get(("gc_specific", "", _fold(gc_type)))
+        if entry and self._overlays is not None and gc_type in self._overlays:
+            entry = dict(entry, matrix_overrides=self._overlays.overrides(gc_type))
+        return entry
     
     def get_renovation_factor(self, params: Dict) -> Dict[str, Any]:
         """
@@ -156,37 +278,69 @@ class KnowledgePromptsRouter:
                 - renovation_scope: 'light', 'moderate', 'heavy'
                 - region: 'CA_Inland', 'CA_Coastal', 'CA_Bay_Area', 'TX_Coastal', 'TX_Inland', 'NY_Urban', 'FL_Statewide'
                 - stage: (optional) 'BIDDING', 'POST_AWARD', 'FINAL'
+                - new_construction_cost: (optional) cost to convert with the final factor
+                - gc_type: (optional) GC whose matrix overrides apply (see overlays)
         
         Returns:
-            Dictionary containing renovation factor information
+            Dictionary containing renovation factor information, the evaluated
+            factors (base_factor, regional_adjustment, final_factor, confidence,
+            breakdown) or an "error" if the matrix has no factor for the query
         """
-        building_type = params.get("building_type", "commercial_office").lower()
-        renovation_scope = params.get("renovation_scope", "moderate").lower()
-        region = params.get("region", "CA_Inland").upper()
-        stage = params.get("stage", "BIDDING").upper()
+        building_type = _canonical(BUILDING_TYPES, params.get("building_type", "commercial_office"))
+        renovation_scope = str(params.get("renovation_scope", "moderate")).lower()
+        region = _canonical(REGIONS, params.get("region", "CA_Inland"))
+        stage = _canonical(STAGES, params.get("stage", "BIDDING"))
+        gc_type = params.get("gc_type")
+        engine = self.renovation_engine
+        if gc_type is not None and self._overlays is not None and gc_type in self._overlays:
+            engine = self._overlays.renovation(gc_type)
         
-        try:
-            layer1 = self.registry.get("LAYER1", {})
-            renovation_factors = layer1.get("RENOVATION_FACTORS", [])
-            
-            if renovation_factors:
-                return {
-                    "name": renovation_factors[0].get("name"),
-                    "version": renovation_factors[0].get("version"),
-                    "file_path": renovation_factors[0].get("file_path"),
-                    "status": renovation_factors[0].get("status"),
-                    "type": renovation_factors[0].get("type"),
-                    "query_parameters": {
-                        "building_type": building_type,
-                        "renovation_scope": renovation_scope,
-                        "region": region,
-                        "stage": stage
-                    },
-                    "description": renovation_factors[0].get("description"),
-                    "note": "Use RENOVATION_COST_FACTOR_MATRIX_v1.0.yaml to query specific factors"
-                }
-        except Exception as e:
-            return {"error": f"Error retrieving renovation factor: {str(e)}"}
+        entry = self._index.get(("layer1", "", "renovation_factors"))
+        if entry:
+            result = {
+                "name": entry["name"],
+                "version": entry["version"],
+                "file_path": entry["file_path"],
+                "local_path": entry["local_path"],
+                "status": entry["status"],
+                "type": entry["type"],
+                "query_parameters": {
+                    "building_type": building_type,
+                    "renovation_scope": renovation_scope,
+                    "region": region,
+                    "stage": stage
+                },
+                "description": entry["description"]
+            }
+            if gc_type is not None:
+                result["query_parameters"]["gc_type"] = gc_type
+            try:
+                factor = engine.assess(
+                    building_type, renovation_scope, region, stage,
+                    new_construction_cost=params.get("new_construction_cost")
+                )
+            except ValueError as e:
+                result["error"] = str(e)
+                return result
+            result.update({
+                "base_factor": factor.base_factor,
+                "regional_adjustment": factor.regional_adjustment,
+                "final_factor": factor.final_factor,
+                "confidence": factor.confidence,
+                "breakdown": factor.breakdown
+            })
+            if factor.renovation_cost is not None:
+                result["renovation_cost"] = factor.renovation_cost
+            return result
+    
+    @property
+    def renovation_engine(self) -> RenovationCostFactors:
+        """Renovation factor engine (the registered matrix as resolved locally, else the repo's Data copy)."""
+        if self._renovation_engine is None:
+            entry = self._index.get(("layer1", "", "renovation_factors")) or {}
+            matrix_file = entry.get("local_path") or DEFAULT_RENOVATION_MATRIX_FILE
+            self._renovation_engine = RenovationCostFactors(matrix_file, cache=self._cache)
+        return self._renovation_engine
     
     def get_geotechnical_factor(self, params: Dict) -> Dict[str, Any]:
         """
@@ -201,31 +355,130 @@ class KnowledgePromptsRouter:
         Returns:
             Dictionary containing geotechnical factor information
         """
-        region = params.get("region", "CA_Inland").upper()
-        building_type = params.get("building_type", "warehouse").lower()
-        stage = params.get("stage", "BIDDING").upper()
+        region = _canonical(REGIONS, params.get("region", "CA_Inland"))
+        building_type = _canonical(BUILDING_TYPES, params.get("building_type", "warehouse"))
+        stage = _canonical(STAGES, params.get("stage", "BIDDING"))
+        
+        entry = self._index.get(("layer1", "", "geotechnical_factors"))
+        if entry:
+            return {
+                "name": entry["name"],
+                "version": entry["version"],
+                "file_path": entry["file_path"],
+                "local_path": entry["local_path"],
+                "status": entry["status"],
+                "type": entry["type"],
+                "query_parameters": {
+                    "region": region,
+                    "building_type": building_type,
+                    "stage": stage
+                },
+                "description": entry["description"],
+                "note": "Use GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml to query specific factors"
+            }
+    
+    def load_content(self, layer: Optional[str] = None, file_path: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Load the content of a knowledge prompt file.
+        
+        Resolves the prompt like get_knowledge_prompt() (or uses file_path
+        directly) and reads its local_path through the size-bounded prompt
+        content cache. Entries whose file did not resolve at registry load
+        fail without touching the filesystem.
+        
+        Args:
+            layer: Layer identifier, as for get_knowledge_prompt()
+            file_path: Read this file instead of resolving a registry entry
+            **kwargs: Additional parameters, as for get_knowledge_prompt()
+        
+        Returns:
+            Dictionary with name, version, file_path, content, sha256 and size
+            (sha256 identifies the exact bytes, for reusing LLM prompt-cache prefixes)
+        """
+        entry = {}
+        if file_path is None:
+            entry = self.get_knowledge_prompt(layer, **kwargs)
+            if not entry:
+                return {"error": f"No knowledge prompt registered for {layer} {kwargs}"}
+            if "error" in entry:
+                return entry
+            if not entry.get("file_path"):
+                return {"error": f"Knowledge prompt {entry.get('name')} has no file_path"}
+            file_path = entry.get("local_path")
+            if not file_path:
+                return {"error": f"Knowledge prompt file not found: {entry.get('file_path')}"}
         
         try:
-            layer1 = self.registry.get("LAYER1", {})
-            geotechnical_factors = layer1.get("GEOTECHNICAL_FACTORS", [])
-            
-            if geotechnical_factors:
-                return {
-                    "name": geotechnical_factors[0].get("name"),
-                    "version": geotechnical_factors[0].get("version"),
-                    "file_path": geotechnical_factors[0].get("file_path"),
-                    "status": geotechnical_factors[0].get("status"),
-                    "type": geotechnical_factors[0].get("type"),
-                    "query_parameters": {
-                        "region": region,
-                        "building_type": building_type,
-                        "stage": stage
-                    },
-                    "description": geotechnical_factors[0].get("description"),
-                    "note": "Use GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml to query specific factors"
-                }
-        except Exception as e:
-            return {"error": f"Error retrieving geotechnical factor: {str(e)}"}
+            prompt = self._content_cache.read(file_path)
+        except FileNotFoundError:
+            return {"error": f"Knowledge prompt file not found: {file_path}"}
+        except (OSError, UnicodeDecodeError) as e:
+            return {"error": f"Error reading knowledge prompt {file_path}: {str(e)}"}
+        
+        return {
+            "name": entry.get("name"),
+            "version": entry.get("version"),
+            "file_path": file_path,
+            "content": prompt.content,
+            "sha256": prompt.sha256,
+            "size": prompt.size
+        }
+    
+    @property
+    def context_builder(self) -> ContextBuilder:
+        """Section index of the registered prompt files (kept across requests)."""
+        if self._context_builder is None:
+            self._context_builder = ContextBuilder(self._content_cache)
+        return self._context_builder
+    
+    def build_context(
+        self,
+        profile: Optional[Dict[str, Any]] = None,
+        token_budget: int = DEFAULT_CONTEXT_BUDGET,
+        query: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Assemble the most relevant prompt sections for a project within a token budget.
+        
+        Draws on the registered markdown prompts: LAYER 1, the LAYER 2 prompts of
+        the profile's building type (all building types if none is given), LAYER 3
+        and the profile's GC-specific prompt. See context_builder.py for scoring.
+        
+        Args:
+            profile: Project profile with building_type, stage, region and gc_type (all optional)
+            token_budget: Upper bound on the estimated tokens of the assembled context
+            query: Free text of the current chat turn, to favor matching sections
+        
+        Returns:
+            Dictionary with context, tokens, token_budget, sections, omitted_sections,
+            available_tokens and the profile used
+        """
+        if self.auto_reload:
+            self.refresh()
+        
+        profile = dict(profile or {})
+        building_type = _fold(profile.get("building_type") or "")
+        gc_type = _fold(profile.get("gc_type") or "")
+        sources = []
+        for (layer, entry_building_type, prompt_type), entry in self._index.items():
+            local_path = entry.get("local_path")
+            if not local_path or not local_path.lower().endswith(".md"):
+                continue
+            if layer == "layer2" and building_type and not building_type.startswith(entry_building_type):
+                continue
+            if layer == "gc_specific" and prompt_type != gc_type:
+                continue
+            sources.append(ContextSource(
+                name=entry.get("name"),
+                version=entry.get("version"),
+                layer=layer,
+                local_path=local_path,
+                file_path=entry.get("file_path")
+            ))
+        
+        result = self.context_builder.assemble(sources, profile, token_budget, query)
+        result["profile"] = profile
+        return result
     
     def list_available_prompts(self, layer: str) -> Dict[str, Any]:
         """
@@ -237,6 +490,9 @@ class KnowledgePromptsRouter:
         Returns:
             Dictionary containing available prompts
         """
+        if self.auto_reload:
+            self.refresh()
+        
         try:
             return self.registry.get(layer, {})
         except Exception as e:
@@ -284,6 +540,7 @@ if __name__ == "__main__":
     print(f"Name: {result.get('name')}")
     print(f"Version: {result.get('version')}")
     print(f"Query Parameters: {result.get('query_parameters')}")
+    print(f"Final Factor: {result.get('final_factor')} ({result.get('confidence')})")
     print()
     
     # Example 4: Get Geotechnical Factor
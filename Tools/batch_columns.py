@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+BATCH COLUMNS v1.0
+
+Purpose: Shared column broadcasting and key encoding for the engines' batch APIs
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+GeotechnicalAssessment.assess_batch(), RenovationCostFactors.assess_batch()
+and CostFactorCube.factor_batch() all take columns that are either a scalar
+(broadcast to every row) or a sequence / array of one value per row, and map
+key columns to integer codes through a KeyAliases index before gathering
+from their compiled arrays. These helpers do that broadcasting and encoding
+the same way for every engine.
+
+Usage:
+    from batch_columns import batch_length, encode_column, require_numpy
+
+    require_numpy("batch assessment")
+    n = batch_length(regions, building_types, hard_costs)
+    region_idx = encode_column(regions, tables['region_index'], n, 'Region', tables['region_ids'])
+"""
+
+from enum import Enum
+from typing import Any, Dict, List
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only required for the batch APIs
+    np = None
+
+# ============================================================================
+# BATCH HELPERS
+# ============================================================================
+
+def require_numpy(feature: str = "the batch API") -> None:
+    """Raise a clear error when a batch API is used without numpy"""
+    if np is None:
+        raise ImportError(f"numpy is required for {feature} (pip install numpy)")
+
+def is_scalar(value: Any) -> bool:
+    """True for values that broadcast across a batch (strings, enums, numbers)"""
+    if np is not None and isinstance(value, np.ndarray):
+        return value.ndim == 0
+    return isinstance(value, (str, Enum)) or not hasattr(value, '__len__')
+
+def batch_length(*columns: Any) -> int:
+    """Determine the common row count of batch columns"""
+    lengths = {len(col) for col in columns if not is_scalar(col)}
+    if len(lengths) > 1:
+        raise ValueError(f"Batch columns have mismatched lengths: {sorted(lengths)}")
+    if not lengths:
+        return 1
+    return lengths.pop()
+
+def encode_column(values: Any, index: Dict, n: int, label: str, available: List[str]) -> "np.ndarray":
+    """Map a batch column to integer codes through a lookup (alias) index"""
+    if is_scalar(values):
+        try:
+            code = index[values]
+        except KeyError:
+            raise ValueError(f"{label} '{values}' not found. Available: {available}") from None
+        return np.full(n, code, dtype=np.intp)
+
+    if isinstance(values, np.ndarray):
+        if np.issubdtype(values.dtype, np.integer):
+            if n and (values.min() < 0 or values.max() >= len(available)):
+                raise ValueError(f"{label} codes out of range 0..{len(available) - 1}")
+            return values.astype(np.intp, copy=False)
+        values = values.tolist()
+
+    try:
+        return np.fromiter(map(index.__getitem__, values), dtype=np.intp, count=n)
+    except KeyError:
+        unknown = sorted({str(v) for v in values if _missing_code(index, v)})
+        raise ValueError(f"{label}(s) {unknown} not found. Available: {available}") from None
+
+def _missing_code(index: Dict, value: Any) -> bool:
+    """True if value has no code (alias indexes resolve new spellings on lookup)"""
+    try:
+        index[value]
+    except KeyError:
+        return True
+    return False
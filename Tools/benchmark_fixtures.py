@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK FIXTURES v1.0
+
+Purpose: Deterministic synthetic matrices, registries and case stores for scaling benchmarks
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+The production geotechnical matrix has 7 regions and the registry about 20
+entries, and the case database a handful of cases, which hides how the tools
+behave as the data grows. These helpers scale them up from the real ones:
+synthetic regions are copies of the real regions with jittered (but
+internally consistent) adjustments, synthetic registry entries reuse the real
+prompt file paths so path validation does the same work it does in
+production, and synthetic cases are the real cases' matching features with
+jittered sizes, durations and costs. The same seed always produces
+byte-identical files.
+
+Usage:
+    from benchmark_fixtures import write_synthetic_matrix, write_synthetic_registry
+
+    matrix_file = write_synthetic_matrix("/tmp/bench", regions=2000)
+    registry_file = write_synthetic_registry("/tmp/bench", entries=10000)
+    case_features = build_synthetic_case_features(cases=10000)
+
+    python benchmark_fixtures.py /tmp/bench --regions 200 --entries 10000
+"""
+
+import argparse
+import copy
+import os
+import random
+import sys
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from registry_resolver import iter_registry_paths
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_MATRIX_FILE = os.path.join(REPO_ROOT, "Data", "GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml")
+SOURCE_REGISTRY_FILE = os.path.join(REPO_ROOT, "Config", "KNOWLEDGE_PROMPT_REGISTRY_v4.7.yaml")
+SOURCE_CASE_DATABASE_FILE = os.path.join(
+    REPO_ROOT, "Knowledge Prompts", "Layer 3", "LAYER3_CASE_DATABASE_v1.1_PRODUCTION.yaml"
+)
+
+DEFAULT_SEED = 20261018
+
+# Share of synthetic registry entries per section (LAYER2 is split 3 ways by prompt type)
+REGISTRY_SECTION_SHARES = {'LAYER2': 0.5, 'LAYER3': 0.3, 'GC_SPECIFIC': 0.2}
+LAYER2_PROMPT_TYPES = ('KNOWLEDGE', 'CASE_DATABASE', 'DECISION_MATRIX')
+
+# Case features jittered per synthetic case (the rest are copied from the template case)
+JITTERED_CASE_FEATURES = ('building_area', 'duration', 'regional_multiplier', 'code_premium', 'cost_per_sf')
+
+_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def synthetic_region_id(index: int) -> str:
+    """Region ID of the index-th synthetic region (SYN_R0000, SYN_R0001, ...)"""
+    return f"SYN_R{index:04d}"
+
+def synthetic_case_id(index: int) -> str:
+    """Case ID of the index-th synthetic case (SYN_CASE_000000, ...)"""
+    return f"SYN_CASE_{index:06d}"
+
+def synthetic_registry_keys(entries: int) -> Dict[str, List[str]]:
+    """
+    Keys the synthetic registry adds per section
+
+    Args:
+        entries: Number of synthetic prompt entries
+
+    Returns:
+        Dictionary with LAYER2 building types, LAYER3 tool types and GC_SPECIFIC GC types
+    """
+    counts = {section: int(entries * share) for section, share in REGISTRY_SECTION_SHARES.items()}
+    return {
+        'LAYER2': [f"SYN_BUILDING_{i:05d}" for i in range(counts['LAYER2'] // len(LAYER2_PROMPT_TYPES))],
+        'LAYER3': [f"SYN_TOOL_{i:05d}" for i in range(counts['LAYER3'])],
+        'GC_SPECIFIC': [f"SYN_GC_{i:05d}" for i in range(counts['GC_SPECIFIC'])]
+    }
+
+def _read_yaml(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+def _write_yaml(data: Dict[str, Any], path: str) -> str:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        # libyaml only speeds up writing the fixture; the tools under test still parse with safe_load
+        yaml.dump(data, f, Dumper=_DUMPER, allow_unicode=True, sort_keys=False)
+    return path
+
+def _jitter(rng: random.Random, value: float, spread: float = 0.25) -> float:
+    return round(max(0.0, value * rng.uniform(1.0 - spread, 1.0 + spread)), 4)
+
+# ============================================================================
+# SYNTHETIC MATRIX
+# ============================================================================
+
+def build_synthetic_matrix(
+    regions: int,
+    source_file: str = SOURCE_MATRIX_FILE,
+    seed: int = DEFAULT_SEED
+) -> Dict[str, Any]:
+    """
+    Build a geotechnical matrix with `regions` synthetic regions
+
+    Args:
+        regions: Number of regions in the result
+        source_file: Real matrix the region templates are taken from
+        seed: Random seed
+
+    Returns:
+        Parsed matrix dictionary (same layout as the source)
+    """
+    rng = random.Random(seed)
+    source = _read_yaml(source_file)
+    templates = list(source['regions'].values())
+    matrix = {key: value for key, value in source.items() if key != 'regions'}
+    matrix['metadata'] = dict(source.get('metadata') or {}, total_regions=regions, synthetic=True)
+
+    matrix['regions'] = {}
+    for i in range(regions):
+        region_id = synthetic_region_id(i)
+        region = copy.deepcopy(templates[i % len(templates)])
+        region['region_id'] = region_id.upper()
+        region['region_name'] = f"Synthetic region {i} ({region.get('region_name', '')})"
+
+        summary = region.setdefault('summary', {})
+        template_risk = summary.get('risk_premium') or 0.0
+        summary['base_adjustment'] = _jitter(rng, summary.get('base_adjustment', 0.05))
+        summary['risk_premium'] = _jitter(rng, template_risk or 0.02)
+        summary['total_adjustment'] = round(summary['base_adjustment'] + summary['risk_premium'], 4)
+
+        for rec in (region.get('recommendations') or {}).values():
+            if not isinstance(rec, dict) or 'base_adjustment' not in rec:
+                continue
+            # Keep the stage ordering of the template: later stages carry less risk
+            share = rec.get('risk_premium', 0.0) / template_risk if template_risk else 0.0
+            rec['base_adjustment'] = summary['base_adjustment']
+            rec['risk_premium'] = round(summary['risk_premium'] * min(share, 1.0), 4)
+            rec['total'] = round(rec['base_adjustment'] + rec['risk_premium'], 4)
+
+        matrix['regions'][region_id] = region
+    return matrix
+
+def write_synthetic_matrix(
+    output_dir: str,
+    regions: int,
+    source_file: str = SOURCE_MATRIX_FILE,
+    seed: int = DEFAULT_SEED
+) -> str:
+    """
+    Write a synthetic geotechnical matrix YAML
+
+    Args:
+        output_dir: Directory for the file
+        regions: Number of regions
+        source_file: Real matrix the region templates are taken from
+        seed: Random seed
+
+    Returns:
+        Path of the written file
+    """
+    path = os.path.join(output_dir, f"GEOTECHNICAL_COST_DRIVER_MATRIX_SYNTHETIC_{regions}.yaml")
+    return _write_yaml(build_synthetic_matrix(regions, source_file, seed), path)
+
+# ============================================================================
+# SYNTHETIC REGISTRY
+# ============================================================================
+
+def build_synthetic_registry(
+    entries: int,
+    source_file: str = SOURCE_REGISTRY_FILE,
+    seed: int = DEFAULT_SEED
+) -> Dict[str, Any]:
+    """
+    Build a knowledge prompt registry with about `entries` additional entries
+
+    The real sections are kept, so every production lookup still resolves;
+    synthetic building types, tool types and GC types are added next to them.
+
+    Args:
+        entries: Number of synthetic prompt entries to add
+        source_file: Real registry to extend
+        seed: Random seed
+
+    Returns:
+        Parsed registry dictionary
+    """
+    rng = random.Random(seed)
+    registry = _read_yaml(source_file)
+    file_paths: List[str] = sorted(set(iter_registry_paths(registry)))
+
+    def entry(name: str) -> Dict[str, Any]:
+        return {
+            'name': name,
+            'file_path': rng.choice(file_paths),
+            'status': 'PRODUCTION',
+            'version': f"{rng.randint(1, 4)}.{rng.randint(0, 9)}",
+            'description': f"Synthetic benchmark entry {name}"
+        }
+
+    keys = synthetic_registry_keys(entries)
+    layer2 = registry.setdefault('LAYER2', {})
+    for building_type in keys['LAYER2']:
+        layer2[building_type] = {
+            prompt_type: [entry(f"LAYER2_{building_type}_{prompt_type}")]
+            for prompt_type in LAYER2_PROMPT_TYPES
+        }
+
+    layer3 = registry.setdefault('LAYER3', {})
+    for tool_type in keys['LAYER3']:
+        layer3[tool_type] = [entry(f"LAYER3_{tool_type}")]
+
+    gc_specific = registry.setdefault('GC_SPECIFIC', {})
+    for gc_type in keys['GC_SPECIFIC']:
+        gc_specific[gc_type] = [entry(f"GC_SPECIFIC_{gc_type}")]
+
+    return registry
+
+def count_registry_entries(registry: Dict[str, Any]) -> int:
+    """Number of prompt entries (dicts with a file_path) in a registry"""
+    def count(node: Any) -> int:
+        if isinstance(node, dict):
+            return int('file_path' in node) + sum(count(v) for v in node.values())
+        if isinstance(node, list):
+            return sum(count(v) for v in node)
+        return 0
+    return count(registry)
+
+def write_synthetic_registry(
+    output_dir: str,
+    entries: int,
+    source_file: str = SOURCE_REGISTRY_FILE,
+    seed: int = DEFAULT_SEED
+) -> str:
+    """
+    Write a synthetic knowledge prompt registry YAML
+
+    Args:
+        output_dir: Directory for the file
+        entries: Number of synthetic prompt entries to add
+        source_file: Real registry to extend
+        seed: Random seed
+
+    Returns:
+        Path of the written file
+    """
+    path = os.path.join(output_dir, f"KNOWLEDGE_PROMPT_REGISTRY_SYNTHETIC_{entries}.yaml")
+    return _write_yaml(build_synthetic_registry(entries, source_file, seed), path)
+
+# ============================================================================
+# SYNTHETIC CASE STORE
+# ============================================================================
+
+def build_synthetic_case_features(
+    cases: int,
+    source_file: str = SOURCE_CASE_DATABASE_FILE,
+    seed: int = DEFAULT_SEED
+) -> List[Dict[str, Any]]:
+    """
+    Build `cases` synthetic case feature rows for CaseFeatureMatrix.from_features
+
+    Rows cycle through the real cases; sizes, durations, regional factors and
+    costs are jittered and the complexity score moves by up to one point, so
+    scores spread across the LAYER 3.2 bands instead of repeating.
+
+    Args:
+        cases: Number of rows
+        source_file: Real case database the templates are taken from
+        seed: Random seed
+
+    Returns:
+        List of extract_case_features() rows
+    """
+    # numpy is only needed by the case benchmarks, not by the matrix / registry fixtures
+    from case_similarity_matching import extract_case_features, load_case_records
+
+    rng = random.Random(seed)
+    templates = [extract_case_features(record) for record in load_case_records(source_file)]
+    rows = []
+    for i in range(cases):
+        row = dict(templates[i % len(templates)])
+        row['case_id'] = synthetic_case_id(i)
+        row['project_name'] = f"Synthetic case {i} ({row['project_name']})"
+        for name in JITTERED_CASE_FEATURES:
+            if row[name] == row[name]:  # leave missing (NaN) features missing
+                row[name] = _jitter(rng, row[name])
+        if row['complexity_score'] == row['complexity_score']:
+            row['complexity_score'] = max(1.0, row['complexity_score'] + rng.choice((-1.0, 0.0, 1.0)))
+        if row['building_area'] == row['building_area'] and row['cost_per_sf'] == row['cost_per_sf']:
+            row['final_cost'] = round(row['building_area'] * row['cost_per_sf'], 2)
+        rows.append(row)
+    return rows
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Write synthetic benchmark matrices and registries")
+    parser.add_argument('output_dir')
+    parser.add_argument('--regions', type=int, nargs='*', default=[20, 200, 2000])
+    parser.add_argument('--entries', type=int, default=10000, help="Synthetic registry entries (0 to skip)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    args = parser.parse_args(argv)
+
+    for regions in args.regions:
+        path = write_synthetic_matrix(args.output_dir, regions, seed=args.seed)
+        print(f"{regions:>6,d} regions -> {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+    if args.entries:
+        path = write_synthetic_registry(args.output_dir, args.entries, seed=args.seed)
+        total = count_registry_entries(_read_yaml(path))
+        print(f"{total:>6,d} entries -> {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
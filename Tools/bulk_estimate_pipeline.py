@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+BULK ESTIMATE PIPELINE v1.0
+
+Purpose: Stream project rows from CSV / JSONL through the geotechnical engine into CSV, JSONL or Parquet
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+Bid-season portfolio runs score tens of thousands of candidate projects.
+The pipeline reads the input lazily, evaluates chunk_size rows at a time
+through assess_batch() and appends each chunk to the output before reading
+on, so memory stays bounded by a few chunks whatever the file size.
+
+Input rows need a region (or lat / lon, resolved through the region
+locator) and may carry building_type, stage and hard_cost; missing values
+fall back to the run defaults. Output rows are the input fields followed by
+the RESULT_FIELDS columns; CSV and Parquet headers always carry the mapped
+role columns, and a column first seen after the header is written is
+dropped with a warning. Rows that cannot be assessed (unknown region, bad
+or negative hard cost, ...) do not stop the run: they are written with
+their 'error' column set and NaN results. A malformed JSONL line does stop
+it, with a ValueError naming the file and line.
+
+Chunks can be evaluated on a thread or process pool; output order always
+matches input order. Parquet output requires pyarrow.
+
+Usage:
+    python bulk_estimate_pipeline.py projects.csv results.parquet --chunk-size 5000 --progress 2
+    python bulk_estimate_pipeline.py projects.jsonl results.csv --workers 4 --executor process \\
+        --field region=Region_ID --default-stage POST_AWARD
+
+    from bulk_estimate_pipeline import run_pipeline
+
+    stats = run_pipeline("projects.csv", "results.jsonl", matrix_file="../Data/GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml")
+    print(stats['rows'], stats['errors'], stats['rows_per_s'])
+"""
+
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from geotechnical_cost_assessment import GeotechnicalAssessment
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MATRIX_FILE = os.path.join(REPO_ROOT, "Data", "GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml")
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Input field names per role; override with fields= / --field role=column
+DEFAULT_FIELDS = {
+    'region': 'region',
+    'building_type': 'building_type',
+    'stage': 'stage',
+    'hard_cost': 'hard_cost',
+    'lat': 'lat',
+    'lon': 'lon'
+}
+
+# Columns appended to every output row
+RESULT_FIELDS = (
+    'region_id', 'building_type_id', 'stage_id',
+    'base_adjustment', 'risk_premium', 'total_adjustment',
+    'building_type_multiplier', 'final_adjustment', 'cost_impact', 'error'
+)
+_NUMERIC_RESULT_FIELDS = RESULT_FIELDS[3:-1]
+
+INPUT_FORMATS = ('csv', 'jsonl')
+OUTPUT_FORMATS = ('csv', 'jsonl', 'parquet')
+
+# ============================================================================
+# INPUT
+# ============================================================================
+
+def detect_format(path: str, formats: Iterable[str]) -> str:
+    """Infer a file format from its extension (.ndjson counts as jsonl)"""
+    ext = os.path.splitext(path)[1].lower().lstrip('.')
+    ext = {'ndjson': 'jsonl', 'pq': 'parquet'}.get(ext, ext)
+    if ext not in formats:
+        raise ValueError(f"Cannot infer format of '{path}'; use one of {list(formats)}")
+    return ext
+
+def iter_rows(path: str, input_format: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Read project rows lazily
+
+    Args:
+        path: CSV (header row required) or JSONL file
+        input_format: "csv" or "jsonl" (default: from the extension)
+
+    Yields:
+        One dictionary per row
+    """
+    input_format = input_format or detect_format(path, INPUT_FORMATS)
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if input_format == 'csv':
+            yield from csv.DictReader(f)
+        else:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_no}: invalid JSON ({e})") from None
+                if not isinstance(row, dict):
+                    raise ValueError(f"{path}:{line_no}: expected a JSON object per line")
+                yield row
+
+def iter_chunks(rows: Iterable[Dict[str, Any]], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Group rows into lists of at most chunk_size"""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+# ============================================================================
+# CHUNK EVALUATION
+# ============================================================================
+
+def _blank(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+def _parse_float(value: Any) -> float:
+    """Float from a CSV / JSON value; blank is NaN, anything else unparseable raises ValueError"""
+    if _blank(value):
+        return math.nan
+    if isinstance(value, str):
+        value = value.replace(',', '').replace('$', '').strip()
+    return float(value)
+
+def _parse_hard_cost(value: Any) -> float:
+    """Hard cost from a CSV / JSON value; blank is NaN, non-finite or negative raises ValueError"""
+    cost = _parse_float(value)
+    if _blank(value):
+        return cost
+    if not math.isfinite(cost) or cost < 0:
+        raise ValueError(f"hard cost must be a finite non-negative number, got {value!r}")
+    return cost
+
+def estimate_chunk(
+    assessment: GeotechnicalAssessment,
+    rows: List[Dict[str, Any]],
+    fields: Optional[Dict[str, str]] = None,
+    default_building_type: str = "commercial_office",
+    default_stage: str = "BIDDING"
+) -> List[Dict[str, Any]]:
+    """
+    Assess one chunk of project rows
+
+    Args:
+        assessment: Geotechnical engine
+        rows: Input rows
+        fields: Role -> input column (see DEFAULT_FIELDS)
+        default_building_type: Building type for rows without one
+        default_stage: Stage for rows without one
+
+    Returns:
+        Output rows (input fields plus RESULT_FIELDS), in input order
+    """
+    fields = {**DEFAULT_FIELDS, **(fields or {})}
+    tables = assessment.lookup_tables()
+    region_index, bt_index, stage_index = tables['region_index'], tables['building_type_index'], tables['stage_index']
+    base = tables['base_adjustment']
+    locator = None
+
+    n = len(rows)
+    region_idx = np.zeros(n, dtype=np.intp)
+    bt_idx = np.zeros(n, dtype=np.intp)
+    stage_idx = np.zeros(n, dtype=np.intp)
+    hard_costs = np.full(n, np.nan)
+    errors: List[Optional[str]] = [None] * n
+
+    # Validate row by row (alias index hits), then evaluate the valid rows in one batch
+    for i, row in enumerate(rows):
+        region = row.get(fields['region'])
+        if _blank(region):
+            lat, lon = row.get(fields['lat']), row.get(fields['lon'])
+            if _blank(lat) or _blank(lon):
+                errors[i] = "Missing region (and no lat / lon to locate one)"
+                continue
+            if locator is None:
+                locator = assessment.locator()
+            try:
+                code = locator.code_for_location(_parse_float(lat), _parse_float(lon))
+            except (TypeError, ValueError):
+                errors[i] = f"Invalid coordinates '{lat}', '{lon}'"
+                continue
+            if code < 0:
+                errors[i] = f"No region covers location ({lat}, {lon})"
+                continue
+        else:
+            code = region_index.code(region)
+            if code is None:
+                errors[i] = f"Region '{region}' not found in matrix"
+                continue
+        region_idx[i] = code
+
+        building_type = row.get(fields['building_type'])
+        building_type = default_building_type if _blank(building_type) else building_type
+        code = bt_index.code(building_type)
+        if code is None:
+            errors[i] = f"Building type '{building_type}' not found"
+            continue
+        bt_idx[i] = code
+
+        stage = row.get(fields['stage'])
+        stage = default_stage if _blank(stage) else stage
+        code = stage_index.code(stage)
+        if code is None:
+            errors[i] = f"Stage '{stage}' not found"
+            continue
+        stage_idx[i] = code
+
+        if base[region_idx[i], code] != base[region_idx[i], code]:  # NaN
+            errors[i] = f"Stage '{tables['stage_ids'][code]}' not found in recommendations for region '{tables['region_ids'][region_idx[i]]}'"
+            continue
+
+        try:
+            hard_costs[i] = _parse_hard_cost(row.get(fields['hard_cost']))
+        except (TypeError, ValueError):
+            errors[i] = f"Invalid hard cost '{row.get(fields['hard_cost'])}'"
+
+    valid = np.fromiter((error is None for error in errors), dtype=bool, count=n)
+    columns = {name: np.full(n, np.nan) for name in _NUMERIC_RESULT_FIELDS}
+    if valid.any():
+        batch = assessment.assess_batch(region_idx[valid], bt_idx[valid], stage_idx[valid], hard_costs[valid])
+        for name in _NUMERIC_RESULT_FIELDS:
+            columns[name][valid] = batch[name]
+
+    region_ids, bt_ids, stage_ids = tables['region_ids'], tables['building_type_ids'], tables['stage_ids']
+    numeric = {name: columns[name].tolist() for name in _NUMERIC_RESULT_FIELDS}
+    output = []
+    for i, row in enumerate(rows):
+        record = dict(row)
+        ok = errors[i] is None
+        record['region_id'] = region_ids[region_idx[i]] if ok else None
+        record['building_type_id'] = bt_ids[bt_idx[i]] if ok else None
+        record['stage_id'] = stage_ids[stage_idx[i]] if ok else None
+        for name in _NUMERIC_RESULT_FIELDS:
+            record[name] = numeric[name][i]
+        record['error'] = errors[i]
+        output.append(record)
+    return output
+
+def _estimate_chunk_in_worker(args: tuple) -> List[Dict[str, Any]]:
+    """Evaluate one chunk in a worker process (the engine is shared per process)"""
+    matrix_file, rows, options = args
+    return estimate_chunk(GeotechnicalAssessment(matrix_file), rows, **options)
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def _nan_to_none(records: List[Dict[str, Any]]) -> None:
+    """Blank out NaN results in place (empty CSV cells, JSON null)"""
+    for record in records:
+        for name in _NUMERIC_RESULT_FIELDS:
+            if record[name] != record[name]:
+                record[name] = None
+
+def _input_columns(records: List[Dict[str, Any]], role_columns: Iterable[str]) -> List[str]:
+    """Output input columns: the mapped role columns, then any other column of the first chunk"""
+    columns = list(dict.fromkeys(role_columns))
+    seen = set(columns)
+    for record in records:
+        for key in record:
+            if key not in seen and key not in RESULT_FIELDS:
+                columns.append(key)
+                seen.add(key)
+    return columns
+
+def _warn_new_columns(records: List[Dict[str, Any]], columns: Iterable[str], path: str) -> bool:
+    """Print a warning if a record carries a column missing from the fixed header; True if it did"""
+    known = set(columns) | set(RESULT_FIELDS)
+    extra = sorted({key for record in records for key in record if key not in known})
+    if extra:
+        print(f"Warning: {path}: input columns {extra} first appear after the header was written and are dropped")
+    return bool(extra)
+
+class CsvResultWriter:
+    """Append result rows to a CSV file; the header is the role columns plus the first chunk's columns (NaN is written empty)"""
+
+    def __init__(self, path: str, role_columns: Iterable[str] = DEFAULT_FIELDS.values()):
+        self._path = path
+        self._role_columns = list(role_columns)
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._writer = None
+        self._input_fields: List[str] = []
+        self._warned = False
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        if self._writer is None:
+            self._input_fields = _input_columns(records, self._role_columns)
+            self._writer = csv.DictWriter(self._file, fieldnames=self._input_fields + list(RESULT_FIELDS), extrasaction='ignore')
+            self._writer.writeheader()
+        elif not self._warned:
+            self._warned = _warn_new_columns(records, self._input_fields, self._path)
+        _nan_to_none(records)
+        self._writer.writerows(records)
+
+    def close(self) -> None:
+        self._file.close()
+
+class JsonlResultWriter:
+    """Append result rows to a JSONL file (NaN is written as null)"""
+
+    def __init__(self, path: str, role_columns: Iterable[str] = DEFAULT_FIELDS.values()):
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        _nan_to_none(records)
+        buffer = io.StringIO()
+        for record in records:
+            buffer.write(json.dumps(record, ensure_ascii=False, default=str))
+            buffer.write('\n')
+        self._file.write(buffer.getvalue())
+
+    def close(self) -> None:
+        self._file.close()
+
+class ParquetResultWriter:
+    """Append result rows to a Parquet file, one row group per chunk (requires pyarrow)"""
+
+    def __init__(self, path: str, role_columns: Iterable[str] = DEFAULT_FIELDS.values()):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("pyarrow is required for Parquet output (pip install pyarrow)") from None
+        self._pa, self._pq = pa, pq
+        self._path = path
+        self._writer = None
+        self._schema = None
+        self._role_columns = list(role_columns)
+        self._input_fields: List[str] = []
+        self._warned = False
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        pa = self._pa
+        if self._writer is None:
+            # Input columns are kept as strings so the schema cannot drift between chunks
+            self._input_fields = _input_columns(records, self._role_columns)
+            self._schema = pa.schema(
+                [(name, pa.string()) for name in self._input_fields]
+                + [(name, pa.string()) for name in ('region_id', 'building_type_id', 'stage_id')]
+                + [(name, pa.float64()) for name in _NUMERIC_RESULT_FIELDS]
+                + [('error', pa.string())]
+            )
+            self._writer = self._pq.ParquetWriter(self._path, self._schema)
+        elif not self._warned:
+            self._warned = _warn_new_columns(records, self._input_fields, self._path)
+        columns = {
+            name: [None if _blank(r.get(name)) else str(r.get(name)) for r in records]
+            for name in self._input_fields
+        }
+        for name in RESULT_FIELDS:
+            columns[name] = [r[name] for r in records]
+        self._writer.write_table(pa.Table.from_pydict(columns, schema=self._schema))
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+WRITERS: Dict[str, Callable[..., Any]] = {
+    'csv': CsvResultWriter,
+    'jsonl': JsonlResultWriter,
+    'parquet': ParquetResultWriter
+}
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+def _evaluate_chunks(
+    chunks: Iterator[List[Dict[str, Any]]],
+    matrix_file: str,
+    options: Dict[str, Any],
+    max_workers: Optional[int],
+    executor: str
+) -> Iterator[List[Dict[str, Any]]]:
+    """Evaluate chunks in input order, with at most 2 x max_workers chunks in flight"""
+    if not max_workers or max_workers <= 1:
+        assessment = GeotechnicalAssessment(matrix_file)
+        for chunk in chunks:
+            yield estimate_chunk(assessment, chunk, **options)
+        return
+
+    if executor == 'process':
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+        submit = lambda chunk: pool.submit(_estimate_chunk_in_worker, (matrix_file, chunk, options))
+    else:
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        assessment = GeotechnicalAssessment(matrix_file)
+        submit = lambda chunk: pool.submit(estimate_chunk, assessment, chunk, **options)
+
+    with pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(submit(chunk))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def run_pipeline(
+    input_path: str,
+    output_path: str,
+    matrix_file: str = DEFAULT_MATRIX_FILE,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    input_format: Optional[str] = None,
+    output_format: Optional[str] = None,
+    fields: Optional[Dict[str, str]] = None,
+    default_building_type: str = "commercial_office",
+    default_stage: str = "BIDDING",
+    max_workers: Optional[int] = None,
+    executor: str = "thread",
+    progress_interval: Optional[float] = None,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Stream a project file through the geotechnical engine
+
+    Args:
+        input_path: CSV or JSONL project file
+        output_path: CSV, JSONL or Parquet result file
+        matrix_file: Geotechnical matrix YAML
+        chunk_size: Rows evaluated (and held in memory) per chunk
+        input_format: Override the input format inferred from the extension
+        output_format: Override the output format inferred from the extension
+        fields: Role -> input column overrides (see DEFAULT_FIELDS)
+        default_building_type: Building type for rows without one
+        default_stage: Stage for rows without one
+        max_workers: Evaluate chunks on a pool of this size
+        executor: Pool type for max_workers ("thread" or "process")
+        progress_interval: Report progress at most every this many seconds
+        progress: Progress callback taking the running stats (default: print to stderr)
+
+    Returns:
+        Dictionary with rows, errors, chunks, seconds and rows_per_s
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    if executor not in ('thread', 'process'):
+        raise ValueError(f"executor must be 'thread' or 'process', got '{executor}'")
+    output_format = output_format or detect_format(output_path, OUTPUT_FORMATS)
+    if output_format not in WRITERS:
+        raise ValueError(f"Unknown output format '{output_format}'. Available: {list(WRITERS)}")
+    options = {
+        'fields': fields,
+        'default_building_type': default_building_type,
+        'default_stage': default_stage
+    }
+
+    stats = {'rows': 0, 'errors': 0, 'chunks': 0, 'seconds': 0.0, 'rows_per_s': 0.0}
+    report = progress or _print_progress
+    started = last_report = time.perf_counter()
+
+    writer = WRITERS[output_format](output_path, role_columns={**DEFAULT_FIELDS, **(fields or {})}.values())
+    try:
+        chunks = iter_chunks(iter_rows(input_path, input_format), chunk_size)
+        for records in _evaluate_chunks(chunks, matrix_file, options, max_workers, executor):
+            writer.write(records)
+            stats['rows'] += len(records)
+            stats['errors'] += sum(1 for r in records if r['error'] is not None)
+            stats['chunks'] += 1
+
+            now = time.perf_counter()
+            if progress_interval is not None and now - last_report >= progress_interval:
+                stats['seconds'] = now - started
+                stats['rows_per_s'] = stats['rows'] / stats['seconds']
+                report(dict(stats))
+                last_report = now
+    finally:
+        writer.close()
+
+    stats['seconds'] = time.perf_counter() - started
+    stats['rows_per_s'] = stats['rows'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+    return stats
+
+def _print_progress(stats: Dict[str, Any]) -> None:
+    print(f"  {stats['rows']:>10,d} rows  {stats['errors']:>7,d} errors  "
+          f"{stats['rows_per_s']:>10,.0f} rows/s", file=sys.stderr)
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream project rows through the geotechnical cost assessment")
+    parser.add_argument('input', help="CSV or JSONL project file")
+    parser.add_argument('output', help="CSV, JSONL or Parquet result file")
+    parser.add_argument('--matrix', default=DEFAULT_MATRIX_FILE, help="Geotechnical matrix YAML")
+    parser.add_argument('--input-format', choices=INPUT_FORMATS, default=None)
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS, default=None)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--field', action='append', default=[], metavar="ROLE=COLUMN",
+                        help=f"Input column for a role ({', '.join(DEFAULT_FIELDS)})")
+    parser.add_argument('--default-building-type', default="commercial_office")
+    parser.add_argument('--default-stage', default="BIDDING")
+    parser.add_argument('--workers', type=int, default=None, help="Evaluate chunks on a pool of this size")
+    parser.add_argument('--executor', choices=['thread', 'process'], default='thread')
+    parser.add_argument('--progress', type=float, default=None, metavar="SECONDS",
+                        help="Report progress to stderr every SECONDS")
+    args = parser.parse_args(argv)
+
+    fields = {}
+    for spec in args.field:
+        role, sep, column = spec.partition('=')
+        if not sep or role not in DEFAULT_FIELDS:
+            parser.error(f"--field expects ROLE=COLUMN with ROLE in {list(DEFAULT_FIELDS)}, got '{spec}'")
+        fields[role] = column
+
+    stats = run_pipeline(
+        args.input, args.output,
+        matrix_file=args.matrix,
+        chunk_size=args.chunk_size,
+        input_format=args.input_format,
+        output_format=args.output_format,
+        fields=fields,
+        default_building_type=args.default_building_type,
+        default_stage=args.default_stage,
+        max_workers=args.workers,
+        executor=args.executor,
+        progress_interval=args.progress
+    )
+    print(f"{stats['rows']:,} rows ({stats['errors']:,} errors) in {stats['seconds']:.2f}s "
+          f"- {stats['rows_per_s']:,.0f} rows/s -> {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
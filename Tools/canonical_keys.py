@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+CANONICAL KEYS v1.0
+
+Purpose: Shared canonical IDs and precomputed alias tables for regions, building types and stages
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+The matrices, the router and API callers spell the same keys differently:
+the geotechnical matrix uses "CA_Inland", the renovation matrix "ca_inland",
+docs and callers "CA_INLAND" / Stage.BIDDING / "bidding". A KeyAliases table
+interns a set of canonical IDs once and precomputes their common spellings, so
+resolving a key is a single dict hit. Spellings outside the precomputed set are
+folded (case, whitespace, dashes) once and remembered; unknown keys resolve to
+None instead of raising, which keeps batch loops free of exception handling.
+
+Engines build one table per loaded matrix (its own keys are canonical);
+STAGES, BUILDING_TYPES and REGIONS are the process-wide tables for callers
+that have no matrix at hand, such as the knowledge prompts router.
+
+Usage:
+    from canonical_keys import REGIONS, STAGES, KeyAliases
+
+    REGIONS.canonical("CA_INLAND")          # -> "CA_Inland"
+    STAGES.canonical("post-award")          # -> "POST_AWARD"
+    renovation_regions = KeyAliases(["ca_inland", "tx_coastal"], label="Region")
+    renovation_regions.canonical("CA_Inland")   # -> "ca_inland"
+"""
+
+import re
+import sys
+from enum import Enum
+from typing import Any, Dict, Iterable, Optional
+
+# ============================================================================
+# ENUMS
+# ============================================================================
+
+class Stage(Enum):
+    """Project stage affecting geotechnical cost estimation"""
+    BIDDING = "BIDDING"
+    POST_AWARD = "POST_AWARD"
+    FINAL = "FINAL"
+
+class BuildingType(Enum):
+    """Building types with different geotechnical sensitivities"""
+    WAREHOUSE = "warehouse"
+    COMMERCIAL_OFFICE = "commercial_office"
+    HEALTHCARE = "healthcare"
+
+# Stage names (lower-cased) to recommendation keys in the matrix
+STAGE_RECOMMENDATION_KEYS = {
+    'bidding': 'bidding_stage',
+    'post_award': 'post_award_stage',
+    'final': 'final_stage'
+}
+
+# Region IDs as spelled in the geotechnical cost driver matrix
+REGION_IDS = ('CA_Coastal', 'CA_Inland', 'CA_Bay_Area', 'TX_Coastal', 'TX_Inland', 'NY_Urban', 'FL_Statewide')
+
+# Cap on remembered non-precomputed spellings per table (only successful resolutions are kept)
+MAX_LEARNED_ALIASES = 4096
+
+_SEPARATORS = re.compile(r"[\s\-]+")
+
+# ============================================================================
+# ALIAS TABLES
+# ============================================================================
+
+def fold_key(value: Any) -> str:
+    """Fold a key spelling: enum value, stripped, case-folded, spaces/dashes to underscores"""
+    if isinstance(value, Enum):
+        value = value.value
+    return _SEPARATORS.sub("_", str(value).strip()).casefold()
+
+class KeyAliases:
+    """
+    Interned canonical IDs plus a precomputed spelling -> ID table
+    """
+
+    def __init__(
+        self,
+        canonical_ids: Iterable[str],
+        aliases: Optional[Dict[Any, str]] = None,
+        label: str = "Key"
+    ):
+        """
+        Build the alias table
+
+        Args:
+            canonical_ids: Canonical IDs, in code order
+            aliases: Extra spellings (strings or enum members) -> canonical ID
+            label: Key name used in error messages (Region, Stage, ...)
+        """
+        self.ids = tuple(sys.intern(str(i)) for i in canonical_ids)
+        self.label = label
+        self._table: Dict[Any, str] = {}
+        for canonical in self.ids:
+            for spelling in (canonical, canonical.upper(), canonical.lower(), fold_key(canonical)):
+                self._table.setdefault(spelling, canonical)
+        for alias, canonical in (aliases or {}).items():
+            canonical = self._table[fold_key(canonical)]
+            self._table.setdefault(alias, canonical)
+            if isinstance(alias, str):
+                self._table.setdefault(fold_key(alias), canonical)
+        self._folded = {k: v for k, v in self._table.items() if isinstance(k, str) and k == fold_key(k)}
+        self._learned = 0
+        self._index: Optional[AliasIndex] = None
+
+    def __contains__(self, value: Any) -> bool:
+        return self.canonical(value) is not None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def canonical(self, value: Any) -> Optional[str]:
+        """
+        Resolve a spelling to its canonical ID
+
+        Args:
+            value: Key spelling (string or enum member)
+
+        Returns:
+            Interned canonical ID, or None if the key is unknown
+        """
+        try:
+            hit = self._table.get(value)
+        except TypeError:  # unhashable
+            return None
+        if hit is not None or value is None:
+            return hit
+
+        hit = self._folded.get(fold_key(value))
+        if hit is not None and self._learned < MAX_LEARNED_ALIASES:
+            self._table[value] = hit
+            self._learned += 1
+        return hit
+
+    def require(self, value: Any) -> str:
+        """Resolve a spelling to its canonical ID, raising ValueError if unknown"""
+        canonical = self.canonical(value)
+        if canonical is None:
+            raise ValueError(f"{self.label} '{value}' not found. Available: {list(self.ids)}")
+        return canonical
+
+    def index(self) -> "AliasIndex":
+        """Get the spelling -> position index of the canonical IDs (built once)"""
+        if self._index is None:
+            self._index = AliasIndex(self)
+        return self._index
+
+class AliasIndex(dict):
+    """
+    Spelling -> code dictionary over a KeyAliases table
+
+    Precomputed spellings are plain dict hits; other spellings are resolved
+    through the alias table on first use and then stored. Unknown keys raise
+    KeyError like a regular dict.
+    """
+
+    def __init__(self, aliases: KeyAliases):
+        positions = {canonical: i for i, canonical in enumerate(aliases.ids)}
+        super().__init__((spelling, positions[canonical]) for spelling, canonical in aliases._table.items())
+        self._aliases = aliases
+        self._positions = positions
+        self._limit = len(self) + MAX_LEARNED_ALIASES
+
+    def __missing__(self, key: Any) -> int:
+        canonical = self._aliases.canonical(key)
+        if canonical is None:
+            raise KeyError(key)
+        code = self._positions[canonical]
+        if len(self) < self._limit:
+            self[key] = code
+        return code
+
+    def code(self, value: Any) -> Optional[int]:
+        """Position of a spelling's canonical ID, or None if unknown"""
+        try:
+            return self[value]
+        except (KeyError, TypeError):
+            return None
+
+# ============================================================================
+# SHARED TABLES
+# ============================================================================
+
+STAGES = KeyAliases(
+    [s.value for s in Stage],
+    aliases={
+        **{s: s.value for s in Stage},
+        **{rec_key: stage.upper() for stage, rec_key in STAGE_RECOMMENDATION_KEYS.items()}
+    },
+    label="Stage"
+)
+
+BUILDING_TYPES = KeyAliases(
+    [b.value for b in BuildingType],
+    aliases={b: b.value for b in BuildingType},
+    label="Building type"
+)
+
+REGIONS = KeyAliases(REGION_IDS, label="Region")
+
+# Canonical stage -> matrix recommendation key (bidding_stage, ...)
+RECOMMENDATION_KEYS = {stage: STAGE_RECOMMENDATION_KEYS[stage.lower()] for stage in STAGES.ids}
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    for spelling in ("CA_INLAND", "ca_inland", "ca-bay-area", "Texas"):
+        print(f"Region {spelling!r:<16} -> {REGIONS.canonical(spelling)}")
+    for spelling in (Stage.FINAL, "bidding", "Post Award", "post_award_stage"):
+        print(f"Stage  {spelling!r:<16} -> {STAGES.canonical(spelling)}")
+    for spelling in ("Commercial_Office", "HEALTHCARE"):
+        print(f"Type   {spelling!r:<16} -> {BUILDING_TYPES.canonical(spelling)}")
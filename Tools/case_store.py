@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+CASE STORE v1.0
+
+Purpose: Append-only columnar store of the LAYER 3.6 case database with incremental ingestion
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+The YAML case database stays the source of truth. The store keeps, next to it
+(<yaml_path>.store/), one raw binary file per feature column, the facility /
+category codes, a (start, end) byte-offset index of every case document in the
+YAML file, and a JSON manifest recording how many bytes of the YAML file have
+been ingested.
+
+Ingestion streams only the bytes after that offset, one --- separated document
+at a time, so appending a case costs parsing that case rather than the whole
+file. The trailing document has no separator after it yet, so it may still
+be being written: if it does not parse it is left for the next ingest, and
+if it does its rows are stored as provisional. The ingested offset stops
+before it, and the next ingest drops those rows and parses the document
+again, so a write that was cut off mid-value is replaced once it completes.
+If the file shrank or the last TAIL_CHECK_BYTES
+before the ingested offset changed, the store is rebuilt from scratch; after
+editing an older case in place, run rebuild explicitly.
+
+Readers memory-map the column files, so feature queries share pages with the
+OS cache instead of loading or parsing anything. The store assumes a single
+writer per YAML file.
+
+Usage:
+    from case_store import CaseStore
+    from case_similarity_matching import CaseSimilarityMatcher
+
+    store = CaseStore()
+    store.ingest()
+    matcher = CaseSimilarityMatcher.from_feature_matrix(store.feature_matrix())
+
+    # Command line
+    python case_store.py ingest
+    python case_store.py status
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import yaml
+
+from case_similarity_matching import (
+    CATEGORIES,
+    DEFAULT_CASE_DATABASE_FILE,
+    NUMERIC_FEATURES,
+    CaseFeatureMatrix,
+    extract_case_features,
+    iter_case_records
+)
+
+# Bump when the on-disk layout changes; older stores are then rebuilt
+STORE_FORMAT_VERSION = 1
+STORE_SUFFIX = ".store"
+MANIFEST_FILE = "manifest.json"
+STRINGS_FILE = "cases.jsonl"
+OFFSETS_FILE = "offsets.i8"
+
+# Bytes before the ingested offset re-hashed on every ingest to detect in-place edits
+TAIL_CHECK_BYTES = 64 * 1024
+
+CODE_COLUMNS = ('facility_code', 'category_code')
+COLUMN_DTYPES = dict(
+    [(name, np.dtype('<f8')) for name in NUMERIC_FEATURES]
+    + [(name, np.dtype('<i4')) for name in CODE_COLUMNS]
+)
+
+_SEPARATOR_LINE = re.compile(rb'^---[ \t]*\r?\n?$')
+
+# libyaml's loader / dumper handle a case document several times faster when available
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# ============================================================================
+# DOCUMENT STREAMING
+# ============================================================================
+
+def iter_documents(data: bytes, base_offset: int = 0):
+    """
+    Split raw YAML bytes into --- separated documents
+
+    Args:
+        data: Bytes of (a tail of) a multi-document YAML file
+        base_offset: File offset of data[0]
+
+    Yields:
+        (start, end, sealed, document bytes); sealed is False for the trailing
+        document, which has no separator after it yet
+    """
+    start = 0
+    position = 0
+    for line in data.splitlines(keepends=True):
+        if _SEPARATOR_LINE.match(line):
+            yield base_offset + start, base_offset + position, True, data[start:position]
+            start = position + len(line)
+        position += len(line)
+    if start < len(data):
+        yield base_offset + start, base_offset + len(data), False, data[start:]
+
+def _column_path(store_dir: str, name: str) -> str:
+    """Raw column file for a feature"""
+    return os.path.join(store_dir, f"{name}.{COLUMN_DTYPES[name].str[1:]}")
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+class CaseStore:
+    """
+    Append-only columnar store over a multi-document case database YAML
+    """
+
+    def __init__(self, source_file: str = DEFAULT_CASE_DATABASE_FILE, store_dir: Optional[str] = None):
+        """
+        Open (or lazily create) the store of a case database
+
+        Args:
+            source_file: Case database YAML (source of truth)
+            store_dir: Store directory (defaults to <source_file>.store)
+        """
+        self.source_file = source_file
+        self.store_dir = store_dir or source_file + STORE_SUFFIX
+        self.manifest = self._read_manifest()
+
+    # ------------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def _empty_manifest() -> Dict[str, Any]:
+        return {
+            'format_version': STORE_FORMAT_VERSION,
+            'source_file': '',
+            'ingested_bytes': 0,
+            'tail_sha256': _sha256(b''),
+            'count': 0,
+            'strings_bytes': 0,
+            'columns': {name: dtype.str for name, dtype in COLUMN_DTYPES.items()},
+            'facility_vocabulary': {},
+            # Rows of the unsealed trailing document: {'rows', 'strings_bytes', 'end', 'sha256'}
+            'provisional': None
+        }
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        """Read the manifest, or an empty one if missing / from another format"""
+        try:
+            with open(os.path.join(self.store_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return self._empty_manifest()
+        if manifest.get('format_version') != STORE_FORMAT_VERSION:
+            return self._empty_manifest()
+        return manifest
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Atomically replace the manifest (the commit point of an ingest)"""
+        fd, tmp_path = tempfile.mkstemp(prefix='.manifest-', dir=self.store_dir)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, os.path.join(self.store_dir, MANIFEST_FILE))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.manifest = manifest
+
+    def __len__(self) -> int:
+        return self.manifest['count']
+
+    # ------------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------------
+
+    def _prefix_unchanged(self, f) -> bool:
+        """Check that the end of the already-ingested bytes is as we left it"""
+        ingested = self.manifest['ingested_bytes']
+        if os.fstat(f.fileno()).st_size < ingested:
+            return False
+        tail_start = max(0, ingested - TAIL_CHECK_BYTES)
+        f.seek(tail_start)
+        return _sha256(f.read(ingested - tail_start)) == self.manifest['tail_sha256']
+
+    def _truncate_to_manifest(self) -> None:
+        """Drop rows a crashed ingest appended after the last manifest commit"""
+        count = self.manifest['count']
+        strings_bytes = self.manifest.get('strings_bytes', 0)
+        for name, dtype in COLUMN_DTYPES.items():
+            path = _column_path(self.store_dir, name)
+            if os.path.exists(path) and os.path.getsize(path) > count * dtype.itemsize:
+                os.truncate(path, count * dtype.itemsize)
+        path = os.path.join(self.store_dir, OFFSETS_FILE)
+        if os.path.exists(path) and os.path.getsize(path) > count * 16:
+            os.truncate(path, count * 16)
+        path = os.path.join(self.store_dir, STRINGS_FILE)
+        if os.path.exists(path) and os.path.getsize(path) > strings_bytes:
+            os.truncate(path, strings_bytes)
+
+    def ingest(self) -> int:
+        """
+        Ingest cases appended to the source file since the last ingest
+
+        Returns:
+            Number of cases added (a re-parsed provisional case is not counted again)
+
+        Raises:
+            FileNotFoundError: If the source file does not exist
+        """
+        os.makedirs(self.store_dir, exist_ok=True)
+        with open(self.source_file, 'rb') as f:
+            if not self._prefix_unchanged(f):
+                return self.rebuild()
+            self._truncate_to_manifest()
+
+            start_offset = self.manifest['ingested_bytes']
+            f.seek(start_offset)
+            tail = f.read()
+
+        provisional = self.manifest.get('provisional')
+        if provisional:
+            if start_offset + len(tail) == provisional['end'] and _sha256(tail) == provisional['sha256']:
+                return 0  # the trailing document is exactly as last ingested
+            # Commit dropping its rows before truncating them, so a crash cannot leave the manifest ahead of the files
+            self._write_manifest(dict(
+                self.manifest,
+                count=self.manifest['count'] - provisional['rows'],
+                strings_bytes=provisional['strings_bytes'],
+                provisional=None
+            ))
+            self._truncate_to_manifest()
+
+        manifest = dict(self.manifest)
+        vocabulary = dict(manifest['facility_vocabulary'])
+        features: List[Dict[str, Any]] = []
+        offsets: List[Tuple[int, int]] = []
+        ingested_to = start_offset
+        unsealed_rows = 0
+        unsealed_end = start_offset
+
+        for start, end, sealed, document in iter_documents(tail, start_offset):
+            try:
+                data = yaml.load(document, Loader=_YAML_LOADER)
+            except yaml.YAMLError as e:
+                if not sealed:
+                    # Possibly a write in progress: retry from here next time
+                    break
+                print(f"Warning: Skipping malformed document at byte {start} of {self.source_file}: {e}")
+                ingested_to = end
+                continue
+            records = iter_case_records(data)
+            for record in records:
+                features.append(extract_case_features(record))
+                offsets.append((start, end))
+            if sealed:
+                ingested_to = end
+            else:
+                # Parses, but the write may not be finished: keep it provisional
+                unsealed_rows, unsealed_end = len(records), end
+
+        dropped = provisional['rows'] if provisional else 0
+        if ingested_to == start_offset and not unsealed_rows:
+            return 0
+
+        sealed_rows = len(features) - unsealed_rows
+        if sealed_rows:
+            manifest['strings_bytes'] = self._append_rows(features[:sealed_rows], offsets[:sealed_rows], vocabulary)
+        manifest['provisional'] = None
+        if unsealed_rows:
+            manifest['provisional'] = {
+                'rows': unsealed_rows,
+                'strings_bytes': manifest['strings_bytes'],
+                'end': unsealed_end,
+                'sha256': _sha256(tail[ingested_to - start_offset:unsealed_end - start_offset])
+            }
+            manifest['strings_bytes'] = self._append_rows(features[sealed_rows:], offsets[sealed_rows:], vocabulary)
+
+        with open(self.source_file, 'rb') as f:
+            tail_start = max(0, ingested_to - TAIL_CHECK_BYTES)
+            f.seek(tail_start)
+            tail_sha256 = _sha256(f.read(ingested_to - tail_start))
+
+        manifest.update({
+            'source_file': os.path.basename(self.source_file),
+            'ingested_bytes': ingested_to,
+            'tail_sha256': tail_sha256,
+            'count': manifest['count'] + len(features),
+            'facility_vocabulary': vocabulary
+        })
+        self._write_manifest(manifest)
+        # A re-parsed provisional document replaces its rows rather than adding to them
+        return max(0, len(features) - dropped)
+
+    def _append_rows(
+        self,
+        features: List[Dict[str, Any]],
+        offsets: List[Tuple[int, int]],
+        vocabulary: Dict[str, int]
+    ) -> int:
+        """Append new rows to every column file; returns the new size of the strings file"""
+        n = len(features)
+        facility_codes = np.fromiter(
+            (vocabulary.setdefault(f['facility_type'].strip().casefold(), len(vocabulary))
+             if f['facility_type'] else -1 for f in features),
+            dtype=COLUMN_DTYPES['facility_code'], count=n
+        )
+        category_codes = np.fromiter(
+            (CATEGORIES.index(f['category']) if f['category'] in CATEGORIES else -1 for f in features),
+            dtype=COLUMN_DTYPES['category_code'], count=n
+        )
+        columns = {
+            name: np.fromiter((f[name] for f in features), dtype=COLUMN_DTYPES[name], count=n)
+            for name in NUMERIC_FEATURES
+        }
+        columns['facility_code'] = facility_codes
+        columns['category_code'] = category_codes
+
+        for name, values in columns.items():
+            with open(_column_path(self.store_dir, name), 'ab') as f:
+                f.write(values.tobytes())
+        with open(os.path.join(self.store_dir, OFFSETS_FILE), 'ab') as f:
+            f.write(np.asarray(offsets, dtype='<i8').tobytes())
+        with open(os.path.join(self.store_dir, STRINGS_FILE), 'ab') as f:
+            for feature in features:
+                f.write((json.dumps({
+                    'case_id': feature['case_id'],
+                    'project_name': feature['project_name'],
+                    'facility_type': feature['facility_type']
+                }, ensure_ascii=False) + "\n").encode('utf-8'))
+            return f.tell()
+
+    def rebuild(self) -> int:
+        """
+        Discard the store and ingest the whole source file again
+
+        Returns:
+            Number of cases ingested
+        """
+        os.makedirs(self.store_dir, exist_ok=True)
+        self._write_manifest(self._empty_manifest())
+        self._truncate_to_manifest()
+        return self.ingest()
+
+    def append_case(self, record: Dict[str, Any], case_key: Optional[str] = None) -> int:
+        """
+        Append a completed case to the source YAML as a new document and ingest it
+
+        Args:
+            record: Case record (Case_ID, Basic_Characteristics, ...)
+            case_key: Top-level key (defaults to the record's Case_ID)
+
+        Returns:
+            Number of cases added by the ingest
+        """
+        case_key = case_key or record['Case_ID']
+        document = yaml.dump({case_key: record}, Dumper=_YAML_DUMPER, sort_keys=False, allow_unicode=True)
+        with open(self.source_file, 'rb+') as f:
+            needs_newline = False
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+            f.write((("\n" if needs_newline else "") + "---\n\n" + document).encode('utf-8'))
+        return self.ingest()
+
+    # ------------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------------
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """
+        Memory-map every column
+
+        Returns:
+            Read-only arrays of length len(store) keyed by column name
+        """
+        count = self.manifest['count']
+        result = {}
+        for name, dtype in COLUMN_DTYPES.items():
+            if count == 0:
+                result[name] = np.empty(0, dtype=dtype)
+            else:
+                result[name] = np.memmap(_column_path(self.store_dir, name), dtype=dtype, mode='r', shape=(count,))
+        return result
+
+    def offsets(self) -> np.ndarray:
+        """Memory-map the (start, end) byte offsets of every case document"""
+        count = self.manifest['count']
+        if count == 0:
+            return np.empty((0, 2), dtype='<i8')
+        return np.memmap(os.path.join(self.store_dir, OFFSETS_FILE), dtype='<i8', mode='r', shape=(count, 2))
+
+    def strings(self) -> List[Dict[str, str]]:
+        """Get case_id / project_name / facility_type of every case"""
+        path = os.path.join(self.store_dir, STRINGS_FILE)
+        if not os.path.exists(path):
+            return []
+        with open(path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for _, line in zip(range(self.manifest['count']), f)]
+
+    def feature_matrix(self) -> CaseFeatureMatrix:
+        """
+        Build a CaseFeatureMatrix backed by the memory-mapped columns
+
+        Returns:
+            Feature matrix for CaseSimilarityMatcher.from_feature_matrix()
+        """
+        columns = self.columns()
+        strings = self.strings()
+        return CaseFeatureMatrix(
+            case_ids=[s['case_id'] for s in strings],
+            project_names=[s['project_name'] for s in strings],
+            columns={name: columns[name] for name in NUMERIC_FEATURES},
+            facility_codes=columns['facility_code'],
+            facility_vocabulary=dict(self.manifest['facility_vocabulary']),
+            category_codes=columns['category_code']
+        )
+
+    def read_case(self, index: int) -> Optional[Dict[str, Any]]:
+        """
+        Parse one case straight from its document in the source YAML
+
+        Args:
+            index: Row number in the store
+
+        Returns:
+            Case record, or None if the document no longer holds it
+        """
+        start, end = (int(x) for x in self.offsets()[index])
+        with open(self.source_file, 'rb') as f:
+            f.seek(start)
+            data = yaml.load(f.read(end - start), Loader=_YAML_LOADER)
+        case_id = self.strings()[index]['case_id']
+        for record in iter_case_records(data):
+            if str(record.get('Case_ID', '')) == case_id:
+                return record
+        return None
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Report how far the store lags the source file
+
+        Returns:
+            Dictionary with case count, ingested bytes, pending bytes and the
+            number of provisional cases (stored from the unsealed trailing document)
+        """
+        size = os.path.getsize(self.source_file)
+        ingested = self.manifest['ingested_bytes']
+        return {
+            'source_file': self.source_file,
+            'store_dir': self.store_dir,
+            'count': self.manifest['count'],
+            'ingested_bytes': ingested,
+            'source_bytes': size,
+            'pending_bytes': max(0, size - ingested),
+            'provisional_cases': (self.manifest.get('provisional') or {}).get('rows', 0)
+        }
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain the columnar case store of a case database YAML")
+    parser.add_argument('command', choices=['ingest', 'rebuild', 'status'])
+    parser.add_argument('source', nargs='?', default=DEFAULT_CASE_DATABASE_FILE, help="Case database YAML")
+    args = parser.parse_args(argv)
+
+    store = CaseStore(args.source)
+    if args.command == 'ingest':
+        added = store.ingest()
+        print(f"Ingested {added} new case(s); store holds {len(store)}")
+    elif args.command == 'rebuild':
+        print(f"Rebuilt store with {store.rebuild()} case(s)")
+    else:
+        status = store.status()
+        print(f"{status['count']} case(s) in {status['store_dir']}; "
+              f"{status['pending_bytes']:,} of {status['source_bytes']:,} bytes pending")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+CONTEXT BUILDER v1.0
+
+Purpose: Token-budgeted LLM context assembled from the relevant sections of registered prompt files
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+Whole prompt files used to be injected into every chat turn, even when one
+section applied. Instead, each registered markdown file is split once into
+heading-level sections (the same splitting as knowledge_search.py). Every
+section gets a precomputed token estimate and metadata tags:
+
+    building_type   healthcare / warehouse / commercial_office / public_works
+    stage           BIDDING / POST_AWARD / FINAL
+    region          region IDs (CA_Inland, ...) and state codes (CA, TX, NY, FL)
+
+Tags are detected from English and Chinese keywords in the heading and body.
+Given a project profile and a token budget, sections are scored as follows.
+The source layer sets the base weight. Matching tags boost a section,
+sections tagged only for other building types / stages / regions are damped,
+and query term overlap boosts further. The best sections are then packed
+greedily into the budget and emitted per file in document order, so each
+file still reads top to bottom.
+
+Sections are cached per file and SHA-256 for the life of the builder (one per
+router), and re-split only when a file's content changes. A request costs a few dict
+lookups per file plus scoring.
+
+Token counts are estimates (about 4 characters per token for Latin text,
+1 token per CJK character), deliberately on the generous side for budgeting.
+
+Usage:
+    router = KnowledgePromptsRouter()
+    context = router.build_context(
+        {"building_type": "healthcare", "stage": "BIDDING", "region": "CA_Inland"},
+        token_budget=6000,
+        query="OSHPD seismic renovation contingency"
+    )
+    print(context["tokens"], [s["heading"] for s in context["sections"]])
+"""
+
+import math
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from canonical_keys import BUILDING_TYPES, REGION_IDS, STAGES
+from knowledge_search import split_sections, tokenize
+from prompt_content_cache import PromptContentCache, get_prompt_content_cache
+
+DEFAULT_CONTEXT_BUDGET = 8000
+
+# Base weight of a section by the registry layer of its file
+LAYER_WEIGHTS = {
+    'layer1': 1.0,
+    'layer2': 1.0,
+    'gc_specific': 0.9,
+    'layer3': 0.6
+}
+# Multipliers for tag matches / tag-only-for-something-else, per profile dimension
+TAG_MATCH_BOOST = 2.0
+TAG_MISMATCH_DAMPING = 0.1
+# Multiplier at full query term overlap (linear in the fraction of query terms found)
+QUERY_BOOST = 3.0
+# First section of a file (title, purpose, conventions) keeps each selected file readable
+PREAMBLE_BOOST = 1.5
+
+_CJK = re.compile(r"[㐀-䶿一-鿿豈-﫿]")
+
+BUILDING_TYPE_KEYWORDS = {
+    'healthcare': ('healthcare', 'hospital', 'oshpd', 'hcai', 'medical', 'clinic', 'behavioral health', '醫療', '醫院'),
+    'warehouse': ('warehouse', 'distribution center', 'cold storage', 'tilt-up', 'logistics', '倉庫', '倉儲', '物流'),
+    'commercial_office': ('commercial office', 'office building', 'tenant improvement', 'class a office', '辦公', '商業'),
+    'public_works': ('public works', 'prevailing wage', 'public agency', '公共工程')
+}
+STAGE_KEYWORDS = {
+    'BIDDING': ('bidding', 'bid stage', 'bidding_stage', '投標'),
+    'POST_AWARD': ('post-award', 'post award', 'post_award', '得標'),
+    'FINAL': ('final stage', 'final_stage', 'final design', '最終')
+}
+REGION_KEYWORDS = {
+    'CA_Bay_Area': ('bay area', 'san francisco', 'oakland', 'san jose', '灣區'),
+    'CA_Coastal': ('ca_coastal', 'coastal california', 'los angeles', 'san diego', 'orange county', '沿海'),
+    'CA_Inland': ('ca_inland', 'inland empire', 'tustin', 'fresno', 'bakersfield', '內陸'),
+    'TX_Coastal': ('tx_coastal', 'houston', 'corpus christi', 'galveston'),
+    'TX_Inland': ('tx_inland', 'dallas', 'austin', 'san antonio', 'fort worth'),
+    'NY_Urban': ('ny_urban', 'new york', 'nyc', 'manhattan', 'brooklyn'),
+    'FL_Statewide': ('fl_statewide', 'florida', 'miami', 'tampa', 'orlando')
+}
+STATE_KEYWORDS = {
+    'CA': ('california', '加州'),
+    'TX': ('texas', '德州'),
+    'NY': ('new york', '紐約'),
+    'FL': ('florida', '佛州', '佛羅里達')
+}
+
+def _keyword_pattern(keywords: Sequence[str]) -> "re.Pattern":
+    """Alternation matching whole ASCII words (CJK keywords match anywhere)"""
+    parts = [re.escape(k) if _CJK.search(k) else rf"(?<![a-z0-9]){re.escape(k)}(?![a-z0-9])" for k in keywords]
+    return re.compile("|".join(parts))
+
+_TAG_PATTERNS = {
+    'building_type': {tag: _keyword_pattern(k) for tag, k in BUILDING_TYPE_KEYWORDS.items()},
+    'stage': {tag: _keyword_pattern(k) for tag, k in STAGE_KEYWORDS.items()},
+    'region': {
+        **{tag: _keyword_pattern(k) for tag, k in REGION_KEYWORDS.items()},
+        **{tag: _keyword_pattern(k) for tag, k in STATE_KEYWORDS.items()}
+    }
+}
+
+# ============================================================================
+# DATA STRUCTURES
+# ============================================================================
+
+@dataclass(frozen=True)
+class PromptSection:
+    """One heading-level section of a prompt file with its precomputed metadata"""
+    heading: str
+    start_line: int
+    end_line: int
+    start_char: int
+    end_char: int
+    tokens: int
+    label_tokens: int                # tokens of the heading label added when the text has no heading line
+    position: int
+    building_types: FrozenSet[str]
+    stages: FrozenSet[str]
+    regions: FrozenSet[str]
+    terms: FrozenSet[str]
+
+@dataclass
+class ContextSource:
+    """A registered prompt file offered to the builder"""
+    name: str
+    version: Optional[str]
+    layer: str
+    local_path: str
+    file_path: Optional[str] = None
+
+# ============================================================================
+# TOKENS AND TAGS
+# ============================================================================
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the LLM token count of a text
+
+    Args:
+        text: Mixed English / Chinese text
+
+    Returns:
+        ceil(non-CJK characters / 4 + CJK characters)
+    """
+    cjk = len(_CJK.findall(text))
+    return math.ceil((len(text) - cjk) / 4 + cjk)
+
+def detect_tags(text: str) -> Dict[str, FrozenSet[str]]:
+    """
+    Detect building type / stage / region tags of a text
+
+    Returns:
+        {'building_type': {...}, 'stage': {...}, 'region': {...}} (region tags
+        hold region IDs and state codes; a region ID also implies its state)
+    """
+    lowered = text.lower()
+    tags = {
+        dimension: {tag for tag, pattern in patterns.items() if pattern.search(lowered)}
+        for dimension, patterns in _TAG_PATTERNS.items()
+    }
+    tags['region'] |= {region.split('_', 1)[0] for region in tags['region'] if '_' in region}
+    return {dimension: frozenset(values) for dimension, values in tags.items()}
+
+def profile_tags(profile: Dict[str, Any]) -> Dict[str, FrozenSet[str]]:
+    """
+    Map a project profile to the tags it matches
+
+    Args:
+        profile: building_type, stage, region (any accepted spelling; missing = no preference)
+
+    Returns:
+        Tags per dimension (empty sets for dimensions the profile leaves open)
+    """
+    building_type = profile.get('building_type')
+    building_type = BUILDING_TYPES.canonical(building_type) or (str(building_type).casefold() if building_type else None)
+    if building_type == 'commercial':
+        building_type = 'commercial_office'
+    stage = STAGES.canonical(profile.get('stage')) if profile.get('stage') else None
+
+    region = profile.get('region')
+    regions = set()
+    if region:
+        canonical = next((r for r in REGION_IDS if r.casefold() == str(region).casefold()), None)
+        if canonical:
+            regions = {canonical, canonical.split('_', 1)[0]}
+        else:
+            regions = {str(region).upper()}
+    return {
+        'building_type': frozenset([building_type] if building_type else []),
+        'stage': frozenset([stage] if stage else []),
+        'region': frozenset(regions)
+    }
+
+# ============================================================================
+# CONTEXT BUILDER
+# ============================================================================
+
+class ContextBuilder:
+    """
+    Section index over prompt files and budgeted context assembly
+    """
+
+    def __init__(self, content_cache: Optional[PromptContentCache] = None):
+        """
+        Args:
+            content_cache: Prompt file cache (defaults to the process-wide cache)
+        """
+        self._content = content_cache or get_prompt_content_cache()
+        self._sections: Dict[str, Tuple[str, List[PromptSection]]] = {}
+        self._lock = threading.Lock()
+
+    def sections(self, path: str) -> Tuple[str, List[PromptSection]]:
+        """
+        Get the sections of a prompt file (split once per file content)
+
+        Args:
+            path: Local prompt file path
+
+        Returns:
+            (file content, sections in document order)
+        """
+        prompt = self._content.read(path)
+        cached = self._sections.get(path)
+        if cached is not None and cached[0] == prompt.sha256:
+            return prompt.content, cached[1]
+
+        content = prompt.content
+        sections = []
+        for position, section in enumerate(split_sections(path, content)):
+            text = content[section.start_char:section.end_char]
+            tags = detect_tags(text)
+            # Sections split off a long section (and YAML keys) carry no heading line of their own
+            labelled = not text.lstrip().startswith('#')
+            sections.append(PromptSection(
+                heading=section.heading,
+                start_line=section.start_line,
+                end_line=section.end_line,
+                start_char=section.start_char,
+                end_char=section.end_char,
+                tokens=estimate_tokens(text),
+                label_tokens=estimate_tokens(_section_label(section.heading)) + 1 if labelled else 0,
+                position=position,
+                building_types=tags['building_type'],
+                stages=tags['stage'],
+                regions=tags['region'],
+                terms=frozenset(tokenize(text))
+            ))
+        with self._lock:
+            self._sections[path] = (prompt.sha256, sections)
+        return content, sections
+
+    def score(
+        self,
+        section: PromptSection,
+        source: ContextSource,
+        wanted: Dict[str, FrozenSet[str]],
+        query_terms: FrozenSet[str]
+    ) -> float:
+        """Relevance of one section to a profile / query (0 excludes it)"""
+        score = LAYER_WEIGHTS.get(source.layer, 0.5)
+        if section.position == 0:
+            score *= PREAMBLE_BOOST
+        for tags, dimension in ((section.building_types, 'building_type'),
+                                (section.stages, 'stage'),
+                                (section.regions, 'region')):
+            if not tags or not wanted[dimension]:
+                continue
+            score *= TAG_MATCH_BOOST if tags & wanted[dimension] else TAG_MISMATCH_DAMPING
+        if query_terms:
+            score *= 1.0 + QUERY_BOOST * len(query_terms & section.terms) / len(query_terms)
+        return score
+
+    def assemble(
+        self,
+        sources: Sequence[ContextSource],
+        profile: Optional[Dict[str, Any]] = None,
+        token_budget: int = DEFAULT_CONTEXT_BUDGET,
+        query: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Pack the most relevant sections of the sources into a token budget
+
+        Args:
+            sources: Prompt files to draw from, in output order
+            profile: Project profile (building_type, stage, region)
+            token_budget: Upper bound on the estimated tokens of the context
+            query: Free text of the current turn (optional)
+
+        Returns:
+            Dictionary with context (text), tokens, token_budget, sections
+            (selected section metadata), omitted_sections and available_tokens
+            (estimated tokens of all candidate sections)
+        """
+        wanted = profile_tags(profile or {})
+        query_terms = frozenset(tokenize(query)) if query else frozenset()
+
+        candidates = []
+        contents = {}
+        for s, source in enumerate(sources):
+            try:
+                content, sections = self.sections(source.local_path)
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Warning: Skipping {source.name}: {e}")
+                continue
+            contents[s] = content
+            for section in sections:
+                score = self.score(section, source, wanted, query_terms)
+                if score > 0:
+                    candidates.append((score, s, section))
+
+        # Highest score first; among equals, the cheaper section
+        candidates.sort(key=lambda c: (-c[0], c[2].tokens))
+        selected = []
+        used = 0
+        headers = set()
+        for score, s, section in candidates:
+            header_tokens = 0 if s in headers else estimate_tokens(_source_header(sources[s])) + 1
+            cost = section.tokens + header_tokens + section.label_tokens
+            if used + cost > token_budget:
+                continue
+            selected.append((s, section, score))
+            headers.add(s)
+            used += cost
+
+        selected.sort(key=lambda c: (c[0], c[1].position))
+        parts = []
+        current = None
+        for s, section, _ in selected:
+            if s != current:
+                parts.append(_source_header(sources[s]))
+                current = s
+            text = contents[s][section.start_char:section.end_char].strip()
+            parts.append(f"{_section_label(section.heading)}\n{text}" if section.label_tokens else text)
+
+        return {
+            'context': "\n\n".join(parts),
+            'tokens': used,
+            'token_budget': token_budget,
+            'sections': [
+                {
+                    'name': sources[s].name,
+                    'file_path': sources[s].file_path,
+                    'heading': section.heading,
+                    'start_line': section.start_line,
+                    'end_line': section.end_line,
+                    'tokens': section.tokens,
+                    'score': round(score, 4),
+                    'tags': {
+                        'building_type': sorted(section.building_types),
+                        'stage': sorted(section.stages),
+                        'region': sorted(section.regions)
+                    }
+                }
+                for s, section, score in selected
+            ],
+            'omitted_sections': len(candidates) - len(selected),
+            'available_tokens': sum(c[2].tokens for c in candidates)
+        }
+
+# ============================================================================
+# UTILITY FUNCTIONS
+# ============================================================================
+
+def _section_label(heading: str) -> str:
+    return f"<!-- section: {heading} -->"
+
+def _source_header(source: ContextSource) -> str:
+    version = f" v{source.version}" if source.version else ""
+    return f"<!-- source: {source.name}{version} -->"
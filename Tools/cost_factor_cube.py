@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+COST FACTOR CUBE v1.0
+
+Purpose: Precompiled composite cost multiplier over region x building type x stage x renovation scope
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+A full estimate combines three sources that used to be looked up one by one:
+
+    geotech        GeotechnicalAssessment final_adjustment (region, building type, stage)
+    renovation     RenovationCostFactors final_factor (building type, scope, region, stage)
+    state rates    References/MULTI_STATE_COST_RATES_v1.0.md labor cost index (CA = 1.00)
+
+The cube holds, for every (region, building type, stage, scope) cell, the
+components and their product relative to a California new-construction
+baseline:
+
+    composite = state_labor_index x renovation_factor x (1 + geotech_adjustment)
+
+Following the conflict rules of the state rates file, new construction uses
+the state labor index (renovation factor 1.0), while renovation scopes use
+the renovation matrix factor, whose regional adjustment already prices the
+local labor market (state index 1.0). States outside the rates table use the
+file's national average fallback (CA x 0.90) and are flagged.
+
+The cube is compiled with NumPy broadcasting from the engines' lookup tables
+and rebuilt only when one of the three input files changes (the matrices via
+the shared matrix cache, the rates file by mtime / content). factor() is a
+single array index; factor_batch() prices whole portfolios.
+
+Usage:
+    from cost_factor_cube import CostFactorCube
+
+    cube = CostFactorCube()
+    cube.factor("CA_Bay_Area", "healthcare", "BIDDING", "moderate")
+    cube.breakdown("TX_Inland", "warehouse", "FINAL").composite
+    cube.factor_batch(["CA_Inland", "NY_Urban"], "commercial_office", "BIDDING",
+                      ["new_construction", "heavy"], hard_costs=[12e6, 30e6])
+"""
+
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from batch_columns import batch_length, encode_column
+from canonical_keys import STAGES, KeyAliases
+from geotechnical_cost_assessment import GeotechnicalAssessment
+from instrumentation import INSTRUMENTATION
+from matrix_cache import SharedMatrixCache, get_shared_cache
+from renovation_cost_factors import DEFAULT_RENOVATION_MATRIX_FILE, RENOVATION_SCOPES, RenovationCostFactors
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_GEOTECH_MATRIX_FILE = os.path.join(REPO_ROOT, "Data", "GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml")
+DEFAULT_STATE_RATES_FILE = os.path.join(REPO_ROOT, "References", "MULTI_STATE_COST_RATES_v1.0.md")
+
+NEW_CONSTRUCTION = 'new_construction'
+CUBE_SCOPES = KeyAliases(
+    (NEW_CONSTRUCTION,) + RENOVATION_SCOPES,
+    aliases={
+        'new': NEW_CONSTRUCTION,
+        'none': NEW_CONSTRUCTION,
+        **{f"{scope}_renovation": scope for scope in RENOVATION_SCOPES}
+    },
+    label="Renovation scope"
+)
+
+# Used when the rates file has no fallback rule ("Apply CA rates x 0.90 ...")
+DEFAULT_FALLBACK_STATE = 'CA'
+DEFAULT_FALLBACK_MULTIPLIER = 0.90
+
+_TABLE_ROW = re.compile(r"^\|\s*([A-Z]{2})\s*\|\s*([0-9]*\.?[0-9]+)\s*\|\s*$")
+_FALLBACK_RULE = re.compile(r"Apply\s+([A-Z]{2})\s+rates\s*[x×*]\s*([0-9]*\.?[0-9]+)")
+_VERSION = re.compile(r"^Version:\s*(\S+)", re.MULTILINE)
+
+# ============================================================================
+# DATA STRUCTURES
+# ============================================================================
+
+@dataclass
+class CompositeFactor:
+    """Composite multiplier of one cube cell with its components"""
+    region: str
+    building_type: str
+    stage: str
+    renovation_scope: str
+    state: str
+    geotech_adjustment: float
+    renovation_factor: float
+    state_labor_index: float
+    composite: float
+    state_fallback: bool
+    hard_cost: Optional[float] = None
+    adjusted_cost: Optional[float] = None
+
+# ============================================================================
+# STATE RATES
+# ============================================================================
+
+def load_state_rates(path: str) -> Dict[str, Any]:
+    """
+    Parse the labor cost index and national fallback rule of the state rates file
+
+    Args:
+        path: MULTI_STATE_COST_RATES markdown file
+
+    Returns:
+        Dictionary with version, labor_cost_index ({state: index}),
+        fallback_state and fallback_multiplier
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    labor_cost_index = {}
+    in_table = False
+    for line in content.splitlines():
+        if line.startswith('## '):
+            in_table = 'LABOR COST INDEX' in line.upper()
+            continue
+        if in_table:
+            match = _TABLE_ROW.match(line.strip())
+            if match:
+                labor_cost_index[match.group(1)] = float(match.group(2))
+    if not labor_cost_index:
+        print(f"Warning: No LABOR COST INDEX table in {path}")
+
+    fallback = _FALLBACK_RULE.search(content)
+    version = _VERSION.search(content)
+    return {
+        'version': version.group(1) if version else None,
+        'labor_cost_index': labor_cost_index,
+        'fallback_state': fallback.group(1) if fallback else DEFAULT_FALLBACK_STATE,
+        'fallback_multiplier': float(fallback.group(2)) if fallback else DEFAULT_FALLBACK_MULTIPLIER
+    }
+
+def region_state(region: str) -> str:
+    """State code of a region ID (CA_Bay_Area -> CA)"""
+    return region.split('_', 1)[0].upper()
+
+# ============================================================================
+# FACTOR CUBE
+# ============================================================================
+
+class CostFactorCube:
+    """
+    Composite geotech x renovation x state rate multipliers, compiled into one array
+    """
+
+    def __init__(
+        self,
+        assessment: Optional[GeotechnicalAssessment] = None,
+        renovation: Optional[RenovationCostFactors] = None,
+        rates_file: str = DEFAULT_STATE_RATES_FILE,
+        cache: Optional[SharedMatrixCache] = None
+    ):
+        """
+        Initialize the cube (compiled on first use)
+
+        Args:
+            assessment: Geotechnical engine (default: the repository matrix)
+            renovation: Renovation factor engine (default: the repository matrix)
+            rates_file: Multi-state cost rates markdown file
+            cache: Cache used for the rates file (defaults to the process-wide shared cache)
+        """
+        self._cache = cache or get_shared_cache()
+        self.assessment = assessment or GeotechnicalAssessment(DEFAULT_GEOTECH_MATRIX_FILE, cache=self._cache)
+        self.renovation = renovation or RenovationCostFactors(DEFAULT_RENOVATION_MATRIX_FILE, cache=self._cache)
+        self.rates_file = rates_file
+        self._tables: Optional[Dict[str, Any]] = None
+        # The input tables the cube was compiled from (kept alive so identity checks stay valid)
+        self._inputs: Optional[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]] = None
+
+    def _load_rates(self) -> Dict[str, Any]:
+        """Get the parsed state rates (re-parsed only when the file changes)"""
+        try:
+            return self._cache.get(self.rates_file, loader=load_state_rates)
+        except FileNotFoundError:
+            print(f"Warning: State rates file not found at {self.rates_file}")
+            return {'version': None, 'labor_cost_index': {}, 'fallback_state': DEFAULT_FALLBACK_STATE,
+                    'fallback_multiplier': DEFAULT_FALLBACK_MULTIPLIER}
+
+    def tables(self) -> Dict[str, Any]:
+        """
+        Get the compiled cube, rebuilding it if an input file changed
+
+        Returns:
+            Dictionary with region_ids, building_type_ids, stage_ids, scope_ids,
+            their *_index dicts, states, state_fallback (per region), and the
+            (region, building type, stage, scope) arrays geotech_adjustment,
+            renovation_factor, state_labor_index and composite (NaN where an
+            input has no value)
+        """
+        geotech = self.assessment.lookup_tables()
+        renovation = self.renovation.lookup_tables()
+        rates = self._load_rates()
+        inputs = (geotech, renovation, rates)
+        if self._tables is None or any(new is not old for new, old in zip(inputs, self._inputs)):
+            start = time.perf_counter() if INSTRUMENTATION.enabled else None
+            self._tables = self._compile(geotech, renovation, rates)
+            self._inputs = inputs
+            if start is not None:
+                INSTRUMENTATION.observe("cost_cube_build_seconds", time.perf_counter() - start)
+        return self._tables
+
+    def refresh(self) -> bool:
+        """
+        Rebuild the cube if an input file changed on disk
+
+        Returns:
+            True if the cube was rebuilt
+        """
+        tables = self._tables
+        return self.tables() is not tables
+
+    def _compile(self, geotech: Dict[str, Any], renovation: Dict[str, Any], rates: Dict[str, Any]) -> Dict[str, Any]:
+        """Broadcast the three inputs into the (region, building type, stage, scope) cube"""
+        region_ids = list(geotech['region_ids'])
+        building_type_ids = list(geotech['building_type_ids'])
+        stage_ids = list(STAGES.ids)
+        scope_ids = list(CUBE_SCOPES.ids)
+        shape = (len(region_ids), len(building_type_ids), len(stage_ids), len(scope_ids))
+
+        # Geotech: (R, S) base / risk x (B,) multiplier -> (R, B, S)
+        geotech_stage = [geotech['stage_index'][s] for s in stage_ids]
+        base = geotech['base_adjustment'][:, geotech_stage]
+        risk = geotech['risk_premium'][:, geotech_stage]
+        adjustment = base[:, None, :] * geotech['building_type_multiplier'][None, :, None] + risk[:, None, :]
+        geotech_adjustment = np.broadcast_to(adjustment[..., None], shape).copy()
+
+        # Renovation: (B', C', R', S') matrix tables gathered onto the cube axes; new construction is 1.0
+        renovation_factor = np.full(shape, np.nan)
+        renovation_factor[..., 0] = 1.0
+        r_codes = np.array([_code(renovation['region_index'], r) for r in region_ids], dtype=np.intp)
+        b_codes = np.array([_code(renovation['building_type_index'], b) for b in building_type_ids], dtype=np.intp)
+        s_codes = np.array([renovation['stage_index'][s] for s in stage_ids], dtype=np.intp)
+        c_codes = np.array([renovation['scope_index'][c] for c in scope_ids[1:]], dtype=np.intp)
+        r_ok, b_ok = r_codes >= 0, b_codes >= 0
+        if r_ok.any() and b_ok.any():
+            final = renovation['final_factor'][np.ix_(b_codes[b_ok], c_codes, r_codes[r_ok], s_codes)]
+            # (B, C, R, S) -> (R, B, S, C)
+            renovation_factor[np.ix_(r_ok, b_ok, np.arange(len(stage_ids)), np.arange(1, len(scope_ids)))] = (
+                final.transpose(2, 0, 3, 1)
+            )
+
+        # State labor index: new construction only (renovation factors carry their own regional adjustment)
+        labor = rates['labor_cost_index']
+        fallback_base = labor.get(rates['fallback_state'], 1.0) * rates['fallback_multiplier']
+        states = [region_state(r) for r in region_ids]
+        state_fallback = np.array([s not in labor for s in states], dtype=bool)
+        state_index = np.array([labor.get(s, fallback_base) for s in states], dtype=float)
+        state_labor_index = np.ones(shape)
+        state_labor_index[..., 0] = state_index[:, None, None]
+
+        composite = state_labor_index * renovation_factor * (1.0 + geotech_adjustment)
+
+        return {
+            'region_ids': region_ids,
+            'building_type_ids': building_type_ids,
+            'stage_ids': stage_ids,
+            'scope_ids': scope_ids,
+            'region_index': geotech['region_index'],
+            'building_type_index': geotech['building_type_index'],
+            'stage_index': STAGES.index(),
+            'scope_index': CUBE_SCOPES.index(),
+            'states': states,
+            'state_fallback': state_fallback,
+            'rates_version': rates.get('version'),
+            'geotech_adjustment': geotech_adjustment,
+            'renovation_factor': renovation_factor,
+            'state_labor_index': state_labor_index,
+            'composite': composite
+        }
+
+    # ------------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------------
+
+    def _cell(self, tables: Dict[str, Any], region: str, building_type: str, stage: Any, scope: str) -> Tuple[int, int, int, int]:
+        """Array index of a query, raising ValueError for unknown keys or empty cells"""
+        idx = []
+        for value, axis, label in (
+            (region, 'region', 'Region'),
+            (building_type, 'building_type', 'Building type'),
+            (stage, 'stage', 'Stage'),
+            (scope, 'scope', 'Renovation scope')
+        ):
+            code = tables[f"{axis}_index"].code(value)
+            if code is None:
+                raise ValueError(f"{label} '{value}' not found. Available: {tables[f'{axis}_ids']}")
+            idx.append(code)
+        idx = tuple(idx)
+        if np.isnan(tables['composite'][idx]):
+            raise ValueError(f"No composite factor for {region} / {building_type} / {stage} / {scope}")
+        return idx
+
+    def factor(
+        self,
+        region: str,
+        building_type: str = "commercial_office",
+        stage: str = "BIDDING",
+        renovation_scope: str = NEW_CONSTRUCTION
+    ) -> float:
+        """
+        Get the composite multiplier of one combination
+
+        Args:
+            region: Region ID (e.g., "CA_Inland", "ca_inland")
+            building_type: Building type
+            stage: Project stage (BIDDING, POST_AWARD, FINAL)
+            renovation_scope: new_construction, light, moderate or heavy
+
+        Returns:
+            Composite multiplier relative to a California new-construction baseline
+        """
+        tables = self.tables()
+        return float(tables['composite'][self._cell(tables, region, building_type, stage, renovation_scope)])
+
+    def breakdown(
+        self,
+        region: str,
+        building_type: str = "commercial_office",
+        stage: str = "BIDDING",
+        renovation_scope: str = NEW_CONSTRUCTION,
+        hard_cost: Optional[float] = None
+    ) -> CompositeFactor:
+        """
+        Get the composite multiplier of one combination with its components
+
+        Args:
+            region: Region ID
+            building_type: Building type
+            stage: Project stage
+            renovation_scope: new_construction, light, moderate or heavy
+            hard_cost: California new-construction hard cost to adjust (optional)
+
+        Returns:
+            CompositeFactor
+        """
+        tables = self.tables()
+        idx = self._cell(tables, region, building_type, stage, renovation_scope)
+        r, b, s, c = idx
+        composite = float(tables['composite'][idx])
+        if tables['state_fallback'][r] and c == 0:
+            print(f"Warning: {tables['states'][r]} is outside the state rates table; "
+                  f"using the national average fallback")
+        return CompositeFactor(
+            region=tables['region_ids'][r],
+            building_type=tables['building_type_ids'][b],
+            stage=tables['stage_ids'][s],
+            renovation_scope=tables['scope_ids'][c],
+            state=tables['states'][r],
+            geotech_adjustment=float(tables['geotech_adjustment'][idx]),
+            renovation_factor=float(tables['renovation_factor'][idx]),
+            state_labor_index=float(tables['state_labor_index'][idx]),
+            composite=composite,
+            state_fallback=bool(tables['state_fallback'][r]),
+            hard_cost=hard_cost,
+            adjusted_cost=hard_cost * composite if hard_cost else None
+        )
+
+    def factor_batch(
+        self,
+        regions: Union[str, Sequence],
+        building_types: Union[str, Sequence] = "commercial_office",
+        stages: Union[str, Sequence] = "BIDDING",
+        renovation_scopes: Union[str, Sequence] = NEW_CONSTRUCTION,
+        hard_costs: Union[float, Sequence, None] = None
+    ) -> Dict[str, Any]:
+        """
+        Get composite multipliers for a whole portfolio
+
+        Each argument is either a scalar, broadcast to every row, or a list /
+        NumPy array with one value per row. Integer arrays are taken as
+        pre-encoded indices into the '*_ids' lists of tables().
+
+        Args:
+            regions: Region ID(s)
+            building_types: Building type(s)
+            stages: Project stage(s)
+            renovation_scopes: new_construction / light / moderate / heavy
+            hard_costs: California new-construction hard cost(s) (optional)
+
+        Returns:
+            Dictionary of NumPy arrays: composite, geotech_adjustment,
+            renovation_factor, state_labor_index, state_fallback and
+            adjusted_cost (NaN where no cost was given)
+        """
+        tables = self.tables()
+
+        n = batch_length(regions, building_types, stages, renovation_scopes, hard_costs)
+        region_idx = encode_column(regions, tables['region_index'], n, 'Region', tables['region_ids'])
+        bt_idx = encode_column(building_types, tables['building_type_index'], n, 'Building type', tables['building_type_ids'])
+        stage_idx = encode_column(stages, tables['stage_index'], n, 'Stage', tables['stage_ids'])
+        scope_idx = encode_column(renovation_scopes, tables['scope_index'], n, 'Renovation scope', tables['scope_ids'])
+
+        idx = (region_idx, bt_idx, stage_idx, scope_idx)
+        composite = tables['composite'][idx]
+        if np.isnan(composite).any():
+            missing = np.flatnonzero(np.isnan(composite))[:5]
+            combos = [
+                (tables['region_ids'][region_idx[i]], tables['building_type_ids'][bt_idx[i]],
+                 tables['stage_ids'][stage_idx[i]], tables['scope_ids'][scope_idx[i]])
+                for i in missing.tolist()
+            ]
+            raise ValueError(f"No composite factor for (region, building_type, stage, scope): {combos}")
+
+        if hard_costs is None:
+            adjusted_cost = np.full(n, np.nan)
+        else:
+            adjusted_cost = np.broadcast_to(np.asarray(hard_costs, dtype=float), (n,)) * composite
+
+        return {
+            'composite': composite,
+            'geotech_adjustment': tables['geotech_adjustment'][idx],
+            'renovation_factor': tables['renovation_factor'][idx],
+            'state_labor_index': tables['state_labor_index'][idx],
+            'state_fallback': tables['state_fallback'][region_idx] & (scope_idx == 0),
+            'adjusted_cost': adjusted_cost
+        }
+
+# ============================================================================
+# UTILITY FUNCTIONS
+# ============================================================================
+
+def _code(index: Dict, value: Any) -> int:
+    """Code of a spelling in an alias index, -1 if the other matrix lacks it"""
+    code = index.code(value)
+    return -1 if code is None else code
+
+def print_composite_factor(result: CompositeFactor) -> None:
+    """Print a composite factor breakdown"""
+    print("\n" + "="*80)
+    print(f"COMPOSITE COST FACTOR - {result.region} / {result.building_type} / {result.stage} / {result.renovation_scope}")
+    print("="*80)
+    print(f"State Labor Index ({result.state}): {result.state_labor_index:.3f}"
+          + ("  (national average fallback)" if result.state_fallback else ""))
+    print(f"Renovation Factor:      {result.renovation_factor:.3f}")
+    print(f"Geotech Adjustment:     {result.geotech_adjustment:.2%}")
+    print("-"*80)
+    print(f"Composite Multiplier:   {result.composite:.4f}")
+    if result.adjusted_cost:
+        print(f"Adjusted Cost:          ${result.adjusted_cost:,.0f} (from ${result.hard_cost:,.0f})")
+    print("="*80 + "\n")
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    cube = CostFactorCube()
+
+    print_composite_factor(cube.breakdown("CA_Bay_Area", "healthcare", "BIDDING", "moderate", hard_cost=75_500_000))
+    print_composite_factor(cube.breakdown("NY_Urban", "commercial_office", "FINAL", hard_cost=30_000_000))
+
+    portfolio = cube.factor_batch(
+        ["CA_Inland", "TX_Coastal", "FL_Statewide"],
+        ["warehouse", "commercial_office", "healthcare"],
+        "BIDDING",
+        ["new_construction", "light", "heavy"],
+        hard_costs=[12e6, 18e6, 40e6]
+    )
+    print("Portfolio composites:", portfolio['composite'].round(4).tolist())
+
+    start = time.perf_counter()
+    for _ in range(10000):
+        cube.factor("TX_Inland", "warehouse", "POST_AWARD", "moderate")
+    print(f"factor(): {(time.perf_counter() - start) * 100:.2f} us per call")
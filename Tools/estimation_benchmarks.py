@@ -0,0 +1,573 @@
+#!/usr/bin/env python3
+"""
+ESTIMATION BENCHMARKS v1.0
+
+Purpose: Measure startup and hot-path latency of the estimation tools
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+Usage:
+    python estimation_benchmarks.py startup
+    python estimation_benchmarks.py startup --matrix ../Data/GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml --repeat 50
+    python estimation_benchmarks.py router
+    python estimation_benchmarks.py memory --results 1000000
+
+    # Scaling suite on synthetic data (20/200/2,000 regions, 10k registry entries,
+    # 1k/10k/100k cases)
+    python estimation_benchmarks.py suite --output bench.json
+    python estimation_benchmarks.py suite --scales 20 200 --cases 1000 --baseline bench.json --tolerance 0.25
+
+The suite writes machine-readable JSON and exits with status 1 when a case
+exceeds its absolute limit in benchmark_thresholds.json (or --thresholds) or
+regresses past the tolerance against a --baseline results file.
+"""
+
+import argparse
+import fnmatch
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+
+from benchmark_fixtures import (
+    build_synthetic_case_features,
+    synthetic_region_id,
+    synthetic_registry_keys,
+    write_synthetic_matrix,
+    write_synthetic_registry
+)
+from matrix_cache import SharedMatrixCache
+from matrix_snapshot import compile_snapshot, load_matrix
+from geotechnical_cost_assessment import GeotechnicalAssessment
+from repo_paths import DEFAULT_MATRIX_FILE, default_registry_file, load_router_module
+
+DEFAULT_REGISTRY_FILE = default_registry_file()
+DEFAULT_THRESHOLDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_thresholds.json")
+
+# Suite defaults: synthetic region counts, registry size and case store sizes
+SUITE_SCALES = (20, 200, 2000)
+SUITE_REGISTRY_ENTRIES = 10000
+SUITE_CASE_SCALES = (1000, 10000, 100000)
+# Relative slowdown of a case's median vs. the baseline that counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# ============================================================================
+# TIMING HELPERS
+# ============================================================================
+
+def time_call(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """
+    Time repeated calls of a zero-argument function
+
+    Args:
+        func: Function to time
+        repeat: Number of timed calls
+
+    Returns:
+        Dictionary with min / median / mean / max latency in milliseconds
+    """
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return {
+        'min_ms': min(samples),
+        'median_ms': statistics.median(samples),
+        'mean_ms': statistics.fmean(samples),
+        'max_ms': max(samples)
+    }
+
+def time_per_call(func: Callable[[], object], number: int, repeat: int) -> Dict[str, float]:
+    """
+    Time a fast function as per-call latency over loops of calls
+
+    Args:
+        func: Function to time
+        number: Calls per timed loop
+        repeat: Number of timed loops
+
+    Returns:
+        Dictionary with min / median / mean / max per-call latency in microseconds
+    """
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) * 1e6 / number)
+    return {
+        'min_us': min(samples),
+        'median_us': statistics.median(samples),
+        'mean_us': statistics.fmean(samples),
+        'max_us': max(samples)
+    }
+
+def print_results(title: str, results: Dict[str, Dict[str, float]], unit: str = "ms") -> None:
+    """Print a benchmark result table"""
+    print("\n" + "="*80)
+    print(title)
+    print("="*80)
+    print(f"{'Case':<40} {'min ' + unit:>9} {'median ' + unit:>10} {'mean ' + unit:>9} {'max ' + unit:>9}")
+    print("-"*80)
+    for name, r in results.items():
+        print(
+            f"{name:<40} {r['min_' + unit]:>9.3f} {r['median_' + unit]:>10.3f} "
+            f"{r['mean_' + unit]:>9.3f} {r['max_' + unit]:>9.3f}"
+        )
+    print("="*80 + "\n")
+
+def print_memory_results(title: str, results: Dict[str, Dict[str, float]]) -> None:
+    """Print a memory footprint table"""
+    print("\n" + "="*80)
+    print(title)
+    print("="*80)
+    print(f"{'Case':<40} {'results':>10} {'total MB':>10} {'bytes/result':>13}")
+    print("-"*80)
+    for name, r in results.items():
+        print(f"{name:<40} {r['results']:>10,d} {r['total_mb']:>10.1f} {r['bytes_per_result']:>13.1f}")
+    print("="*80 + "\n")
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def benchmark_startup(matrix_file: str = DEFAULT_MATRIX_FILE, repeat: int = 20) -> Dict[str, Dict[str, float]]:
+    """
+    Compare matrix startup through YAML parsing vs. the binary snapshot
+
+    Works on a temporary copy of the matrix so the benchmark never touches
+    the snapshot next to the real file.
+
+    Args:
+        matrix_file: YAML matrix to benchmark
+        repeat: Timed iterations per case
+
+    Returns:
+        Timing results keyed by case name
+    """
+    workdir = tempfile.mkdtemp(prefix="geo-bench-")
+    try:
+        yaml_copy = os.path.join(workdir, os.path.basename(matrix_file))
+        shutil.copyfile(matrix_file, yaml_copy)
+
+        def parse_yaml():
+            with open(yaml_copy, 'rb') as f:
+                return yaml.safe_load(f)
+
+        results = {'yaml.safe_load': time_call(parse_yaml, repeat)}
+
+        compile_snapshot(yaml_copy)
+        results['load_matrix (fresh snapshot)'] = time_call(lambda: load_matrix(yaml_copy), repeat)
+        results['GeotechnicalAssessment() (snapshot)'] = time_call(lambda: GeotechnicalAssessment(yaml_copy), repeat)
+
+        def stale_load():
+            # Point at a missing snapshot so every call takes the YAML fallback
+            load_matrix(yaml_copy, snapshot_path=os.path.join(workdir, "missing.pkl"), write_snapshot=False)
+
+        results['load_matrix (stale -> YAML fallback)'] = time_call(stale_load, repeat)
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def benchmark_router(registry_file: str = DEFAULT_REGISTRY_FILE, number: int = 10000, repeat: int = 7) -> Dict[str, Dict[str, float]]:
+    """
+    Measure per-call latency of the router hot path
+
+    Covers the lookups the chat route issues for every message.
+
+    Args:
+        registry_file: Knowledge prompt registry YAML
+        number: Calls per timed loop
+        repeat: Timed loops per case
+
+    Returns:
+        Per-call timing results (microseconds) keyed by case name
+    """
+    router = load_router_module().KnowledgePromptsRouter(registry_file)
+    cases = {
+        "LAYER1": lambda: router.get_knowledge_prompt("LAYER1"),
+        "LAYER2 warehouse DECISION_MATRIX": lambda: router.get_knowledge_prompt(
+            "LAYER2", building_type="warehouse", prompt_type="DECISION_MATRIX"),
+        "LAYER2 public_works KNOWLEDGE": lambda: router.get_knowledge_prompt(
+            "LAYER2", building_type="public_works"),
+        "LAYER3 CASE_SIMILARITY_MATCHING": lambda: router.get_knowledge_prompt(
+            "LAYER3", tool_type="CASE_SIMILARITY_MATCHING"),
+        "GC_SPECIFIC uprite": lambda: router.get_knowledge_prompt("GC_SPECIFIC", gc_type="uprite"),
+        "GEOTECHNICAL_FACTORS": lambda: router.get_knowledge_prompt(
+            "GEOTECHNICAL_FACTORS", region="CA_Inland", stage="BIDDING"),
+        "LAYER2 miss": lambda: router.get_knowledge_prompt("LAYER2", building_type="lab")
+    }
+    return {name: time_per_call(func, number, repeat) for name, func in cases.items()}
+
+def benchmark_result_memory(matrix_file: str = DEFAULT_MATRIX_FILE, results: int = 1_000_000) -> Dict[str, Dict[str, float]]:
+    """
+    Measure the retained memory of assessment results
+
+    Keeps `results` results alive (cycling through every region x building
+    type x stage) and reports the traced allocation per result, including
+    the list slot holding it.
+
+    Args:
+        matrix_file: Geotechnical matrix YAML
+        results: Number of results to keep alive per case
+
+    Returns:
+        Dictionary with results, total_mb and bytes_per_result keyed by case name
+    """
+    assessment = GeotechnicalAssessment(matrix_file, auto_reload=False)
+    tables = assessment.lookup_tables()
+    combos = [
+        (region, building_type, stage)
+        for r, region in enumerate(tables['region_ids'])
+        for building_type in tables['building_type_ids']
+        for s, stage in enumerate(tables['stage_ids'])
+        if tables['base_adjustment'][r, s] == tables['base_adjustment'][r, s]  # not NaN
+    ]
+
+    def keep_alive(make: Callable[[str, str, str], object]) -> Dict[str, float]:
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            kept = [make(*combos[i % len(combos)]) for i in range(results)]
+            used = tracemalloc.get_traced_memory()[0] - baseline
+        finally:
+            tracemalloc.stop()
+        del kept
+        return {'results': results, 'total_mb': used / 1e6, 'bytes_per_result': used / results}
+
+    def with_breakdown(region: str, building_type: str, stage: str) -> object:
+        result = assessment.assess(region, building_type, stage, hard_cost=1e7)
+        result.breakdown
+        return result
+
+    return {
+        'assess() (compact result)': keep_alive(lambda r, b, s: assessment.assess(r, b, s, hard_cost=1e7)),
+        'assess() + breakdown accessed': keep_alive(with_breakdown),
+        'factors() (numbers only)': keep_alive(lambda r, b, s: assessment.factors(r, b, s, hard_cost=1e7))
+    }
+
+# ============================================================================
+# SCALING SUITE
+# ============================================================================
+
+def _load_repeat(repeat: int, regions: int) -> int:
+    """Fewer timed iterations for whole-file loads as the matrix grows"""
+    return max(1, repeat * 20 // max(regions, 20))
+
+def benchmark_geotech_scale(matrix_file: str, regions: int, repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Measure one synthetic matrix size end to end
+
+    Args:
+        matrix_file: Synthetic matrix YAML (see benchmark_fixtures)
+        regions: Number of regions in the matrix
+        repeat: Timed iterations for the load / startup cases
+
+    Returns:
+        Timing results keyed by case name (load cases in ms, hot paths in us)
+    """
+    load_repeat = _load_repeat(repeat, regions)
+
+    def parse_yaml():
+        with open(matrix_file, 'rb') as f:
+            return yaml.safe_load(f)
+
+    results = {'yaml_load': time_call(parse_yaml, load_repeat)}
+    compile_snapshot(matrix_file)
+    results['snapshot_load'] = time_call(lambda: load_matrix(matrix_file), repeat)
+    results['init'] = time_call(
+        lambda: GeotechnicalAssessment(matrix_file, cache=SharedMatrixCache()), repeat)
+
+    cold_start = (
+        "import sys; sys.path.insert(0, sys.argv[1]);"
+        "from geotechnical_cost_assessment import GeotechnicalAssessment;"
+        "GeotechnicalAssessment(sys.argv[2]).assess(sys.argv[3])"
+    )
+    tools_dir = os.path.dirname(os.path.abspath(__file__))
+    results['cold_start'] = time_call(lambda: subprocess.run(
+        [sys.executable, "-c", cold_start, tools_dir, matrix_file, synthetic_region_id(0)],
+        check=True
+    ), load_repeat)
+
+    assessment = GeotechnicalAssessment(matrix_file)
+    region_ids = [synthetic_region_id(i) for i in range(regions)]
+    stages = ['BIDDING', 'POST_AWARD', 'FINAL']
+    building_types = list(assessment.building_type_adjustments)
+    rng = random.Random(regions)
+    queries = [
+        (rng.choice(region_ids), rng.choice(building_types), rng.choice(stages))
+        for _ in range(4096)
+    ]
+    pending = itertools.cycle(queries)
+    results['assess'] = time_per_call(lambda: assessment.assess(*next(pending), hard_cost=1e7), 10000, repeat)
+
+    batch = list(zip(*(queries * 3)[:10000]))
+    results['assess_batch (10k rows)'] = time_call(
+        lambda: assessment.assess_batch(batch[0], batch[1], batch[2], 1e7), repeat)
+    results['compare_regions (all)'] = time_call(lambda: assessment.compare_regions(region_ids), load_repeat)
+    return results
+
+def benchmark_router_scale(registry_file: str, entries: int, repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Measure router startup and lookups against a large synthetic registry
+
+    Args:
+        registry_file: Synthetic registry YAML (see benchmark_fixtures)
+        entries: Synthetic entries in the registry
+        repeat: Timed loops for the lookup cases
+
+    Returns:
+        Timing results keyed by case name (init in ms, lookups in us)
+    """
+    router_class = load_router_module().KnowledgePromptsRouter
+    results = {'init': time_call(lambda: router_class(registry_file, cache=SharedMatrixCache()), 1)}
+    router = router_class(registry_file)
+
+    keys = synthetic_registry_keys(entries)
+    exact = [("LAYER2", {'building_type': k, 'prompt_type': "KNOWLEDGE"}) for k in keys['LAYER2'][::7]]
+    exact += [("LAYER3", {'tool_type': k}) for k in keys['LAYER3'][::11]]
+    exact += [("GC_SPECIFIC", {'gc_type': k}) for k in keys['GC_SPECIFIC'][::13]]
+    # Callers spell layers and keys in any case; the router folds them
+    mixed = [("layer2", {'building_type': k.title(), 'prompt_type': "decision_matrix"}) for k in keys['LAYER2'][::7]]
+    mixed += [("Layer3", {'tool_type': k.lower()}) for k in keys['LAYER3'][::11]]
+    mixed += [("gc_specific", {'gc_type': k.title()}) for k in keys['GC_SPECIFIC'][::13]]
+
+    def cycle(calls):
+        pending = itertools.cycle(calls)
+
+        def lookup():
+            layer, params = next(pending)
+            return router.get_knowledge_prompt(layer, **params)
+        return lookup
+
+    results['lookup (exact case)'] = time_per_call(cycle(exact), 10000, repeat)
+    results['lookup (mixed case)'] = time_per_call(cycle(mixed), 10000, repeat)
+    results['lookup (miss)'] = time_per_call(
+        lambda: router.get_knowledge_prompt("LAYER2", building_type="lab"), 10000, repeat)
+    return results
+
+def benchmark_case_matching_scale(cases: int, repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Measure case similarity matching against a synthetic case store
+
+    Args:
+        cases: Number of synthetic cases
+        repeat: Timed iterations / loops per case
+
+    Returns:
+        Timing results keyed by case name (build in ms, top_k in us)
+    """
+    from case_similarity_matching import CaseFeatureMatrix, CaseSimilarityMatcher
+
+    features = build_synthetic_case_features(cases)
+    results = {'build': time_call(lambda: CaseFeatureMatrix.from_features(features), repeat)}
+    matcher = CaseSimilarityMatcher.from_feature_matrix(CaseFeatureMatrix.from_features(features))
+
+    rng = random.Random(cases)
+    queries = [
+        {
+            'facility_type': row['facility_type'],
+            'regional_multiplier': row['regional_multiplier'],
+            'code_premium': row['code_premium'],
+            'building_area': row['building_area'] * rng.uniform(0.7, 1.3),
+            'duration': row['duration'],
+            'renovation_level': row['renovation_level'],
+            'complexity_score': row['complexity_score']
+        }
+        for row in rng.sample(features, min(256, cases))
+    ]
+    # Keep each timed loop around 2M case scores regardless of the store size
+    number = max(10, 2_000_000 // max(cases, 1))
+    for k in (3, 10):
+        pending = itertools.cycle(queries)
+        results[f'top_k (k={k})'] = time_per_call(lambda: matcher.top_k(next(pending), k=k), number, repeat)
+    return results
+
+def run_suite(
+    scales: List[int] = SUITE_SCALES,
+    registry_entries: int = SUITE_REGISTRY_ENTRIES,
+    repeat: int = 5,
+    workdir: Optional[str] = None,
+    case_scales: List[int] = SUITE_CASE_SCALES
+) -> Dict[str, Any]:
+    """
+    Run the scaling suite on synthetic matrices, registries and case stores
+
+    Args:
+        scales: Region counts to generate matrices for
+        registry_entries: Synthetic registry entries (0 skips the router cases)
+        repeat: Timed iterations per case
+        workdir: Directory for the synthetic files (temporary if None)
+        case_scales: Synthetic case store sizes for the case matching cases
+
+    Returns:
+        Dictionary with metadata and results; results map "<group>/<scale>/<case>"
+        to timing stats (keys ending in _ms or _us)
+    """
+    own_workdir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="estimation-suite-")
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        for regions in scales:
+            matrix_file = write_synthetic_matrix(workdir, regions)
+            for case, stats in benchmark_geotech_scale(matrix_file, regions, repeat).items():
+                results[f"geotech/{regions}/{case}"] = stats
+        if registry_entries:
+            registry_file = write_synthetic_registry(workdir, registry_entries)
+            for case, stats in benchmark_router_scale(registry_file, registry_entries, repeat).items():
+                results[f"router/{registry_entries}/{case}"] = stats
+        for cases in case_scales:
+            for case, stats in benchmark_case_matching_scale(cases, repeat).items():
+                results[f"case_matching/{cases}/{case}"] = stats
+    finally:
+        if own_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'metadata': {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'scales': list(scales),
+            'registry_entries': registry_entries,
+            'case_scales': list(case_scales),
+            'repeat': repeat
+        },
+        'results': results
+    }
+
+# ============================================================================
+# REGRESSION THRESHOLDS
+# ============================================================================
+
+def _median(stats: Dict[str, float]) -> float:
+    return stats.get('median_ms', stats.get('median_us'))
+
+def check_thresholds(
+    results: Dict[str, Dict[str, float]],
+    thresholds: Optional[Dict[str, Any]] = None,
+    baseline: Optional[Dict[str, Dict[str, float]]] = None,
+    tolerance: Optional[float] = None
+) -> List[str]:
+    """
+    Compare suite results against absolute limits and a baseline run
+
+    Threshold files look like:
+
+        {"tolerance": 0.25,
+         "cases": {"geotech/*/assess": {"max_median_us": 15},
+                   "geotech/2000/yaml_load": {"tolerance": 0.5}}}
+
+    Case keys are fnmatch patterns; every matching entry applies. A
+    "max_<stat>" limit caps that stat of the result; "tolerance" is the
+    allowed relative slowdown of the median vs. the baseline.
+
+    Args:
+        results: Suite results keyed by case name
+        thresholds: Parsed thresholds file (None for no absolute limits)
+        baseline: Results of an earlier run (None for no regression check)
+        tolerance: Overrides the file's default tolerance
+
+    Returns:
+        Human-readable failures (empty if everything passed)
+    """
+    thresholds = thresholds or {}
+    default_tolerance = tolerance if tolerance is not None else thresholds.get('tolerance', DEFAULT_TOLERANCE)
+    failures = []
+    for case, stats in results.items():
+        case_tolerance = default_tolerance
+        for pattern, limits in thresholds.get('cases', {}).items():
+            if not fnmatch.fnmatchcase(case, pattern):
+                continue
+            for key, limit in limits.items():
+                if key == 'tolerance':
+                    if tolerance is None:
+                        case_tolerance = limit
+                elif key.startswith('max_') and key[4:] in stats and stats[key[4:]] > limit:
+                    failures.append(f"{case}: {key[4:]} {stats[key[4:]]:.3f} > limit {limit}")
+
+        previous = (baseline or {}).get(case)
+        if previous is not None and _median(previous) and _median(stats) is not None:
+            ratio = _median(stats) / _median(previous)
+            if ratio > 1.0 + case_tolerance:
+                failures.append(
+                    f"{case}: median {_median(stats):.3f} is {ratio:.2f}x baseline "
+                    f"{_median(previous):.3f} (tolerance {case_tolerance:.0%})"
+                )
+    return failures
+
+def print_suite_results(results: Dict[str, Dict[str, float]]) -> None:
+    """Print suite results as one table per unit"""
+    for unit, title in (("ms", "SCALING SUITE: LOADS AND BATCHES"), ("us", "SCALING SUITE: HOT PATHS (per call)")):
+        rows = {case: stats for case, stats in results.items() if 'median_' + unit in stats}
+        if rows:
+            print_results(title, rows, unit=unit)
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Estimation tool benchmarks")
+    parser.add_argument('benchmark', choices=['startup', 'router', 'memory', 'suite'])
+    parser.add_argument('--matrix', default=DEFAULT_MATRIX_FILE, help="Geotechnical matrix YAML")
+    parser.add_argument('--registry', default=DEFAULT_REGISTRY_FILE, help="Knowledge prompt registry YAML")
+    parser.add_argument('--repeat', type=int, default=None, help="Timed iterations per case (default 20, suite 5)")
+    parser.add_argument('--results', type=int, default=1_000_000, help="memory: results kept alive per case")
+    parser.add_argument('--scales', type=int, nargs='+', default=list(SUITE_SCALES), help="suite: synthetic region counts")
+    parser.add_argument('--entries', type=int, default=SUITE_REGISTRY_ENTRIES, help="suite: synthetic registry entries (0 to skip)")
+    parser.add_argument('--cases', type=int, nargs='*', default=list(SUITE_CASE_SCALES), help="suite: synthetic case store sizes")
+    parser.add_argument('--workdir', default=None, help="suite: keep the synthetic files in this directory")
+    parser.add_argument('--output', default=None, help="suite: write results JSON here")
+    parser.add_argument('--thresholds', default=DEFAULT_THRESHOLDS_FILE, help="suite: absolute limits / tolerances JSON")
+    parser.add_argument('--baseline', default=None, help="suite: earlier results JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=None, help="suite: allowed relative slowdown vs. baseline")
+    args = parser.parse_args(argv)
+
+    if args.benchmark == 'startup':
+        print_results("MATRIX STARTUP: YAML vs BINARY SNAPSHOT", benchmark_startup(args.matrix, args.repeat or 20))
+    elif args.benchmark == 'router':
+        print_results("ROUTER HOT PATH (per call)", benchmark_router(args.registry), unit="us")
+    elif args.benchmark == 'memory':
+        print_memory_results("ASSESSMENT RESULT FOOTPRINT", benchmark_result_memory(args.matrix, args.results))
+    elif args.benchmark == 'suite':
+        suite = run_suite(
+            args.scales, args.entries, repeat=args.repeat or 5, workdir=args.workdir, case_scales=args.cases
+        )
+        print_suite_results(suite['results'])
+
+        thresholds, baseline = None, None
+        if args.thresholds and os.path.exists(args.thresholds):
+            with open(args.thresholds, 'r', encoding='utf-8') as f:
+                thresholds = json.load(f)
+        if args.baseline:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)['results']
+        failures = check_thresholds(suite['results'], thresholds, baseline, args.tolerance)
+        suite['failures'] = failures
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(suite, f, indent=2)
+            print(f"Results written to {args.output}")
+        for failure in failures:
+            print(f"REGRESSION: {failure}")
+        return 1 if failures else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
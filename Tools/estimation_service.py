@@ -0,0 +1,714 @@
+#!/usr/bin/env python3
+"""
+ESTIMATION SERVICE v1.0
+
+Purpose: Long-running daemon serving the Python estimation engines over a local socket
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+Keeps GeotechnicalAssessment and KnowledgePromptsRouter warm in one process
+so callers (the Next.js chat route, scripts, batch jobs) pay neither
+interpreter startup nor YAML parsing per request. Both engines still pick up
+matrix / registry edits through the shared matrix cache.
+
+Protocol: newline-delimited JSON over a Unix socket (default) or localhost TCP.
+
+    -> {"id": 1, "method": "assess", "params": {"region": "CA_Inland", "stage": "BIDDING"}}
+    <- {"id": 1, "result": {...}}            or  {"id": 1, "error": "..."}
+
+Requests may be pipelined on one connection; responses carry the request id
+and can arrive out of order. Methods: ping, stats, metrics, assess, assess_batch,
+estimate_cost_impact, compare_regions, sensitivity, get_knowledge_prompt,
+get_renovation_factor, search_knowledge, build_context.
+
+"search_knowledge" ({"query": "...", "top_k": 5, "path_prefix": "..."})
+returns BM25-ranked Knowledge Prompts sections; the on-disk index is brought
+up to date (changed files only) before a query at most every
+SEARCH_CHECK_INTERVAL seconds, so searches do not stall the event loop. "build_context"
+({"profile": {...}, "token_budget": 8000, "query": "..."}) returns the most
+relevant prompt sections packed into the token budget.
+
+"metrics" returns the instrumentation snapshot exported as JSON (default) or
+Prometheus text ({"format": "prometheus"}); start the server with --metrics
+(or ESTIMAIT_INSTRUMENTATION=1) to record hot-path timings.
+
+Concurrent assess requests (detail=false, the default) are coalesced: every
+request that arrives in the same event loop turn (or within batch_window
+seconds) is answered by one assess_batch call. The number of requests in
+flight is bounded by max_inflight; once reached, connections stop being read
+until earlier requests complete.
+
+Usage:
+    python estimation_service.py serve                              # Unix socket
+    python estimation_service.py serve --host 127.0.0.1 --port 8765 # TCP
+    python estimation_service.py serve --metrics                    # with timings
+    python estimation_service.py bench --clients 32 --requests 2000
+
+    from estimation_service import EstimationClient
+
+    with EstimationClient() as client:
+        print(client.call("assess", region="CA_Inland", building_type="warehouse"))
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import statistics
+import sys
+import threading
+import time
+from dataclasses import asdict
+from enum import Enum
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from canonical_keys import STAGES
+from context_builder import DEFAULT_CONTEXT_BUDGET
+from geotechnical_cost_assessment import GeotechnicalAssessment, GeotechnicalCostResult
+from geotechnical_sensitivity import GeotechnicalSensitivity
+from knowledge_search import KnowledgeSearchIndex
+from repo_paths import DEFAULT_MATRIX_FILE, load_router_module
+from instrumentation import INSTRUMENTATION
+
+try:
+    import numpy as np
+except ImportError:  # without numpy, assess requests are answered one by one
+    np = None
+
+DEFAULT_SOCKET_PATH = "/tmp/estimait-estimation.sock"
+DEFAULT_MAX_INFLIGHT = 1024
+DEFAULT_MAX_BATCH = 512
+STREAM_LIMIT = 16 * 1024 * 1024  # longest accepted request line (assess_batch payloads)
+# Seconds between knowledge search index freshness checks (see _search_knowledge)
+SEARCH_CHECK_INTERVAL = 5.0
+
+# ============================================================================
+# SERIALIZATION
+# ============================================================================
+
+def _to_json(value: Any) -> Any:
+    """json.dumps fallback for router mappings, enums and NumPy values"""
+    if isinstance(value, MappingProxyType):
+        return dict(value)
+    if isinstance(value, Enum):
+        return value.value
+    if np is not None:
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        if isinstance(value, np.generic):
+            return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return (json.dumps(message, default=_to_json, ensure_ascii=False) + "\n").encode('utf-8')
+
+def _summary(result: GeotechnicalCostResult, hard_cost: Optional[float]) -> Dict[str, Any]:
+    """Flat assess response (the fields assess_batch also produces)"""
+    return {
+        'region': result.region,
+        'building_type': result.building_type,
+        'stage': result.stage,
+        'base_adjustment': result.base_adjustment,
+        'risk_premium': result.risk_premium,
+        'total_adjustment': result.total_adjustment,
+        'building_type_multiplier': result.building_type_multiplier,
+        'final_adjustment': result.final_adjustment,
+        'cost_impact': hard_cost * result.final_adjustment if hard_cost else None,
+        'confidence': result.confidence,
+        'notes': result.notes
+    }
+
+class MissingParameter(KeyError):
+    """A required request parameter is absent"""
+
+class _Params(dict):
+    """Request parameters: indexing a missing key raises MissingParameter"""
+
+    def __missing__(self, key: str) -> Any:
+        raise MissingParameter(key)
+
+# ============================================================================
+# ASSESS MICRO-BATCHING
+# ============================================================================
+
+class _AssessBatcher:
+    """Coalesce concurrent assess requests into assess_batch calls"""
+
+    def __init__(self, assessment: GeotechnicalAssessment, max_batch: int, batch_window: float):
+        self.assessment = assessment
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._flush_scheduled = False
+        self.batches = 0
+        self.batched_requests = 0
+        self.largest_batch = 0
+
+    def submit(self, params: Dict[str, Any]) -> asyncio.Future:
+        """Queue one assess request; the future resolves to its summary dict"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((params, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            # call_soon runs after the readers already woken this turn have queued their requests
+            if self.batch_window > 0:
+                loop.call_later(self.batch_window, self._flush)
+            else:
+                loop.call_soon(self._flush)
+        return future
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.batched_requests += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+
+        for (params, future), outcome in zip(batch, self._evaluate([params for params, _ in batch])):
+            if future.done():
+                continue
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    def _evaluate(self, requests: List[Dict[str, Any]]) -> List[Any]:
+        """Assess a batch in one vectorized call, isolating failures per request"""
+        if np is None or len(requests) == 1:
+            return [self._assess_one(params) for params in requests]
+        try:
+            regions = [p['region'] for p in requests]
+            building_types = [p.get('building_type', 'commercial_office') for p in requests]
+            stages = [p.get('stage', 'BIDDING') for p in requests]
+            hard_costs = [p.get('hard_cost') or np.nan for p in requests]
+            columns = self.assessment.assess_batch(regions, building_types, stages, hard_costs)
+        except Exception:
+            # At least one bad request: answer each on its own so only it fails
+            return [self._assess_one(params) for params in requests]
+
+        # Report the canonical spelling of each key, as assess() does
+        regions = [self.assessment.region_keys.canonical(r) for r in regions]
+        building_types = [self.assessment.building_type_keys.canonical(bt) for bt in building_types]
+        stages = [STAGES.canonical(stage) for stage in stages]
+
+        regions_data = self.assessment.regions
+        rows = {name: values.tolist() for name, values in columns.items()}
+        results = []
+        for i, region in enumerate(regions):
+            summary = regions_data[region]['summary']
+            cost_impact = rows['cost_impact'][i]
+            results.append({
+                'region': region,
+                'building_type': building_types[i],
+                'stage': stages[i],
+                'base_adjustment': rows['base_adjustment'][i],
+                'risk_premium': rows['risk_premium'][i],
+                'total_adjustment': rows['total_adjustment'][i],
+                'building_type_multiplier': rows['building_type_multiplier'][i],
+                'final_adjustment': rows['final_adjustment'][i],
+                'cost_impact': None if cost_impact != cost_impact else cost_impact,
+                'confidence': summary['confidence'],
+                'notes': summary['notes']
+            })
+        return results
+
+    def _assess_one(self, params: Dict[str, Any]) -> Any:
+        try:
+            result = self.assessment.assess(
+                params['region'],
+                params.get('building_type', 'commercial_office'),
+                params.get('stage', 'BIDDING')
+            )
+            return _summary(result, params.get('hard_cost'))
+        except MissingParameter as e:
+            return ValueError(f"Missing parameter: {e.args[0]}")
+        except (TypeError, ValueError) as e:
+            return ValueError(str(e))
+        except Exception as e:
+            return e
+
+# ============================================================================
+# SERVICE
+# ============================================================================
+
+class EstimationService:
+    """
+    Warm estimation engines behind an asyncio NDJSON socket server
+    """
+
+    def __init__(
+        self,
+        matrix_file: str = DEFAULT_MATRIX_FILE,
+        registry_file: Optional[str] = None,
+        max_inflight: int = DEFAULT_MAX_INFLIGHT,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        batch_window: float = 0.0
+    ):
+        """
+        Load the engines
+
+        Args:
+            matrix_file: Geotechnical cost driver matrix YAML
+            registry_file: Knowledge prompt registry YAML (default: latest in Config/)
+            max_inflight: Requests processed concurrently across all connections
+            max_batch: Largest number of assess requests evaluated in one batch
+            batch_window: Seconds to wait for more assess requests before a batch
+                is evaluated (0 = batch only what arrives in the same loop turn)
+        """
+        self.assessment = GeotechnicalAssessment(matrix_file)
+        self.router = load_router_module().KnowledgePromptsRouter(registry_file)
+        self.sensitivity = GeotechnicalSensitivity(self.assessment)
+        self.search_index = KnowledgeSearchIndex()
+        self.max_inflight = max_inflight
+        self._batcher = _AssessBatcher(self.assessment, max_batch, batch_window)
+        self._inflight: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._started = time.time()
+        self._requests = 0
+        self._errors = 0
+        self._connections = 0
+        self._methods: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            'ping': lambda params: {'pong': True},
+            'stats': lambda params: self.stats(),
+            'metrics': lambda params: INSTRUMENTATION.export(params.get('format', 'json')),
+            'assess_batch': self._assess_batch,
+            'estimate_cost_impact': self._estimate_cost_impact,
+            'compare_regions': self._compare_regions,
+            'sensitivity': self._sensitivity,
+            'get_knowledge_prompt': self._get_knowledge_prompt,
+            'get_renovation_factor': lambda params: self.router.get_renovation_factor(params),
+            'search_knowledge': self._search_knowledge,
+            'build_context': lambda params: self.router.build_context(
+                params.get('profile'), params.get('token_budget', DEFAULT_CONTEXT_BUDGET), params.get('query')
+            )
+        }
+
+    # ------------------------------------------------------------------------
+    # Methods
+    # ------------------------------------------------------------------------
+
+    def _assess_detail(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        result = self.assessment.assess(
+            params['region'],
+            params.get('building_type', 'commercial_office'),
+            params.get('stage', 'BIDDING')
+        )
+        response = _summary(result, params.get('hard_cost'))
+        response['breakdown'] = result.breakdown
+        response['recommendations'] = result.recommendations
+        return response
+
+    def _assess_batch(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self.assessment.assess_batch(
+            params['regions'],
+            params.get('building_types', 'commercial_office'),
+            params.get('stages', 'BIDDING'),
+            params.get('hard_costs')
+        )
+
+    def _estimate_cost_impact(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self.assessment.estimate_cost_impact(
+            params['region'],
+            params.get('building_type', 'commercial_office'),
+            params['hard_cost'],
+            params.get('stage', 'BIDDING')
+        )
+
+    def _compare_regions(self, params: Dict[str, Any]) -> List[Dict]:
+        return self.assessment.compare_regions(
+            params['regions'],
+            params.get('building_type', 'commercial_office'),
+            params.get('stage', 'BIDDING')
+        )
+
+    def _sensitivity(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self.sensitivity.analyze(
+            params['region'],
+            params.get('building_type', 'commercial_office'),
+            params.get('stage', 'BIDDING'),
+            params.get('hard_cost')
+        ).to_dict()
+
+    def _search_knowledge(self, params: Dict[str, Any]) -> List[Dict]:
+        self.search_index.update(max_age=SEARCH_CHECK_INTERVAL)
+        hits = self.search_index.search(
+            params['query'],
+            params.get('top_k', 5),
+            params.get('path_prefix'),
+            params.get('include_text', False)
+        )
+        return [asdict(hit) for hit in hits]
+
+    def _get_knowledge_prompt(self, params: Dict[str, Any]) -> Any:
+        kwargs = {key: value for key, value in params.items() if key != 'layer'}
+        return self.router.get_knowledge_prompt(params['layer'], **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get service counters
+
+        Returns:
+            Dictionary with uptime, request / error / connection counts, batching
+            stats and the assessment engine's assess() cache counters
+        """
+        batcher = self._batcher
+        return {
+            'uptime_s': time.time() - self._started,
+            'requests': self._requests,
+            'errors': self._errors,
+            'connections': self._connections,
+            'max_inflight': self.max_inflight,
+            'assess_batches': batcher.batches,
+            'assess_batched_requests': batcher.batched_requests,
+            'assess_largest_batch': batcher.largest_batch,
+            'assess_cache': self.assessment.cache_stats()
+        }
+
+    # ------------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------------
+
+    async def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute one decoded request
+
+        Args:
+            request: {"id": ..., "method": ..., "params": {...}}
+
+        Returns:
+            Response with the same id and either "result" or "error"
+        """
+        request_id = request.get('id')
+        method = request.get('method')
+        params = request.get('params') or {}
+        self._requests += 1
+        try:
+            if not isinstance(params, dict):
+                raise ValueError("params must be an object")
+            params = _Params(params)
+            if method == 'assess':
+                if params.get('detail'):
+                    result = self._assess_detail(params)
+                else:
+                    result = await self._batcher.submit(params)
+            elif method in self._methods:
+                result = self._methods[method](params)
+            else:
+                raise ValueError(f"Unknown method '{method}'. Available: {['assess'] + sorted(self._methods)}")
+        except MissingParameter as e:
+            self._errors += 1
+            return {'id': request_id, 'error': f"Missing parameter: {e.args[0]}"}
+        except (TypeError, ValueError) as e:
+            self._errors += 1
+            return {'id': request_id, 'error': str(e)}
+        except Exception as e:
+            # Anything else is still answered: an unanswered id leaves the client waiting
+            self._errors += 1
+            return {'id': request_id, 'error': f"{type(e).__name__}: {e}"}
+        return {'id': request_id, 'result': result}
+
+    async def _serve_line(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as e:
+                self._errors += 1
+                response = {'id': None, 'error': f"Invalid request: {e}"}
+            else:
+                response = await self.handle(request)
+            if not writer.is_closing():
+                writer.write(_encode(response))
+        finally:
+            self._inflight.release()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections += 1
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    break  # oversized line or reset connection
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                await self._inflight.acquire()
+                task = asyncio.ensure_future(self._serve_line(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                if writer.transport.get_write_buffer_size() > STREAM_LIMIT:
+                    await writer.drain()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._connections -= 1
+            writer.close()
+
+    async def start(
+        self,
+        socket_path: Optional[str] = DEFAULT_SOCKET_PATH,
+        host: Optional[str] = None,
+        port: Optional[int] = None
+    ) -> asyncio.AbstractServer:
+        """
+        Start listening (Unix socket unless host/port are given)
+
+        Args:
+            socket_path: Unix socket path
+            host: TCP host (use 127.0.0.1; the service has no authentication)
+            port: TCP port
+
+        Returns:
+            The asyncio server
+        """
+        self._inflight = asyncio.Semaphore(self.max_inflight)
+        if host is not None or port is not None:
+            self._server = await asyncio.start_server(
+                self._handle_connection, host or '127.0.0.1', port or 0, limit=STREAM_LIMIT)
+        else:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)  # stale socket from a previous run
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, socket_path, limit=STREAM_LIMIT)
+            os.chmod(socket_path, 0o660)
+        return self._server
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Stop accepting connections and wait for open ones to finish"""
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        deadline = time.monotonic() + timeout
+        while self._connections and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+
+    async def serve_forever(self, **listen: Any) -> None:
+        """Start listening and serve until SIGINT / SIGTERM"""
+        server = await self.start(**listen)
+        stop = asyncio.get_running_loop().create_future()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                asyncio.get_running_loop().add_signal_handler(sig, lambda: stop.done() or stop.set_result(None))
+            except (NotImplementedError, RuntimeError):
+                pass
+        address = server.sockets[0].getsockname() if server.sockets else listen
+        print(f"Estimation service listening on {address}")
+        async with server:
+            await stop
+        if listen.get('socket_path') and os.path.exists(listen['socket_path']):
+            os.unlink(listen['socket_path'])
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+
+class EstimationServiceError(RuntimeError):
+    """Error response from the estimation service"""
+
+class EstimationClient:
+    """
+    Blocking client for the estimation service (one request at a time)
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = DEFAULT_SOCKET_PATH,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        timeout: Optional[float] = 30.0
+    ):
+        """
+        Connect to a running service
+
+        Args:
+            socket_path: Unix socket path
+            host: TCP host (overrides socket_path)
+            port: TCP port
+            timeout: Socket timeout in seconds
+        """
+        if host is not None or port is not None:
+            self._sock = socket.create_connection((host or '127.0.0.1', port), timeout=timeout)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(timeout)
+            self._sock.connect(socket_path)
+        self._reader = self._sock.makefile('rb')
+        self._next_id = 0
+
+    def call(self, method: str, **params: Any) -> Any:
+        """
+        Call a service method
+
+        Args:
+            method: Method name (assess, get_knowledge_prompt, ...)
+            **params: Method parameters
+
+        Returns:
+            The method result
+
+        Raises:
+            EstimationServiceError: If the service answered with an error
+        """
+        self._next_id += 1
+        self._sock.sendall(_encode({'id': self._next_id, 'method': method, 'params': params}))
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Estimation service closed the connection")
+        response = json.loads(line)
+        if 'error' in response:
+            raise EstimationServiceError(response['error'])
+        return response['result']
+
+    def close(self) -> None:
+        self._reader.close()
+        self._sock.close()
+
+    def __enter__(self) -> "EstimationClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+# ============================================================================
+# LOAD TEST
+# ============================================================================
+
+async def _bench_client(listen: Dict[str, Any], requests: int, latencies: List[float]) -> None:
+    """One closed-loop client issuing assess requests back to back"""
+    if listen.get('socket_path'):
+        reader, writer = await asyncio.open_unix_connection(listen['socket_path'])
+    else:
+        reader, writer = await asyncio.open_connection(listen['host'], listen['port'])
+    regions = ['CA_Inland', 'CA_Coastal', 'TX_Coastal', 'NY_Urban']
+    for i in range(requests):
+        payload = _encode({'id': i, 'method': 'assess', 'params': {
+            'region': regions[i % len(regions)], 'building_type': 'warehouse', 'hard_cost': 1e7}})
+        start = time.perf_counter()
+        writer.write(payload)
+        response = json.loads(await reader.readline())
+        latencies.append((time.perf_counter() - start) * 1e3)
+        if 'error' in response:
+            raise EstimationServiceError(response['error'])
+    writer.close()
+
+def run_benchmark(clients: int, requests: int, listen: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+    """
+    Measure assess latency under concurrent closed-loop clients
+
+    Starts an in-process service on a private socket (in a background thread)
+    unless listen points at a running one.
+
+    Args:
+        clients: Concurrent connections
+        requests: Requests per connection
+        listen: {"socket_path": ...} or {"host": ..., "port": ...} of a running service
+
+    Returns:
+        Dictionary with throughput and p50 / p90 / p99 latency in milliseconds
+    """
+    server_loop = None
+    if listen is None:
+        listen = {'socket_path': f"/tmp/estimait-bench-{os.getpid()}.sock"}
+        service = EstimationService()
+        server_loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run_server():
+            asyncio.set_event_loop(server_loop)
+            server_loop.run_until_complete(service.start(**listen))
+            ready.set()
+            server_loop.run_forever()
+
+        server_thread = threading.Thread(target=run_server, daemon=True)
+        server_thread.start()
+        ready.wait()
+
+    latencies: List[float] = []
+
+    async def run_clients():
+        await asyncio.gather(*(_bench_client(listen, requests, latencies) for _ in range(clients)))
+
+    start = time.perf_counter()
+    asyncio.run(run_clients())
+    elapsed = time.perf_counter() - start
+
+    if server_loop is not None:
+        asyncio.run_coroutine_threadsafe(service.stop(), server_loop).result()
+        server_loop.call_soon_threadsafe(server_loop.stop)
+        server_thread.join()
+        server_loop.close()
+        if os.path.exists(listen['socket_path']):
+            os.unlink(listen['socket_path'])
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'throughput_rps': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies),
+        'p90_ms': latencies[int(0.90 * (len(latencies) - 1))],
+        'p99_ms': latencies[int(0.99 * (len(latencies) - 1))]
+    }
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Estimation engines over a local socket")
+    parser.add_argument('command', choices=['serve', 'bench'])
+    parser.add_argument('--socket', default=None, help=f"Unix socket path (default {DEFAULT_SOCKET_PATH})")
+    parser.add_argument('--host', default=None, help="Listen / connect on TCP instead (e.g. 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=None, help="TCP port")
+    parser.add_argument('--matrix', default=DEFAULT_MATRIX_FILE, help="Geotechnical matrix YAML")
+    parser.add_argument('--registry', default=None, help="Knowledge prompt registry YAML (default: latest in Config/)")
+    parser.add_argument('--max-inflight', type=int, default=DEFAULT_MAX_INFLIGHT)
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument('--batch-window-ms', type=float, default=0.0)
+    parser.add_argument('--metrics', action='store_true', help="serve: record hot-path instrumentation")
+    parser.add_argument('--clients', type=int, default=32, help="bench: concurrent connections")
+    parser.add_argument('--requests', type=int, default=1000, help="bench: requests per connection")
+    args = parser.parse_args(argv)
+
+    if args.host is not None or args.port is not None:
+        listen = {'host': args.host or '127.0.0.1', 'port': args.port}
+    else:
+        listen = {'socket_path': args.socket or DEFAULT_SOCKET_PATH}
+
+    if args.command == 'serve':
+        if args.metrics:
+            INSTRUMENTATION.enable()
+        service = EstimationService(
+            matrix_file=args.matrix,
+            registry_file=args.registry,
+            max_inflight=args.max_inflight,
+            max_batch=args.max_batch,
+            batch_window=args.batch_window_ms / 1000.0
+        )
+        asyncio.run(service.serve_forever(**listen))
+    else:
+        external = listen if (args.socket or args.host or args.port) else None
+        results = run_benchmark(args.clients, args.requests, external)
+        print(f"{results['requests']:,} assess requests, {args.clients} clients: "
+              f"{results['throughput_rps']:,.0f} req/s, p50 {results['p50_ms']:.3f} ms, "
+              f"p90 {results['p90_ms']:.3f} ms, p99 {results['p99_ms']:.3f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,31 +18,93 @@ Usage:
     print(result)
 """
 
-import yaml
 import json
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
-from enum import Enum
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Tuple, Optional, Any, Sequence, Union
+
+# Stage / BuildingType / STAGE_RECOMMENDATION_KEYS are re-exported for existing imports
+from batch_columns import batch_length, encode_column, require_numpy
+from canonical_keys import (
+    BuildingType, KeyAliases, RECOMMENDATION_KEYS, STAGES, STAGE_RECOMMENDATION_KEYS, Stage
+)
+from instrumentation import INSTRUMENTATION
+from matrix_cache import SharedMatrixCache, get_shared_cache
+from matrix_snapshot import load_matrix
+from region_locator import RegionLocator
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only required for the batch API
+    np = None
+
+# Default number of (region, building_type, stage) results memoized per engine
+DEFAULT_MEMO_SIZE = 1024
+
+# Calibration overlays (region_calibration.py) sit next to their matrix file
+CALIBRATION_OVERLAY_SUFFIX = ".calibration.json"
 
 # ============================================================================
 # DATA STRUCTURES
 # ============================================================================
 
-class Stage(Enum):
-    """Project stage affecting geotechnical cost estimation"""
-    BIDDING = "BIDDING"
-    POST_AWARD = "POST_AWARD"
-    FINAL = "FINAL"
-
-class BuildingType(Enum):
-    """Building types with different geotechnical sensitivities"""
-    WAREHOUSE = "warehouse"
-    COMMERCIAL_OFFICE = "commercial_office"
-    HEALTHCARE = "healthcare"
-
-@dataclass
-class GeotechnicalCostResult:
-    """Result of geotechnical cost assessment"""
+class GeotechnicalFactors(NamedTuple):
+    """Numbers-only assessment result (see GeotechnicalAssessment.factors)"""
+    base_adjustment: float
+    risk_premium: float
+    total_adjustment: float
+    building_type_multiplier: float
+    final_adjustment: float
+    cost_impact: Optional[float] = None
+
+class _RegionProfile:
+    """Narrative fields of a region, shared by every result for that region"""
+    __slots__ = ('region', 'region_data', 'confidence', 'notes', '_breakdown')
+
+    def __init__(self, region: str, region_data: Dict):
+        summary = region_data.get('summary', {})
+        self.region = region
+        self.region_data = region_data
+        self.confidence = summary.get('confidence')
+        self.notes = summary.get('notes')
+        self._breakdown = None
+
+    def __repr__(self) -> str:
+        return f"<region profile {self.region}>"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, _RegionProfile) and other.region == self.region
+
+    def __hash__(self) -> int:
+        return hash(self.region)
+
+    @property
+    def breakdown(self) -> Mapping:
+        """Read-only driver breakdown, built on first access"""
+        if self._breakdown is None:
+            start = time.perf_counter() if INSTRUMENTATION.enabled else None
+            self._breakdown = _build_breakdown(self.region_data)
+            if start is not None:
+                INSTRUMENTATION.observe("geotech_stage_seconds", time.perf_counter() - start, stage="breakdown")
+        return self._breakdown
+
+class GeotechnicalCostResult(NamedTuple):
+    """
+    Result of geotechnical cost assessment
+    
+    Immutable and compact (a named tuple). confidence, notes and breakdown come
+    from a per-region profile shared by all results for the region; the driver
+    breakdown is only built when first accessed. recommendations and
+    breakdown are shared with the matrix / other results: treat as read-only.
+    
+    Not a dataclass: use to_dict() instead of dataclasses.asdict(). Tuple
+    unpacking and _asdict() follow the named tuple fields below, which differ
+    from the dataclass fields results had before.
+    """
     region: str
     building_type: str
     stage: str
@@ -51,10 +113,50 @@ class GeotechnicalCostResult:
     total_adjustment: float
     building_type_multiplier: float
     final_adjustment: float
-    confidence: str
-    breakdown: Dict
     recommendations: Dict
-    notes: str
+    cost_impact: Optional[float]
+    region_profile: _RegionProfile
+
+    @property
+    def confidence(self) -> str:
+        return self.region_profile.confidence
+
+    @property
+    def notes(self) -> str:
+        return self.region_profile.notes
+
+    @property
+    def breakdown(self) -> Mapping:
+        return self.region_profile.breakdown
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Plain-dict copy with the fields of the former dataclass result
+        
+        Returns:
+            Dictionary like dataclasses.asdict() returned: region through
+            final_adjustment, confidence, breakdown, recommendations and notes
+            (nested mappings copied into new dicts)
+        """
+        return {
+            'region': self.region,
+            'building_type': self.building_type,
+            'stage': self.stage,
+            'base_adjustment': self.base_adjustment,
+            'risk_premium': self.risk_premium,
+            'total_adjustment': self.total_adjustment,
+            'building_type_multiplier': self.building_type_multiplier,
+            'final_adjustment': self.final_adjustment,
+            'confidence': self.confidence,
+            'breakdown': _copy_mapping(self.breakdown),
+            'recommendations': _copy_mapping(self.recommendations),
+            'notes': self.notes
+        }
+
+    def with_cost_impact(self, cost_impact: Optional[float]) -> "GeotechnicalCostResult":
+        """Copy of this result carrying a different dollar impact"""
+        # Cheaper than _replace(); cost_impact is the second-to-last field
+        return tuple.__new__(GeotechnicalCostResult, self[:-2] + (cost_impact, self[-1]))
 
 # ============================================================================
 # GEOTECHNICAL ASSESSMENT ENGINE
@@ -65,26 +167,95 @@ class GeotechnicalAssessment:
     Main assessment engine for geotechnical cost impacts
     """
     
-    def __init__(self, matrix_file: str = "/home/ubuntu/GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml"):
+    def __init__(
+        self,
+        matrix_file: str = "/home/ubuntu/GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml",
+        cache: Optional[SharedMatrixCache] = None,
+        auto_reload: bool = True,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+        calibration_file: Optional[str] = None,
+        overlay: Optional[Any] = None
+    ):
         """
         Initialize assessment engine with matrix data
         
         Args:
             matrix_file: Path to YAML matrix file
+            cache: Matrix cache (defaults to the process-wide shared cache)
+            auto_reload: Pick up matrix file changes on the next call
+            memo_size: Most recently used assess() results kept per matrix (0 disables)
+            calibration_file: Calibration overlay JSON read by get_historical_data()
+                (default: <matrix_file>.calibration.json, ignored if missing)
+            overlay: Copy-on-write overrides applied to the shared matrix
+                (a matrix_overlays.MatrixOverlay, e.g. one GC's risk premiums)
         """
         self.matrix_file = matrix_file
-        self.matrix = self._load_matrix()
-        self.regions = self.matrix.get('regions', {})
-        self.building_type_adjustments = self.matrix.get('building_type_adjustments', {})
+        self.overlay = overlay
+        self.calibration_file = calibration_file or calibration_overlay_path(matrix_file)
+        self.auto_reload = auto_reload
+        self._cache = cache or get_shared_cache()
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[tuple, GeotechnicalCostResult]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self._memo_hits = 0
+        self._memo_misses = 0
+        self._memo_evictions = 0
+        self._memo_invalidations = 0
+        self._bind(self._load_matrix())
     
     def _load_matrix(self) -> Dict:
-        """Load geotechnical matrix from YAML file"""
+        """Load geotechnical matrix from YAML file (via its binary snapshot when fresh)"""
+        start = time.perf_counter() if INSTRUMENTATION.enabled else None
         try:
-            with open(self.matrix_file, 'r') as f:
-                return yaml.safe_load(f)
+            matrix = self._overlaid(self._cache.get(self.matrix_file, loader=load_matrix))
         except FileNotFoundError:
             print(f"Warning: Matrix file not found at {self.matrix_file}")
             return {}
+        if start is not None:
+            INSTRUMENTATION.observe("matrix_load_seconds", time.perf_counter() - start,
+                                    file=os.path.basename(self.matrix_file))
+        return matrix
+    
+    def _overlaid(self, matrix: Dict) -> Dict:
+        """Apply this engine's overlay, if any, to the shared matrix"""
+        return matrix if self.overlay is None else self.overlay.apply(matrix)
+    
+    def _bind(self, matrix: Dict) -> None:
+        """Point the engine at a (shared, read-only) matrix and drop derived state"""
+        self.matrix = matrix
+        self.regions = matrix.get('regions', {})
+        self.building_type_adjustments = matrix.get('building_type_adjustments', {})
+        # Region / building type spellings resolve to this matrix's own keys
+        self.region_keys = KeyAliases(self.regions.keys(), label="Region")
+        self.building_type_keys = KeyAliases(self.building_type_adjustments.keys(), label="Building type")
+        self._factors = None
+        self._profiles: Dict[str, _RegionProfile] = {}
+        self._lookup_tables = None
+        self._locator = None
+        with self._memo_lock:
+            if self._memo:
+                self._memo_invalidations += 1
+                self._memo.clear()
+    
+    def refresh(self) -> bool:
+        """
+        Re-bind to the current matrix if the file changed on disk
+        
+        Returns:
+            True if a newer matrix was picked up
+        """
+        start = time.perf_counter() if INSTRUMENTATION.enabled else None
+        try:
+            matrix = self._overlaid(self._cache.get(self.matrix_file, loader=load_matrix))
+        except FileNotFoundError:
+            return False
+        if matrix is self.matrix:
+            return False
+        if start is not None:
+            INSTRUMENTATION.observe("matrix_load_seconds", time.perf_counter() - start,
+                                    file=os.path.basename(self.matrix_file))
+        self._bind(matrix)
+        return True
     
     def assess(
         self,
@@ -97,90 +268,334 @@ class GeotechnicalAssessment:
         Assess geotechnical cost impact for a project
         
         Args:
-            region: Region ID (e.g., "CA_INLAND", "TX_COASTAL")
+            region: Region ID (e.g., "CA_Inland", "TX_Coastal"; any case)
             building_type: Building type (warehouse, commercial_office, healthcare)
             stage: Project stage (BIDDING, POST_AWARD, FINAL)
             hard_cost: Hard cost for calculating dollar impact (optional)
         
         Returns:
-            GeotechnicalCostResult with detailed breakdown
+            GeotechnicalCostResult with detailed breakdown (keys in canonical spelling)
         """
+        start = time.perf_counter() if INSTRUMENTATION.enabled else None
+        if self.auto_reload:
+            self.refresh()
+        if self.memo_size <= 0:
+            result = self._assess_uncached(region, building_type, stage)
+        else:
+            # The result minus cost_impact only depends on the key and the matrix
+            key = (region, building_type, stage)
+            matrix = self.matrix
+            with self._memo_lock:
+                result = self._memo.get(key)
+                if result is not None:
+                    self._memo.move_to_end(key)
+                    self._memo_hits += 1
+                else:
+                    self._memo_misses += 1
+            if result is None:
+                result = self._assess_uncached(region, building_type, stage)
+                self._remember(key, result, matrix)
+        
+        if hard_cost:
+            result = result.with_cost_impact(hard_cost * result.final_adjustment)
+        if start is not None:
+            INSTRUMENTATION.observe("geotech_stage_seconds", time.perf_counter() - start, stage="assess")
+        return result
+    
+    def _remember(self, key: tuple, result: GeotechnicalCostResult, matrix: Dict) -> None:
+        """Memoize a result unless the matrix was reloaded while computing it"""
+        with self._memo_lock:
+            if matrix is not self.matrix:
+                return
+            self._memo[key] = result
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+                self._memo_evictions += 1
+    
+    def _assess_uncached(self, region: Any, building_type: Any, stage: Any) -> GeotechnicalCostResult:
+        """Build the hard-cost-independent assessment of a key"""
+        start = time.perf_counter() if INSTRUMENTATION.enabled else None
+        region_id, building_type_id, stage_id, values = self._lookup(region, building_type, stage)
+        if start is not None:
+            validated = time.perf_counter()
+            INSTRUMENTATION.observe("geotech_stage_seconds", validated - start, stage="validate")
+        base_adjustment, risk_premium, total_adjustment, bt_multiplier, final_adjustment, recommendations = values
         
-        # Validate inputs
-        if region not in self.regions:
+        profile = self._profiles.get(region_id)
+        if profile is None:
+            profile = self._profiles[region_id] = _RegionProfile(region_id, self.regions[region_id])
+        
+        result = GeotechnicalCostResult(
+            region=region_id,
+            building_type=building_type_id,
+            stage=stage_id,
+            base_adjustment=base_adjustment,
+            risk_premium=risk_premium,
+            total_adjustment=total_adjustment,
+            building_type_multiplier=bt_multiplier,
+            final_adjustment=final_adjustment,
+            recommendations=recommendations,
+            cost_impact=None,
+            region_profile=profile
+        )
+        if start is not None:
+            INSTRUMENTATION.observe("geotech_stage_seconds", time.perf_counter() - validated, stage="build")
+        return result
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get assess() memoization counters
+        
+        Returns:
+            Dictionary with hits, misses, hit_ratio, evictions, invalidations
+            (matrix reloads that dropped memoized results), entries and max_entries
+        """
+        with self._memo_lock:
+            lookups = self._memo_hits + self._memo_misses
+            return {
+                'hits': self._memo_hits,
+                'misses': self._memo_misses,
+                'hit_ratio': self._memo_hits / lookups if lookups else 0.0,
+                'evictions': self._memo_evictions,
+                'invalidations': self._memo_invalidations,
+                'entries': len(self._memo),
+                'max_entries': self.memo_size
+            }
+    
+    def clear_cache(self) -> None:
+        """Drop all memoized assess() results"""
+        with self._memo_lock:
+            self._memo.clear()
+    
+    def factors(
+        self,
+        region: str,
+        building_type: str = "commercial_office",
+        stage: str = "BIDDING",
+        hard_cost: Optional[float] = None
+    ) -> GeotechnicalFactors:
+        """
+        Numbers-only fast path of assess()
+        
+        Skips the narrative fields (confidence, notes, breakdown,
+        recommendations) for callers that only need the adjustments.
+        
+        Args:
+            region: Region ID
+            building_type: Building type
+            stage: Project stage
+            hard_cost: Hard cost for calculating dollar impact (optional)
+        
+        Returns:
+            GeotechnicalFactors named tuple
+        """
+        start = time.perf_counter() if INSTRUMENTATION.enabled else None
+        if self.auto_reload:
+            self.refresh()
+        values = self._lookup(region, building_type, stage)[3]
+        factors = GeotechnicalFactors(
+            values[0], values[1], values[2], values[3], values[4],
+            hard_cost * values[4] if hard_cost else None
+        )
+        if start is not None:
+            INSTRUMENTATION.observe("geotech_stage_seconds", time.perf_counter() - start, stage="factors")
+        return factors
+    
+    def _lookup(self, region: Any, building_type: Any, stage: Any) -> Tuple[str, str, str, tuple]:
+        """Resolve a query to canonical keys and its precompiled adjustments"""
+        if self._factors is None:
+            self._factors = self._compile_factors()
+        
+        values = self._factors.get((region, building_type, stage))
+        if values is not None:
+            return region, building_type, stage, values
+        
+        region_id = self.region_keys.canonical(region)
+        if region_id is None:
+            _count_failure("region", region)
             raise ValueError(f"Region '{region}' not found in matrix. Available: {list(self.regions.keys())}")
         
-        if building_type not in self.building_type_adjustments:
+        building_type_id = self.building_type_keys.canonical(building_type)
+        if building_type_id is None:
+            _count_failure("building_type", building_type)
             raise ValueError(f"Building type '{building_type}' not found. Available: {list(self.building_type_adjustments.keys())}")
         
-        # Get region data
-        region_data = self.regions[region]
+        stage_id = STAGES.canonical(stage)
+        values = self._factors.get((region_id, building_type_id, stage_id))
+        if values is None:
+            _count_failure("stage", stage)
+            raise ValueError(f"Stage '{stage}' not found in recommendations. Available: {list(self.regions[region_id]['recommendations'].keys())}")
+        return region_id, building_type_id, stage_id, values
+    
+    def _compile_factors(self) -> Dict[Tuple[str, str, str], tuple]:
+        """
+        Flatten the matrix into (region, building_type, stage) -> (base, risk,
+        total, multiplier, final, recommendations), keyed on canonical IDs
+        """
+        factors = {}
+        for region in self.region_keys.ids:
+            recs = self.regions[region].get('recommendations', {})
+            for stage in STAGES.ids:
+                rec = recs.get(RECOMMENDATION_KEYS[stage])
+                if not rec:
+                    continue
+                for building_type in self.building_type_keys.ids:
+                    multiplier = self.building_type_adjustments[building_type]['adjustment_multiplier']
+                    final = rec['base_adjustment'] * multiplier + rec['risk_premium']
+                    factors[(region, building_type, stage)] = (
+                        rec['base_adjustment'], rec['risk_premium'], rec['total'], multiplier, final, rec
+                    )
+        return factors
+    
+    def locator(self) -> RegionLocator:
+        """
+        Get the grid index over the regions' geographic_bounds (built once per matrix)
         
-        # Get stage-specific recommendations
-        stage_key = stage.lower() if isinstance(stage, str) else stage.value.lower()
-        # Convert stage names to recommendation keys
-        stage_key_map = {
-            'bidding': 'bidding_stage',
-            'post_award': 'post_award_stage',
-            'final': 'final_stage'
-        }
-        rec_key = stage_key_map.get(stage_key, stage_key)
-        if rec_key not in region_data['recommendations']:
-            raise ValueError(f"Stage '{stage}' not found in recommendations. Available: {list(region_data['recommendations'].keys())}")
+        Its codes_for_locations() codes follow the matrix region order, so they
+        can be passed to assess_batch() as pre-encoded regions.
+        """
+        if self.auto_reload:
+            self.refresh()
+        if self._locator is None:
+            self._locator = RegionLocator(self.regions)
+        return self._locator
+    
+    def region_for_location(self, lat: float, lon: float) -> Optional[str]:
+        """
+        Find the matrix region for a project location
         
-        recommendations = region_data['recommendations'][rec_key]
+        Args:
+            lat: Latitude (decimal degrees)
+            lon: Longitude (decimal degrees, negative west)
         
-        # Get building type adjustment
-        bt_data = self.building_type_adjustments[building_type]
-        bt_multiplier = bt_data['adjustment_multiplier']
+        Returns:
+            Region ID (the smallest containing region wins), or None if the
+            location is outside every region
+        """
+        return self.locator().region_for_location(lat, lon)
+    
+    def lookup_tables(self) -> Dict[str, Any]:
+        """
+        Get precompiled region x stage x building-type lookup arrays
         
-        # Calculate adjustments
-        base_adjustment = recommendations['base_adjustment']
-        risk_premium = recommendations['risk_premium']
-        total_adjustment = recommendations['total']
+        Compiled once per matrix on first use. Rows follow the matrix order of
+        regions / building types and the Stage enum order for stages, so the
+        '*_ids' lists double as the code books for pre-encoded batch inputs.
+        The '*_index' dicts map every accepted spelling to its code.
         
-        # Apply building type multiplier
-        final_adjustment = base_adjustment * bt_multiplier + risk_premium
+        Returns:
+            Dictionary with region_ids, building_type_ids, stage_ids, the
+            base_adjustment / risk_premium / total_adjustment arrays (region x stage,
+            NaN where a region has no recommendation for a stage) and the
+            building_type_multiplier array
+        """
+        if self.auto_reload:
+            self.refresh()
+        if self._lookup_tables is None:
+            self._lookup_tables = self._compile_lookup_tables()
+        return self._lookup_tables
+    
+    def _compile_lookup_tables(self) -> Dict[str, Any]:
+        """Compile the nested matrix dicts into dense NumPy lookup arrays"""
+        require_numpy("batch assessment")
         
-        # Build breakdown
-        breakdown = self._build_breakdown(region_data)
+        region_ids = list(self.region_keys.ids)
+        building_type_ids = list(self.building_type_keys.ids)
+        stage_ids = list(STAGES.ids)
         
-        # Calculate dollar impact if hard cost provided
-        cost_impact = None
-        if hard_cost:
-            cost_impact = hard_cost * final_adjustment
+        shape = (len(region_ids), len(stage_ids))
+        base = np.full(shape, np.nan)
+        risk = np.full(shape, np.nan)
+        total = np.full(shape, np.nan)
+        for r, region in enumerate(region_ids):
+            region_recs = self.regions[region].get('recommendations', {})
+            for s, stage in enumerate(stage_ids):
+                rec = region_recs.get(RECOMMENDATION_KEYS[stage])
+                if rec:
+                    base[r, s] = rec['base_adjustment']
+                    risk[r, s] = rec['risk_premium']
+                    total[r, s] = rec['total']
         
-        result = GeotechnicalCostResult(
-            region=region,
-            building_type=building_type,
-            stage=stage,
-            base_adjustment=base_adjustment,
-            risk_premium=risk_premium,
-            total_adjustment=total_adjustment,
-            building_type_multiplier=bt_multiplier,
-            final_adjustment=final_adjustment,
-            confidence=region_data['summary']['confidence'],
-            breakdown=breakdown,
-            recommendations=recommendations,
-            notes=region_data['summary']['notes']
+        multiplier = np.array(
+            [self.building_type_adjustments[bt]['adjustment_multiplier'] for bt in building_type_ids],
+            dtype=float
         )
         
-        return result
+        return {
+            'region_ids': region_ids,
+            'building_type_ids': building_type_ids,
+            'stage_ids': stage_ids,
+            'region_index': self.region_keys.index(),
+            'building_type_index': self.building_type_keys.index(),
+            'stage_index': STAGES.index(),
+            'base_adjustment': base,
+            'risk_premium': risk,
+            'total_adjustment': total,
+            'building_type_multiplier': multiplier
+        }
     
-    def _build_breakdown(self, region_data: Dict) -> Dict:
-        """Build detailed cost driver breakdown"""
-        profile = region_data['geotechnical_profile']
+    def assess_batch(
+        self,
+        regions: Union[str, Sequence],
+        building_types: Union[str, Sequence] = "commercial_office",
+        stages: Union[str, Sequence] = "BIDDING",
+        hard_costs: Union[float, Sequence, None] = None
+    ) -> Dict[str, Any]:
+        """
+        Assess geotechnical cost impact for many projects at once
         
-        breakdown = {}
-        for driver_name, driver_data in profile.items():
-            if 'cost_impact' in driver_data:
-                breakdown[driver_name] = {
-                    'cost_impact': driver_data['cost_impact'],
-                    'description': driver_data.get('description', ''),
-                    'confidence': driver_data.get('confidence', 'MEDIUM')
-                }
+        Columnar counterpart of assess(). Each argument is either a scalar, which
+        is broadcast to every row, or a list / NumPy array with one value per row.
+        Integer arrays are taken as pre-encoded indices into the '*_ids' lists of
+        lookup_tables(), which skips string lookups entirely for repeated sweeps.
         
-        return breakdown
+        Args:
+            regions: Region ID(s)
+            building_types: Building type(s)
+            stages: Project stage(s) (BIDDING, POST_AWARD, FINAL)
+            hard_costs: Hard cost(s) for calculating dollar impact (optional)
+        
+        Returns:
+            Dictionary of NumPy arrays: base_adjustment, risk_premium,
+            total_adjustment, building_type_multiplier, final_adjustment and
+            cost_impact (NaN where no hard cost was given)
+        """
+        start = time.perf_counter() if INSTRUMENTATION.enabled else None
+        tables = self.lookup_tables()
+        
+        n = batch_length(regions, building_types, stages, hard_costs)
+        region_idx = encode_column(regions, tables['region_index'], n, 'Region', tables['region_ids'])
+        bt_idx = encode_column(building_types, tables['building_type_index'], n, 'Building type', tables['building_type_ids'])
+        stage_idx = encode_column(stages, tables['stage_index'], n, 'Stage', tables['stage_ids'])
+        
+        base_adjustment = tables['base_adjustment'][region_idx, stage_idx]
+        risk_premium = tables['risk_premium'][region_idx, stage_idx]
+        if np.isnan(base_adjustment).any():
+            missing = np.isnan(base_adjustment)
+            pairs = sorted({
+                (tables['region_ids'][r], tables['stage_ids'][s])
+                for r, s in zip(region_idx[missing].tolist(), stage_idx[missing].tolist())
+            })
+            raise ValueError(f"Stage not found in recommendations for (region, stage): {pairs}")
+        
+        bt_multiplier = tables['building_type_multiplier'][bt_idx]
+        final_adjustment = base_adjustment * bt_multiplier + risk_premium
+        
+        if hard_costs is None:
+            cost_impact = np.full(n, np.nan)
+        else:
+            cost_impact = np.broadcast_to(np.asarray(hard_costs, dtype=float), (n,)) * final_adjustment
+        
+        if start is not None:
+            INSTRUMENTATION.observe("geotech_stage_seconds", time.perf_counter() - start, stage="assess_batch")
+        return {
+            'base_adjustment': base_adjustment,
+            'risk_premium': risk_premium,
+            'total_adjustment': tables['total_adjustment'][region_idx, stage_idx],
+            'building_type_multiplier': bt_multiplier,
+            'final_adjustment': final_adjustment,
+            'cost_impact': cost_impact
+        }
     
     def compare_regions(
         self,
@@ -202,12 +617,13 @@ class GeotechnicalAssessment:
         results = []
         for region in regions:
             try:
-                result = self.assess(region, building_type, stage)
+                factors = self.factors(region, building_type, stage)
+                summary = self.regions[self.region_keys.canonical(region)]['summary']
                 results.append({
                     'region': region,
-                    'final_adjustment': result.final_adjustment,
-                    'confidence': result.confidence,
-                    'notes': result.notes
+                    'final_adjustment': factors.final_adjustment,
+                    'confidence': summary['confidence'],
+                    'notes': summary['notes']
                 })
             except ValueError as e:
                 print(f"Error assessing {region}: {e}")
@@ -216,10 +632,188 @@ class GeotechnicalAssessment:
         results.sort(key=lambda x: x['final_adjustment'], reverse=True)
         return results
     
+    def compare_portfolio(
+        self,
+        sites: Optional[Sequence[Union[str, Dict]]] = None,
+        building_types: Optional[Sequence[str]] = None,
+        stages: Optional[Sequence[str]] = None,
+        hard_cost: Optional[float] = None,
+        rank_by: str = "final_adjustment",
+        top_k: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        executor: str = "thread"
+    ) -> Dict[str, Any]:
+        """
+        Compare candidate sites across building types and stages in one pass
+        
+        Evaluates the full sites x building_types x stages cross-product through
+        the batch lookup arrays. Invalid sites / building types / stages do not
+        abort the run: they are returned as rows in 'errors'.
+        
+        Args:
+            sites: Region IDs, or dicts with region plus optional site_id and
+                hard_cost (defaults to every region in the matrix)
+            building_types: Building types to compare (defaults to all)
+            stages: Stages to compare (defaults to all)
+            hard_cost: Hard cost for sites that do not carry their own
+            rank_by: Column to rank by, highest first (final_adjustment or cost_impact)
+            top_k: Keep only the k highest-ranked rows (selected without a full sort)
+            max_workers: Split the sites into chunks evaluated on a pool of this size
+            executor: Pool type for max_workers ("thread" or "process")
+        
+        Returns:
+            Columnar dictionary of ranked NumPy arrays (site_id, region,
+            building_type, stage, base_adjustment, risk_premium,
+            building_type_multiplier, final_adjustment, cost_impact) plus
+            'errors', a list of dicts describing combinations that were skipped
+        """
+        if rank_by not in ('final_adjustment', 'cost_impact'):
+            raise ValueError(f"rank_by must be 'final_adjustment' or 'cost_impact', got '{rank_by}'")
+        if executor not in ('thread', 'process'):
+            raise ValueError(f"executor must be 'thread' or 'process', got '{executor}'")
+        
+        tables = self.lookup_tables()
+        sites = list(self.regions.keys()) if sites is None else list(sites)
+        building_types = tables['building_type_ids'] if building_types is None else list(building_types)
+        stages = tables['stage_ids'] if stages is None else list(stages)
+        errors = []
+        
+        # Validate each dimension once instead of once per combination
+        site_ids, site_regions, site_costs = [], [], []
+        for site in sites:
+            if isinstance(site, dict):
+                region = site.get('region')
+                site_id = site.get('site_id', region)
+                cost = site.get('hard_cost', hard_cost)
+            else:
+                region = site_id = site
+                cost = hard_cost
+            if tables['region_index'].code(region) is None:
+                errors.append({'site_id': site_id, 'region': region, 'building_type': None, 'stage': None,
+                               'error': f"Region '{region}' not found in matrix"})
+                continue
+            site_ids.append(site_id)
+            site_regions.append(tables['region_index'].code(region))
+            site_costs.append(np.nan if cost is None else float(cost))
+        
+        bt_codes = []
+        for bt in building_types:
+            code = tables['building_type_index'].code(bt)
+            if code is not None:
+                bt_codes.append(code)
+            else:
+                errors.append({'site_id': None, 'region': None, 'building_type': bt, 'stage': None,
+                               'error': f"Building type '{bt}' not found"})
+        
+        stage_codes = []
+        for stage in stages:
+            code = tables['stage_index'].code(stage)
+            if code is not None:
+                stage_codes.append(code)
+            else:
+                errors.append({'site_id': None, 'region': None, 'building_type': None, 'stage': stage,
+                               'error': f"Stage '{stage}' not found"})
+        
+        # Cross-product as flat code arrays: site-major, then building type, then stage
+        site_idx, bt_idx, stage_idx = (
+            a.ravel() for a in np.meshgrid(
+                np.arange(len(site_ids), dtype=np.intp),
+                np.asarray(bt_codes, dtype=np.intp),
+                np.asarray(stage_codes, dtype=np.intp),
+                indexing='ij'
+            )
+        )
+        region_idx = np.asarray(site_regions, dtype=np.intp)[site_idx]
+        
+        missing = np.isnan(tables['base_adjustment'][region_idx, stage_idx])
+        if missing.any():
+            for s, r, t in sorted({
+                (int(s), int(r), int(t))
+                for s, r, t in zip(site_idx[missing], region_idx[missing], stage_idx[missing])
+            }):
+                region, stage = tables['region_ids'][r], tables['stage_ids'][t]
+                errors.append({'site_id': site_ids[s], 'region': region, 'building_type': None, 'stage': stage,
+                               'error': f"Stage '{stage}' not found in recommendations for region '{region}'"})
+            keep = ~missing
+            site_idx, bt_idx, stage_idx, region_idx = site_idx[keep], bt_idx[keep], stage_idx[keep], region_idx[keep]
+        
+        hard_costs = np.asarray(site_costs, dtype=float)[site_idx]
+        columns = self._assess_chunks(region_idx, bt_idx, stage_idx, hard_costs, max_workers, executor)
+        
+        # Rank highest first; NaN (no hard cost) sorts last
+        key = np.nan_to_num(columns[rank_by], nan=-np.inf)
+        if top_k is not None and top_k < len(key):
+            candidates = np.argpartition(-key, top_k - 1)[:top_k] if top_k > 0 else np.empty(0, dtype=np.intp)
+            order = candidates[np.argsort(-key[candidates], kind='stable')]
+        else:
+            order = np.argsort(-key, kind='stable')
+        
+        result = {
+            'site_id': np.asarray(site_ids, dtype=object)[site_idx[order]],
+            'region': np.asarray(tables['region_ids'], dtype=object)[region_idx[order]],
+            'building_type': np.asarray(tables['building_type_ids'], dtype=object)[bt_idx[order]],
+            'stage': np.asarray(tables['stage_ids'], dtype=object)[stage_idx[order]]
+        }
+        for name in ('base_adjustment', 'risk_premium', 'building_type_multiplier', 'final_adjustment', 'cost_impact'):
+            result[name] = columns[name][order]
+        result['errors'] = errors
+        return result
+    
+    def _assess_chunks(
+        self,
+        region_idx: "np.ndarray",
+        bt_idx: "np.ndarray",
+        stage_idx: "np.ndarray",
+        hard_costs: "np.ndarray",
+        max_workers: Optional[int],
+        executor: str
+    ) -> Dict[str, "np.ndarray"]:
+        """Run assess_batch over pre-encoded rows, optionally split across a pool"""
+        if not max_workers or max_workers <= 1 or len(region_idx) < 2:
+            return self.assess_batch(region_idx, bt_idx, stage_idx, hard_costs)
+        
+        bounds = np.linspace(0, len(region_idx), min(max_workers, len(region_idx)) + 1).astype(int)
+        chunks = [
+            (region_idx[a:b], bt_idx[a:b], stage_idx[a:b], hard_costs[a:b])
+            for a, b in zip(bounds[:-1], bounds[1:])
+        ]
+        if executor == 'process':
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                parts = list(pool.map(_assess_chunk_in_worker, [(self.worker_spec(),) + chunk for chunk in chunks]))
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                parts = list(pool.map(lambda chunk: self.assess_batch(*chunk), chunks))
+        return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+    
+    def worker_spec(self) -> tuple:
+        """
+        Describe this engine for rebuilding it in a worker process
+        
+        Returns:
+            (matrix_file, calibration_file, overlay) for engine_from_worker_spec();
+            the overlay travels as its overrides, so tenant views survive the trip
+        """
+        return (self.matrix_file, self.calibration_file, self.overlay)
+    
+    def calibration(self) -> Dict:
+        """
+        Get the calibration overlay of this matrix
+        
+        Returns:
+            Parsed overlay (see region_calibration.py), or an empty dict if there is none
+        """
+        try:
+            return self._cache.get(self.calibration_file, loader=_load_json) or {}
+        except FileNotFoundError:
+            return {}
+    
     def get_historical_data(self, region: str, building_type: str = None) -> Dict:
         """
         Get historical project data for a region
         
+        Statistics recalibrated from validated projects (calibration overlay)
+        take precedence over the hand-maintained matrix values.
+        
         Args:
             region: Region ID
             building_type: Optional building type filter
@@ -227,15 +821,23 @@ class GeotechnicalAssessment:
         Returns:
             Historical data including project counts and averages
         """
-        if region not in self.regions:
+        if self.auto_reload:
+            self.refresh()
+        
+        region_id = self.region_keys.canonical(region)
+        if region_id is None:
             raise ValueError(f"Region '{region}' not found")
         
-        historical = self.regions[region]['historical_data']
+        historical = _apply_calibration(
+            self.regions[region_id]['historical_data'],
+            self.calibration().get('regions', {}).get(region_id)
+        )
         
         if building_type:
-            if building_type not in historical['by_building_type']:
+            building_type_id = self.building_type_keys.canonical(building_type) or building_type
+            if building_type_id not in historical['by_building_type']:
                 raise ValueError(f"Building type '{building_type}' not found for region")
-            return historical['by_building_type'][building_type]
+            return historical['by_building_type'][building_type_id]
         
         return historical
     
@@ -259,21 +861,85 @@ class GeotechnicalAssessment:
             Dictionary with cost impact breakdown
         """
         result = self.assess(region, building_type, stage, hard_cost)
-        
-        cost_impact = hard_cost * result.final_adjustment
+        cost_impact = result.cost_impact or 0.0
         
         return {
-            'region': region,
-            'building_type': building_type,
-            'stage': stage,
+            'region': result.region,
+            'building_type': result.building_type,
+            'stage': result.stage,
             'base_hard_cost': hard_cost,
             'geotechnical_adjustment_percent': result.final_adjustment * 100,
             'geotechnical_cost_impact': cost_impact,
             'total_cost_with_geo': hard_cost + cost_impact,
-            'breakdown': result.breakdown,
+            'breakdown': {name: dict(driver) for name, driver in result.breakdown.items()},
             'confidence': result.confidence
         }
 
+def _count_failure(field: str, value: Any) -> None:
+    """Count a rejected assess() input per field / value"""
+    if INSTRUMENTATION.enabled:
+        INSTRUMENTATION.increment("geotech_validation_failures_total", field=field, value=value)
+
+def _build_breakdown(region_data: Dict) -> Mapping:
+    """Build the read-only cost driver breakdown of a region"""
+    profile = region_data['geotechnical_profile']
+    
+    breakdown = {}
+    for driver_name, driver_data in profile.items():
+        if 'cost_impact' in driver_data:
+            breakdown[driver_name] = MappingProxyType({
+                'cost_impact': driver_data['cost_impact'],
+                'description': driver_data.get('description', ''),
+                'confidence': driver_data.get('confidence', 'MEDIUM')
+            })
+    
+    return MappingProxyType(breakdown)
+
+def _copy_mapping(value: Any) -> Any:
+    """Deep copy of nested mappings / lists into plain dicts / lists"""
+    if isinstance(value, Mapping):
+        return {k: _copy_mapping(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_copy_mapping(v) for v in value)
+    return value
+
+def calibration_overlay_path(matrix_file: str) -> str:
+    """Default calibration overlay path of a matrix file"""
+    return matrix_file + CALIBRATION_OVERLAY_SUFFIX
+
+def _load_json(path: str) -> Any:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _apply_calibration(historical: Dict, calibrated: Optional[Dict]) -> Dict:
+    """Overlay a region's calibrated statistics on its matrix historical_data (copies, never mutates)"""
+    if not calibrated:
+        return historical
+    overlay = calibrated.get('historical_data') or {}
+    merged = dict(historical)
+    merged.update((k, v) for k, v in overlay.items() if k != 'by_building_type')
+    by_building_type = dict(historical.get('by_building_type') or {})
+    for building_type, stats in (overlay.get('by_building_type') or {}).items():
+        by_building_type[building_type] = {**(by_building_type.get(building_type) or {}), **stats}
+    merged['by_building_type'] = by_building_type
+    if 'validation_status' in calibrated:
+        merged['validation_status'] = calibrated['validation_status']
+    return merged
+
+# ============================================================================
+# WORKER PROCESS HELPERS
+# ============================================================================
+
+def engine_from_worker_spec(spec: tuple) -> GeotechnicalAssessment:
+    """Rebuild an engine from GeotechnicalAssessment.worker_spec() in a worker process"""
+    matrix_file, calibration_file, overlay = spec
+    return GeotechnicalAssessment(matrix_file, calibration_file=calibration_file, overlay=overlay)
+
+def _assess_chunk_in_worker(args: tuple) -> Dict[str, "np.ndarray"]:
+    """Evaluate one pre-encoded portfolio chunk in a worker process"""
+    spec, region_idx, bt_idx, stage_idx, hard_costs = args
+    return engine_from_worker_spec(spec).assess_batch(region_idx, bt_idx, stage_idx, hard_costs)
+
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+GEOTECHNICAL MONTE CARLO SIMULATION v1.0
+
+Purpose: Probabilistic (P10/P50/P90) geotechnical cost impacts over the cost driver matrix
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+Implements the LAYER 1 "Monte Carlo Simulation Framework" for geotechnical risk.
+Each iteration:
+
+    1. Samples every driver in the region's geotechnical_profile as
+       cost_impact x LogNormal(mean 1, sigma by driver confidence)
+    2. Scales the stage base_adjustment by the sampled driver total, with the
+       spread calibrated to the region's historical_data std_dev and clipped
+       to its historical min/max adjustment
+    3. Samples the stage risk premium from Triangular(0, risk_premium, 2 x risk_premium)
+    4. final_adjustment = base x building_type_multiplier + risk premium
+
+All iterations for a project are drawn in one vectorized NumPy pass.
+
+Usage:
+    from geotechnical_cost_assessment import GeotechnicalAssessment
+    from geotechnical_monte_carlo import GeotechnicalMonteCarlo
+
+    simulator = GeotechnicalMonteCarlo(GeotechnicalAssessment("../Data/GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml"))
+    result = simulator.simulate("CA_Inland", "commercial_office", "BIDDING", hard_cost=75500000, seed=7)
+    print(result.p10_cost_impact, result.p50_cost_impact, result.p90_cost_impact)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from geotechnical_cost_assessment import GeotechnicalAssessment, engine_from_worker_spec
+
+# Relative (log-space) standard deviation of a driver's cost impact by confidence
+CONFIDENCE_SIGMA = {
+    'HIGH': 0.15,
+    'MEDIUM': 0.30,
+    'LOW': 0.50
+}
+DEFAULT_SIGMA = CONFIDENCE_SIGMA['MEDIUM']
+
+SeedLike = Union[None, int, np.random.SeedSequence]
+
+# ============================================================================
+# DATA STRUCTURES
+# ============================================================================
+
+@dataclass
+class MonteCarloResult:
+    """Result of a geotechnical Monte Carlo simulation"""
+    region: str
+    building_type: str
+    stage: str
+    iterations: int
+    point_estimate: float
+    mean_adjustment: float
+    std_adjustment: float
+    p10_adjustment: float
+    p50_adjustment: float
+    p90_adjustment: float
+    hard_cost: Optional[float] = None
+    p10_cost_impact: Optional[float] = None
+    p50_cost_impact: Optional[float] = None
+    p90_cost_impact: Optional[float] = None
+    samples: Optional[np.ndarray] = None
+
+@dataclass
+class _RegionDrivers:
+    """Per-region driver arrays precompiled for sampling"""
+    impacts: np.ndarray
+    sigmas: np.ndarray
+    spread_scale: float
+    min_adjustment: float
+    max_adjustment: float
+
+# ============================================================================
+# SIMULATION ENGINE
+# ============================================================================
+
+class GeotechnicalMonteCarlo:
+    """
+    Vectorized Monte Carlo simulator over a GeotechnicalAssessment matrix
+    """
+
+    def __init__(self, assessment: GeotechnicalAssessment):
+        """
+        Initialize the simulator
+
+        Args:
+            assessment: Assessment engine providing the matrix
+        """
+        self.assessment = assessment
+        self._drivers: Dict[str, _RegionDrivers] = {}
+        self._matrix = None
+
+    def _region_drivers(self, region: str) -> _RegionDrivers:
+        """Get (and cache per matrix) the driver arrays of a region"""
+        if self._matrix is not self.assessment.matrix:
+            self._drivers = {}
+            self._matrix = self.assessment.matrix
+
+        drivers = self._drivers.get(region)
+        if drivers is None:
+            drivers = self._compile_region(self.assessment.regions[region])
+            self._drivers[region] = drivers
+        return drivers
+
+    @staticmethod
+    def _compile_region(region_data: Dict) -> _RegionDrivers:
+        """Extract driver impacts / sigmas and the historical calibration of a region"""
+        profile = region_data.get('geotechnical_profile', {})
+        impacts, sigmas = [], []
+        for driver_data in profile.values():
+            if 'cost_impact' in driver_data:
+                impacts.append(float(driver_data['cost_impact']))
+                sigmas.append(CONFIDENCE_SIGMA.get(driver_data.get('confidence', 'MEDIUM'), DEFAULT_SIGMA))
+        impacts = np.array(impacts, dtype=float)
+        sigmas = np.array(sigmas, dtype=float)
+
+        historical = region_data.get('historical_data', {})
+        total = impacts.sum()
+
+        # Relative std of the sampled driver total; rescale it to the historical spread
+        spread_scale = 1.0
+        avg = historical.get('avg_adjustment')
+        std = historical.get('std_dev')
+        if total > 0 and avg and std is not None:
+            relative_std = np.sqrt(np.sum(impacts ** 2 * np.expm1(sigmas ** 2))) / total
+            if relative_std > 0:
+                spread_scale = (std / avg) / relative_std
+
+        return _RegionDrivers(
+            impacts=impacts,
+            sigmas=sigmas,
+            spread_scale=float(spread_scale),
+            min_adjustment=float(historical.get('min_adjustment', 0.0)),
+            max_adjustment=float(historical.get('max_adjustment', np.inf))
+        )
+
+    def simulate(
+        self,
+        region: str,
+        building_type: str = "commercial_office",
+        stage: str = "BIDDING",
+        hard_cost: Optional[float] = None,
+        iterations: int = 100_000,
+        seed: SeedLike = None,
+        keep_samples: bool = False
+    ) -> MonteCarloResult:
+        """
+        Simulate the geotechnical adjustment distribution for one project
+
+        Args:
+            region: Region ID
+            building_type: Building type
+            stage: Project stage (BIDDING, POST_AWARD, FINAL)
+            hard_cost: Hard cost for dollar percentiles (optional)
+            iterations: Number of Monte Carlo iterations
+            seed: Seed or SeedSequence for a reproducible run
+            keep_samples: Attach the sampled final adjustments to the result
+
+        Returns:
+            MonteCarloResult with mean / std and P10 / P50 / P90
+
+        Raises:
+            ValueError: If iterations is not a positive integer
+        """
+        _check_iterations(iterations)
+        point = self.assessment.assess(region, building_type, stage)
+        drivers = self._region_drivers(point.region)
+        rng = np.random.default_rng(seed)
+
+        # Driver total relative to nominal, one lognormal draw per driver
+        total = drivers.impacts.sum()
+        if total > 0:
+            driver_total = np.zeros(iterations)
+            for impact, sigma in zip(drivers.impacts, drivers.sigmas):
+                driver_total += impact * rng.lognormal(-0.5 * sigma * sigma, sigma, iterations)
+            relative = 1.0 + (driver_total / total - 1.0) * drivers.spread_scale
+        else:
+            relative = np.ones(iterations)
+
+        base = np.clip(point.base_adjustment * relative, drivers.min_adjustment, drivers.max_adjustment)
+
+        if point.risk_premium > 0:
+            risk = rng.triangular(0.0, point.risk_premium, 2.0 * point.risk_premium, iterations)
+        else:
+            risk = np.zeros(iterations)
+
+        final = base * point.building_type_multiplier + risk
+        p10, p50, p90 = np.percentile(final, [10, 50, 90])
+
+        result = MonteCarloResult(
+            region=point.region,
+            building_type=point.building_type,
+            stage=point.stage,
+            iterations=iterations,
+            point_estimate=point.final_adjustment,
+            mean_adjustment=float(final.mean()),
+            std_adjustment=float(final.std()),
+            p10_adjustment=float(p10),
+            p50_adjustment=float(p50),
+            p90_adjustment=float(p90),
+            samples=final if keep_samples else None
+        )
+        if hard_cost:
+            result.hard_cost = hard_cost
+            result.p10_cost_impact = float(hard_cost * p10)
+            result.p50_cost_impact = float(hard_cost * p50)
+            result.p90_cost_impact = float(hard_cost * p90)
+        return result
+
+    def simulate_portfolio(
+        self,
+        projects: List[Dict[str, Any]],
+        iterations: int = 100_000,
+        seed: SeedLike = None,
+        processes: Optional[int] = None
+    ) -> List[MonteCarloResult]:
+        """
+        Simulate many projects, optionally fanned out over worker processes
+
+        Every project gets its own child of the seed's SeedSequence, so results
+        are identical whether run serially or on any number of processes.
+
+        Args:
+            projects: Dicts with region and optional building_type, stage, hard_cost
+            iterations: Iterations per project
+            seed: Seed or SeedSequence for a reproducible run
+            processes: Worker processes (None or 1 runs in this process)
+
+        Returns:
+            One MonteCarloResult per project, in input order
+
+        Raises:
+            ValueError: If iterations is not a positive integer
+        """
+        _check_iterations(iterations)
+        seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        child_seeds = seed_seq.spawn(len(projects))
+        tasks = [(project, iterations, child) for project, child in zip(projects, child_seeds)]
+
+        if not processes or processes <= 1:
+            return [self.simulate(**project, iterations=n, seed=child) for project, n, child in tasks]
+
+        chunksize = max(1, len(tasks) // (processes * 4))
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_init_worker,
+            initargs=(self.assessment.worker_spec(),)
+        ) as pool:
+            return list(pool.map(_simulate_task, tasks, chunksize=chunksize))
+
+def _check_iterations(iterations: int) -> None:
+    """Reject iteration counts numpy cannot sample / take percentiles of"""
+    if isinstance(iterations, bool) or not isinstance(iterations, (int, np.integer)) or iterations < 1:
+        raise ValueError(f"iterations must be a positive integer, got {iterations!r}")
+
+# ============================================================================
+# WORKER PROCESS HELPERS
+# ============================================================================
+
+_worker_simulator: Optional[GeotechnicalMonteCarlo] = None
+
+def _init_worker(spec: tuple) -> None:
+    """Build one simulator per worker process (same matrix, calibration and overlay as the parent)"""
+    global _worker_simulator
+    _worker_simulator = GeotechnicalMonteCarlo(engine_from_worker_spec(spec))
+
+def _simulate_task(task: tuple) -> MonteCarloResult:
+    """Run one portfolio project in a worker process"""
+    project, iterations, seed = task
+    return _worker_simulator.simulate(**project, iterations=iterations, seed=seed)
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+
+    matrix_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Data", "GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml")
+    simulator = GeotechnicalMonteCarlo(GeotechnicalAssessment(matrix_file))
+
+    print("\n### EXAMPLE 1: Advantech North America Campus (100k iterations) ###")
+    r = simulator.simulate("CA_Inland", "commercial_office", "BIDDING", hard_cost=75500000, seed=7)
+    print(f"Point estimate:   {r.point_estimate:.1%}")
+    print(f"P10 / P50 / P90:  {r.p10_adjustment:.1%} / {r.p50_adjustment:.1%} / {r.p90_adjustment:.1%}")
+    print(f"Dollar P10 / P90: ${r.p10_cost_impact:,.0f} / ${r.p90_cost_impact:,.0f}")
+
+    print("\n### EXAMPLE 2: Portfolio on 2 processes ###")
+    portfolio = [
+        {"region": "TX_Coastal", "building_type": "warehouse", "hard_cost": 50000000},
+        {"region": "CA_Bay_Area", "building_type": "healthcare", "hard_cost": 120000000},
+        {"region": "NY_Urban", "stage": "POST_AWARD", "hard_cost": 80000000}
+    ]
+    for r in simulator.simulate_portfolio(portfolio, seed=11, processes=2):
+        print(f"{r.region:<14} {r.building_type:<18} P50 ${r.p50_cost_impact:>13,.0f}  P90 ${r.p90_cost_impact:>13,.0f}")
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+GEOTECHNICAL SENSITIVITY ANALYSIS v1.0
+
+Purpose: Tornado data and partial derivatives of the geotechnical adjustment over the 10 cost drivers
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+assess() reads the stage recommendation totals of a region; the region's
+scored geotechnical_profile explains where those totals come from. This
+module ties the two together with the same driver model as the Monte Carlo
+simulator: the stage base adjustment scales with the sum of the driver cost
+impacts,
+
+    base(scores)  = stage base_adjustment x driver_total(scores) / driver_total(profile)
+    final(scores) = base(scores) x building_type_multiplier + stage risk_premium
+
+so the profile's own scores reproduce assess() exactly. Each driver is then
+moved across every level of its cost_drivers scoring_scale (all drivers and
+levels in one NumPy pass) to get the low / high adjustment per driver, i.e.
+the bars of a tornado chart, plus the partial derivative and elasticity of
+the final adjustment with respect to each driver's cost impact.
+
+Where a region's profile carries its own cost_impact for a score (regional
+calibration, e.g. TX_Coastal environmental constraints), that value replaces
+the scale's default for that score.
+
+Usage:
+    from geotechnical_cost_assessment import GeotechnicalAssessment
+    from geotechnical_sensitivity import GeotechnicalSensitivity
+
+    sensitivity = GeotechnicalSensitivity(GeotechnicalAssessment("../Data/GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml"))
+    result = sensitivity.analyze("CA_Coastal", "healthcare", "BIDDING", hard_cost=75500000)
+    for bar in result.tornado():
+        print(bar['driver'], bar['low_adjustment'], bar['high_adjustment'])
+    sensitivity.what_if("CA_Coastal", scores={'liquefaction_risk': 'low'})
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from geotechnical_cost_assessment import GeotechnicalAssessment
+
+# ============================================================================
+# DATA STRUCTURES
+# ============================================================================
+
+@dataclass
+class DriverSensitivity:
+    """Sensitivity of the final adjustment to one cost driver"""
+    driver: str                      # profile key (groundwater_depth, ...)
+    name: str                        # display name from cost_drivers
+    score: Optional[str]             # the region's current score
+    cost_impact: float               # the region's current driver cost impact
+    contribution: float              # part of final_adjustment attributed to this driver
+    low_score: Optional[str]
+    low_adjustment: float
+    high_score: Optional[str]
+    high_adjustment: float
+    swing: float                     # high_adjustment - low_adjustment
+    derivative: float                # d final_adjustment / d driver cost_impact
+    elasticity: float                # relative change of final per relative change of the driver
+    low_cost_impact: Optional[float] = None
+    high_cost_impact: Optional[float] = None
+
+@dataclass
+class SensitivityResult:
+    """Driver sensitivities of one region / building type / stage, largest swing first"""
+    region: str
+    building_type: str
+    stage: str
+    final_adjustment: float
+    driver_total: float
+    drivers: List[DriverSensitivity]
+    hard_cost: Optional[float] = None
+    cost_impact: Optional[float] = None
+
+    def tornado(self) -> List[Dict[str, Any]]:
+        """Tornado chart bars (one dict per driver, largest swing first)"""
+        return [asdict(driver) for driver in self.drivers]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly representation"""
+        return asdict(self)
+
+@dataclass
+class _RegionScales:
+    """Per-region driver arrays precompiled for the vectorized sweep"""
+    drivers: List[str]
+    names: List[str]
+    scores: List[Optional[str]]
+    impacts: np.ndarray              # (D,) current cost impacts
+    level_scores: List[List[str]]    # per driver, the scale's score keys
+    levels: np.ndarray               # (D, K) cost impact per level, NaN padded
+
+# ============================================================================
+# SENSITIVITY ENGINE
+# ============================================================================
+
+class GeotechnicalSensitivity:
+    """
+    Driver-level sensitivity analysis over a GeotechnicalAssessment matrix
+    """
+
+    def __init__(self, assessment: GeotechnicalAssessment):
+        """
+        Initialize the analyzer
+
+        Args:
+            assessment: Assessment engine providing the matrix
+        """
+        self.assessment = assessment
+        self._scales: Dict[str, _RegionScales] = {}
+        self._matrix = None
+
+    def _region_scales(self, region: str) -> _RegionScales:
+        """Get (and cache per matrix) the driver arrays of a region"""
+        if self._matrix is not self.assessment.matrix:
+            self._scales = {}
+            self._matrix = self.assessment.matrix
+
+        scales = self._scales.get(region)
+        if scales is None:
+            scales = self._compile_region(self.assessment.regions[region], self.assessment.matrix.get('cost_drivers', {}))
+            self._scales[region] = scales
+        return scales
+
+    @staticmethod
+    def _compile_region(region_data: Dict, cost_drivers: Dict) -> _RegionScales:
+        """Line up a region's scored profile with the scoring scales of the cost drivers"""
+        # cost_drivers keys look like driver_3_liquefaction_risk; profile keys like liquefaction_risk
+        definitions = {key.split('_', 2)[-1]: value for key, value in cost_drivers.items()}
+        profile = region_data.get('geotechnical_profile', {})
+
+        drivers, names, scores, impacts, level_scores, level_values = [], [], [], [], [], []
+        for driver, data in profile.items():
+            if not isinstance(data, dict) or 'cost_impact' not in data:
+                continue
+            definition = definitions.get(driver, {})
+            scale = definition.get('scoring_scale') or {}
+            score = data.get('score')
+            impact = float(data['cost_impact'])
+
+            keys = [k for k, v in scale.items() if isinstance(v, dict) and 'cost_impact' in v]
+            values = [impact if k == score else float(scale[k]['cost_impact']) for k in keys]
+            if score not in keys:
+                # Unscaled score: the current value is still one of the options
+                keys.append(score)
+                values.append(impact)
+
+            drivers.append(driver)
+            names.append(definition.get('name', driver.replace('_', ' ').title()))
+            scores.append(score)
+            impacts.append(impact)
+            level_scores.append(keys)
+            level_values.append(values)
+
+        width = max((len(v) for v in level_values), default=1)
+        levels = np.full((len(drivers), width), np.nan)
+        for d, values in enumerate(level_values):
+            levels[d, :len(values)] = values
+
+        return _RegionScales(
+            drivers=drivers,
+            names=names,
+            scores=scores,
+            impacts=np.array(impacts, dtype=float),
+            level_scores=level_scores,
+            levels=levels
+        )
+
+    def analyze(
+        self,
+        region: str,
+        building_type: str = "commercial_office",
+        stage: str = "BIDDING",
+        hard_cost: Optional[float] = None
+    ) -> SensitivityResult:
+        """
+        Sweep every driver across its scoring scale
+
+        Args:
+            region: Region ID
+            building_type: Building type
+            stage: Project stage (BIDDING, POST_AWARD, FINAL)
+            hard_cost: Hard cost for dollar low / high impacts (optional)
+
+        Returns:
+            SensitivityResult with drivers ordered by swing (largest first)
+        """
+        point = self.assessment.assess(region, building_type, stage)
+        scales = self._region_scales(point.region)
+
+        total = float(scales.impacts.sum())
+        # d final / d driver cost impact: the same for every driver in the additive model
+        slope = point.base_adjustment * point.building_type_multiplier / total if total > 0 else 0.0
+
+        # (D, K) final adjustment with driver d moved to level k, all other drivers at their score
+        sweep = (total - scales.impacts[:, None] + scales.levels) * slope + point.risk_premium
+        low_idx = np.nanargmin(sweep, axis=1) if len(sweep) else np.empty(0, dtype=int)
+        high_idx = np.nanargmax(sweep, axis=1) if len(sweep) else np.empty(0, dtype=int)
+        rows = np.arange(len(sweep))
+        low, high = sweep[rows, low_idx], sweep[rows, high_idx]
+        contributions = scales.impacts * slope
+        final = point.final_adjustment
+        elasticities = contributions / final if final else np.zeros_like(contributions)
+
+        drivers = []
+        for d in np.argsort(-(high - low), kind='stable').tolist():
+            drivers.append(DriverSensitivity(
+                driver=scales.drivers[d],
+                name=scales.names[d],
+                score=scales.scores[d],
+                cost_impact=float(scales.impacts[d]),
+                contribution=float(contributions[d]),
+                low_score=scales.level_scores[d][low_idx[d]],
+                low_adjustment=float(low[d]),
+                high_score=scales.level_scores[d][high_idx[d]],
+                high_adjustment=float(high[d]),
+                swing=float(high[d] - low[d]),
+                derivative=slope,
+                elasticity=float(elasticities[d]),
+                low_cost_impact=float(hard_cost * low[d]) if hard_cost else None,
+                high_cost_impact=float(hard_cost * high[d]) if hard_cost else None
+            ))
+
+        return SensitivityResult(
+            region=point.region,
+            building_type=point.building_type,
+            stage=point.stage,
+            final_adjustment=final,
+            driver_total=total,
+            drivers=drivers,
+            hard_cost=hard_cost,
+            cost_impact=hard_cost * final if hard_cost else None
+        )
+
+    def what_if(
+        self,
+        region: str,
+        building_type: str = "commercial_office",
+        stage: str = "BIDDING",
+        scores: Optional[Dict[str, str]] = None
+    ) -> float:
+        """
+        Final adjustment with some drivers re-scored
+
+        Args:
+            region: Region ID
+            building_type: Building type
+            stage: Project stage
+            scores: Profile driver key -> score key of its scoring scale
+                (e.g. {'liquefaction_risk': 'low'})
+
+        Returns:
+            Recomputed final adjustment (equals assess() when scores is empty)
+        """
+        point = self.assessment.assess(region, building_type, stage)
+        scales = self._region_scales(point.region)
+        total = float(scales.impacts.sum())
+        if total <= 0:
+            return point.final_adjustment
+
+        impacts = scales.impacts.copy()
+        for driver, score in (scores or {}).items():
+            if driver not in scales.drivers:
+                raise ValueError(f"Driver '{driver}' not found. Available: {scales.drivers}")
+            d = scales.drivers.index(driver)
+            if score not in scales.level_scores[d]:
+                raise ValueError(f"Score '{score}' not found for {driver}. Available: {scales.level_scores[d]}")
+            impacts[d] = scales.levels[d, scales.level_scores[d].index(score)]
+
+        base = point.base_adjustment * impacts.sum() / total
+        return float(base * point.building_type_multiplier + point.risk_premium)
+
+# ============================================================================
+# UTILITY FUNCTIONS
+# ============================================================================
+
+def print_tornado(result: SensitivityResult) -> None:
+    """Print a text tornado chart"""
+    print("\n" + "="*80)
+    print(f"GEOTECHNICAL DRIVER SENSITIVITY - {result.region} / {result.building_type} / {result.stage}")
+    print("="*80)
+    print(f"Final Adjustment: {result.final_adjustment:.2%}")
+    print("-"*80)
+    print(f"{'Driver':<28} {'Score':<14} {'Low':>7} {'High':>7} {'Swing':>7} {'Elast.':>7}")
+    print("-"*80)
+    for d in result.drivers:
+        print(
+            f"{d.name:<28} {str(d.score):<14} {d.low_adjustment:>7.2%} {d.high_adjustment:>7.2%} "
+            f"{d.swing:>7.2%} {d.elasticity:>7.3f}"
+        )
+    print("="*80 + "\n")
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import os
+    import time
+
+    matrix_file = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "Data", "GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml"
+    )
+    sensitivity = GeotechnicalSensitivity(GeotechnicalAssessment(matrix_file))
+
+    result = sensitivity.analyze("CA_Coastal", "healthcare", "BIDDING", hard_cost=75_500_000)
+    print_tornado(result)
+    print(f"What if liquefaction risk were low: {sensitivity.what_if('CA_Coastal', 'healthcare', 'BIDDING', {'liquefaction_risk': 'low'}):.2%}")
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        sensitivity.analyze("TX_Inland", "warehouse", "POST_AWARD")
+    print(f"analyze(): {(time.perf_counter() - start) * 1000:.1f} us per call")
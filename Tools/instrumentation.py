@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+INSTRUMENTATION v1.0
+
+Purpose: Optional timing histograms, counters, metric export and cProfile windows for the estimation hot paths
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+The engines and the router report into the process-wide INSTRUMENTATION
+object. It is disabled by default: every hook in the hot paths is guarded by
+a single `if INSTRUMENTATION.enabled:` attribute check, so no clock is read and
+nothing is allocated until instrumentation is switched on (enable(), or the
+ESTIMAIT_INSTRUMENTATION=1 environment variable).
+
+Metrics recorded by the tools:
+
+    geotech_stage_seconds{stage}              assess / validate / build / breakdown / factors / assess_batch
+    geotech_validation_failures_total{field,value}
+    renovation_stage_seconds{stage}           factor / assess
+    renovation_validation_failures_total{field,value}
+    matrix_load_seconds{file}                 initial load and reloads of a matrix
+    registry_load_seconds{file}               registry load / reload
+    registry_validation_seconds               local path validation of a bound registry
+    router_handler_seconds{layer}             per-layer get_knowledge_prompt() handlers
+    cost_cube_build_seconds                   composite cost factor cube (re)builds
+
+Snapshots export to the Prometheus text format or JSON; other formats plug in
+through register_exporter().
+
+Usage:
+    from instrumentation import INSTRUMENTATION, profile_window
+
+    INSTRUMENTATION.enable()
+    ...  # serve traffic
+    print(INSTRUMENTATION.export("prometheus"))
+
+    with profile_window(limit=20) as window:
+        run_workload()
+    print(window.report)
+"""
+
+import bisect
+import cProfile
+import io
+import json
+import math
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Histogram bucket upper bounds in seconds (1 us .. 10 s, roughly 1-2.5-5 steps)
+DEFAULT_BUCKETS = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Label series kept per metric; further label combinations are folded into one overflow series
+MAX_SERIES_PER_METRIC = 1000
+MAX_LABEL_LENGTH = 64
+OVERFLOW_LABELS = (('overflow', 'true'),)
+
+ENV_FLAG = "ESTIMAIT_INSTRUMENTATION"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# ============================================================================
+# METRIC TYPES
+# ============================================================================
+
+class Histogram:
+    """Cumulative-bucket latency histogram"""
+
+    __slots__ = ('bounds', 'counts', 'count', 'sum')
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound below which a q share of observations fall"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return math.inf
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative, buckets = 0, []
+        for bound, count in zip(self.bounds + (math.inf,), self.counts):
+            cumulative += count
+            buckets.append((bound, cumulative))
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': buckets,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99)
+        }
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    """Sorted, stringified, length-capped label pairs"""
+    return tuple(sorted((k, str(v)[:MAX_LABEL_LENGTH]) for k, v in labels.items()))
+
+# ============================================================================
+# INSTRUMENTATION
+# ============================================================================
+
+class _NullTimer:
+    """Context manager that does nothing (instrumentation disabled)"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+_NULL_TIMER = _NullTimer()
+
+class _Timer:
+    """Context manager observing its wall time into a histogram"""
+
+    __slots__ = ('_owner', '_name', '_labels', '_start')
+
+    def __init__(self, owner: "Instrumentation", name: str, labels: Dict[str, Any]):
+        self._owner = owner
+        self._name = name
+        self._labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._owner.observe(self._name, time.perf_counter() - self._start, **self._labels)
+
+class Instrumentation:
+    """
+    Process-wide metric store with an on/off switch
+    """
+
+    def __init__(self, enabled: bool = False, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Initialize an empty metric store
+
+        Args:
+            enabled: Record from the start
+            buckets: Histogram bucket upper bounds in seconds
+        """
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._started = time.time()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Drop all recorded metrics"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._started = time.time()
+
+    @staticmethod
+    def _series(family: Dict[LabelKey, Any], labels: Dict[str, Any]) -> LabelKey:
+        """Label key for a new observation, folded into the overflow series past the cap"""
+        key = _label_key(labels) if labels else ()
+        if key not in family and len(family) >= MAX_SERIES_PER_METRIC:
+            return OVERFLOW_LABELS
+        return key
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        """
+        Record a duration in a histogram
+
+        Args:
+            name: Metric name (e.g. geotech_stage_seconds)
+            seconds: Observed duration
+            **labels: Series labels
+        """
+        with self._lock:
+            family = self._histograms.setdefault(name, {})
+            key = self._series(family, labels)
+            histogram = family.get(key)
+            if histogram is None:
+                histogram = family[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def increment(self, name: str, amount: float = 1, **labels: Any) -> None:
+        """
+        Add to a counter
+
+        Args:
+            name: Metric name (e.g. geotech_validation_failures_total)
+            amount: Increment
+            **labels: Series labels
+        """
+        with self._lock:
+            family = self._counters.setdefault(name, {})
+            key = self._series(family, labels)
+            family[key] = family.get(key, 0) + amount
+
+    def timer(self, name: str, **labels: Any) -> Any:
+        """
+        Time a block into a histogram (a no-op context manager while disabled)
+
+        Args:
+            name: Histogram name
+            **labels: Series labels
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def timed(self, name: str, **labels: Any) -> Callable:
+        """Decorator timing every call of a function (one flag check while disabled)"""
+        def decorator(func: Callable) -> Callable:
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start, **labels)
+            wrapper.__name__ = func.__name__
+            wrapper.__doc__ = func.__doc__
+            wrapper.__wrapped__ = func
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a consistent copy of all metrics
+
+        Returns:
+            Dictionary with enabled, started_at, histograms and counters; each
+            metric maps to a list of {'labels': {...}, ...values} series
+        """
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'started_at': self._started,
+                'histograms': {
+                    name: [{'labels': dict(key), **h.snapshot()} for key, h in family.items()]
+                    for name, family in self._histograms.items()
+                },
+                'counters': {
+                    name: [{'labels': dict(key), 'value': value} for key, value in family.items()]
+                    for name, family in self._counters.items()
+                }
+            }
+
+    def export(self, exporter: Any = "json") -> str:
+        """
+        Render the current metrics
+
+        Args:
+            exporter: Registered exporter name ("json", "prometheus") or a
+                function taking a snapshot() dict and returning text
+
+        Returns:
+            Exported text
+        """
+        if not callable(exporter):
+            if exporter not in EXPORTERS:
+                raise ValueError(f"Unknown exporter '{exporter}'. Available: {sorted(EXPORTERS)}")
+            exporter = EXPORTERS[exporter]
+        return exporter(self.snapshot())
+
+    def write(self, path: str, exporter: Any = "json") -> None:
+        """Export the current metrics to a file (atomically replaced)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.export(exporter))
+        os.replace(tmp_path, path)
+
+# ============================================================================
+# EXPORTERS
+# ============================================================================
+
+def _prometheus_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _prometheus_labels(labels: Dict[str, str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels.items()) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_prometheus_escape(v)}"' for k, v in pairs) + "}"
+
+def _prometheus_number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def export_prometheus(snapshot: Dict[str, Any]) -> str:
+    """Render a snapshot in the Prometheus text exposition format"""
+    lines: List[str] = []
+    for name, series in sorted(snapshot['histograms'].items()):
+        lines.append(f"# TYPE {name} histogram")
+        for s in series:
+            for bound, cumulative in s['buckets']:
+                lines.append(f"{name}_bucket{_prometheus_labels(s['labels'], ('le', _prometheus_number(bound)))} {cumulative}")
+            lines.append(f"{name}_sum{_prometheus_labels(s['labels'])} {_prometheus_number(s['sum'])}")
+            lines.append(f"{name}_count{_prometheus_labels(s['labels'])} {s['count']}")
+    for name, series in sorted(snapshot['counters'].items()):
+        lines.append(f"# TYPE {name} counter")
+        for s in series:
+            lines.append(f"{name}{_prometheus_labels(s['labels'])} {_prometheus_number(s['value'])}")
+    return "\n".join(lines) + "\n"
+
+def export_json(snapshot: Dict[str, Any]) -> str:
+    """Render a snapshot as JSON (infinite bucket bounds as "+Inf")"""
+    def bound(value: float) -> Any:
+        return "+Inf" if value == math.inf else value
+
+    data = dict(snapshot)
+    data['histograms'] = {
+        name: [
+            {**s, 'buckets': [[bound(b), c] for b, c in s['buckets']],
+             'p50': bound(s['p50']), 'p90': bound(s['p90']), 'p99': bound(s['p99'])}
+            for s in series
+        ]
+        for name, series in snapshot['histograms'].items()
+    }
+    return json.dumps(data, indent=2)
+
+EXPORTERS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    'json': export_json,
+    'prometheus': export_prometheus
+}
+
+def register_exporter(name: str, exporter: Callable[[Dict[str, Any]], str]) -> None:
+    """Make an exporter available to Instrumentation.export() by name"""
+    EXPORTERS[name] = exporter
+
+# ============================================================================
+# PROFILING
+# ============================================================================
+
+class ProfileWindow:
+    """Outcome of a profile_window() block"""
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        self.duration_s = 0.0
+        self.report = ""
+
+    def stats(self) -> pstats.Stats:
+        return pstats.Stats(self.profiler)
+
+@contextmanager
+def profile_window(
+    output_path: Optional[str] = None,
+    sort_by: str = "cumulative",
+    limit: int = 30
+) -> Iterator[ProfileWindow]:
+    """
+    Run cProfile for the duration of a with-block
+
+    cProfile only sees the thread that opened the window (run the workload
+    from it, e.g. a service's event loop thread).
+
+    Args:
+        output_path: Also dump raw stats here (for snakeviz / pstats)
+        sort_by: pstats sort key for the text report
+        limit: Functions listed in the text report
+
+    Yields:
+        ProfileWindow whose report / stats() are filled in when the block exits
+    """
+    window = ProfileWindow()
+    start = time.perf_counter()
+    window.profiler.enable()
+    try:
+        yield window
+    finally:
+        window.profiler.disable()
+        window.duration_s = time.perf_counter() - start
+        buffer = io.StringIO()
+        pstats.Stats(window.profiler, stream=buffer).sort_stats(sort_by).print_stats(limit)
+        window.report = buffer.getvalue()
+        if output_path:
+            window.profiler.dump_stats(output_path)
+
+# ============================================================================
+# PROCESS-WIDE INSTANCE
+# ============================================================================
+
+INSTRUMENTATION = Instrumentation(enabled=os.environ.get(ENV_FLAG, "").lower() in ("1", "true", "yes"))
+
+def get_instrumentation() -> Instrumentation:
+    """Get the process-wide instrumentation used by the estimation tools"""
+    return INSTRUMENTATION
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    # Run as a script this file is __main__; the engines report into the imported
+    # instrumentation module, so enable and export that instance
+    from instrumentation import INSTRUMENTATION, profile_window
+    from geotechnical_cost_assessment import GeotechnicalAssessment
+
+    INSTRUMENTATION.enable()
+    matrix_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Data", "GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml")
+    assessment = GeotechnicalAssessment(matrix_file)
+
+    with profile_window(limit=10) as window:
+        for i in range(20000):
+            assessment.assess(["CA_Inland", "TX_Coastal", "NY_Urban"][i % 3], "warehouse", hard_cost=1e7)
+        for bad in ("Mars", "Mars", "Atlantis"):
+            try:
+                assessment.assess(bad)
+            except ValueError:
+                pass
+
+    print(INSTRUMENTATION.export("prometheus"))
+    print(window.report)
@@ -0,0 +1,676 @@
+#!/usr/bin/env python3
+"""
+KNOWLEDGE SEARCH v1.0
+
+Purpose: Offline BM25 section search over the Knowledge Prompts corpus with an incremental on-disk index
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+The corpus is every text file the latest knowledge prompt registry resolves
+to locally (Layer 0-3, GC Specific, LAYER2_PUBLIC_WORKS_v1.0.md, the YAML
+matrices and case database) plus References/*.md. Markdown files are split
+into sections at their headings, YAML files at their top-level keys; very
+long sections are split further at blank lines. Each section is a BM25
+document.
+
+Text is tokenized into lower-cased ASCII words plus overlapping bigrams of
+CJK runs ("地質報告" -> 地質 質報 報告), so mixed English / Chinese content
+and queries match without a segmenter or embedding service.
+
+On-disk layout (<index_dir>/, ignored by git as *.store/):
+
+    manifest.json   format version, BM25 parameters, per-file size / mtime /
+                    SHA-256, and the section table (file, heading, line and
+                    character span, token count)
+    lexicon.json    term -> [byte offset, byte length, document frequency]
+    postings.bin    per term: LEB128 varints of (doc id gap, term frequency)
+
+update() stats every corpus file and re-tokenizes only files whose size or
+mtime changed and whose SHA-256 differs; postings of unchanged files are
+carried over. The corpus file list is cached until the registry or one of
+the corpus directories changes, and update(max_age=...) skips the check
+entirely when the corpus was checked recently, so callers can bring the
+index up to date before every query. Queries decode the postings of their terms on first use and
+score with NumPy, so top-k retrieval takes well under a millisecond.
+
+Usage:
+    from knowledge_search import KnowledgeSearchIndex
+
+    index = KnowledgeSearchIndex()
+    index.update(max_age=5.0)
+    for hit in index.search("liquefaction dewatering 地質", top_k=5):
+        print(f"{hit.score:6.2f}  {hit.relpath} > {hit.heading}")
+
+    python knowledge_search.py update
+    python knowledge_search.py search "healthcare OSHPD 加州" -k 5
+    python knowledge_search.py status
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import yaml
+
+from prompt_content_cache import PromptContentCache, get_prompt_content_cache
+from registry_resolver import REPO_ROOT, find_latest_registry, validate_registry
+
+DEFAULT_INDEX_DIR = os.path.join(REPO_ROOT, "Knowledge Prompts", "search_index.store")
+# Extra corpus files that are not (or not always) referenced by the registry
+EXTRA_CORPUS_GLOBS = (("References", ".md"),)
+# Extensions indexed as text; anything else the registry resolves to (.docx, ...) is skipped
+TEXT_EXTENSIONS = ('.md', '.markdown', '.txt', '.yaml', '.yml')
+
+# Bump when the on-disk layout or tokenizer changes; older indexes are rebuilt
+INDEX_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+LEXICON_FILE = "lexicon.json"
+POSTINGS_FILE = "postings.bin"
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Sections longer than this are split at blank lines
+MAX_SECTION_CHARS = 4000
+SNIPPET_CHARS = 240
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+_TOKEN = re.compile(r"[a-z0-9]+|[㐀-䶿一-鿿豈-﫿]+")
+_MD_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_MD_FENCE = re.compile(r"^\s*(```|~~~)")
+_YAML_TOP_KEY = re.compile(r"^([^\s#\-][^:]*):")
+
+# ============================================================================
+# TOKENIZER
+# ============================================================================
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into index terms
+
+    Args:
+        text: Mixed English / Chinese text
+
+    Returns:
+        Lower-cased ASCII words (stopwords dropped) and CJK bigrams
+        (single CJK characters stay unigrams)
+    """
+    terms = []
+    for match in _TOKEN.finditer(text.lower()):
+        token = match.group()
+        if token[0] < '㐀':
+            if token not in _STOPWORDS:
+                terms.append(token)
+        elif len(token) == 1:
+            terms.append(token)
+        else:
+            terms.extend(token[i:i + 2] for i in range(len(token) - 1))
+    return terms
+
+# ============================================================================
+# SECTIONING
+# ============================================================================
+
+@dataclass(frozen=True)
+class _Section:
+    """Character / line span of one section of a corpus file"""
+    heading: str
+    start_char: int
+    end_char: int
+    start_line: int
+    end_line: int
+
+def split_sections(path: str, content: str) -> List[_Section]:
+    """
+    Split a corpus file into searchable sections
+
+    Args:
+        path: File path (the extension selects Markdown or YAML splitting)
+        content: Decoded file content
+
+    Returns:
+        Sections in file order, covering the whole file
+    """
+    lines = content.splitlines(keepends=True)
+    is_yaml = path.lower().endswith(('.yaml', '.yml'))
+    title = os.path.splitext(os.path.basename(path))[0]
+
+    # (line index, heading) where a new section starts
+    starts: List[Tuple[int, str]] = [(0, title)]
+    trail: List[Tuple[int, str]] = []
+    in_fence = False
+    for i, line in enumerate(lines):
+        if is_yaml:
+            match = _YAML_TOP_KEY.match(line)
+            if match and i > 0:
+                starts.append((i, f"{title} > {match.group(1).strip()}"))
+            continue
+        if _MD_FENCE.match(line):
+            in_fence = not in_fence
+            continue
+        match = None if in_fence else _MD_HEADING.match(line)
+        if match:
+            level = len(match.group(1))
+            trail = [(lvl, text) for lvl, text in trail if lvl < level] + [(level, match.group(2))]
+            heading = " > ".join(text for _, text in trail)
+            if i == 0:
+                starts[0] = (0, heading)
+            else:
+                starts.append((i, heading))
+
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+
+    sections = []
+    bounds = [s for s, _ in starts] + [len(lines)]
+    for (first, heading), last in zip(starts, bounds[1:]):
+        if last <= first:
+            continue
+        sections.extend(_split_long(heading, lines, offsets, first, last))
+    return sections
+
+def _split_long(heading: str, lines: List[str], offsets: List[int], first: int, last: int) -> List[_Section]:
+    """Split lines [first, last) at blank lines into parts of at most MAX_SECTION_CHARS"""
+    parts = []
+    start = first
+    for i in range(first + 1, last):
+        if offsets[i] - offsets[start] >= MAX_SECTION_CHARS and not lines[i].strip():
+            parts.append((start, i))
+            start = i
+    parts.append((start, last))
+    return [
+        _Section(
+            heading=heading if n == 0 else f"{heading} ({n + 1})",
+            start_char=offsets[a],
+            end_char=offsets[b],
+            start_line=a + 1,
+            end_line=b
+        )
+        for n, (a, b) in enumerate(parts)
+    ]
+
+# ============================================================================
+# POSTINGS ENCODING
+# ============================================================================
+
+def encode_postings(docs: List[int], tfs: List[int]) -> bytes:
+    """LEB128-encode a postings list as (doc id gap, term frequency) pairs"""
+    out = bytearray()
+    previous = 0
+    for doc, tf in zip(docs, tfs):
+        for value in (doc - previous, tf):
+            while value >= 0x80:
+                out.append((value & 0x7F) | 0x80)
+                value >>= 7
+            out.append(value)
+        previous = doc
+    return bytes(out)
+
+def decode_postings(data: bytes) -> Tuple[List[int], List[int]]:
+    """Decode encode_postings() output into (doc ids, term frequencies)"""
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    docs, tfs = [], []
+    doc = 0
+    for gap, tf in zip(values[::2], values[1::2]):
+        doc += gap
+        docs.append(doc)
+        tfs.append(tf)
+    return docs, tfs
+
+# ============================================================================
+# SEARCH INDEX
+# ============================================================================
+
+@dataclass
+class SearchHit:
+    """One retrieved section"""
+    path: str
+    relpath: str
+    heading: str
+    start_line: int
+    end_line: int
+    score: float
+    snippet: str
+    text: Optional[str] = None
+
+# corpus_paths() results per (registry, root): (watched paths, their fingerprint, corpus)
+_corpus_cache: Dict[Tuple[str, str], Tuple[List[str], tuple, List[str]]] = {}
+
+def _fingerprint(paths: List[str]) -> tuple:
+    """(mtime, size) of each path (None if missing)"""
+    fingerprint = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            fingerprint.append(None)
+            continue
+        fingerprint.append((st.st_mtime_ns, st.st_size))
+    return tuple(fingerprint)
+
+def corpus_paths(registry_path: Optional[str] = None, root: str = REPO_ROOT) -> List[str]:
+    """
+    List the text files to index
+
+    The result is cached until the registry file or a directory holding
+    corpus files changes (a file added to or removed from a directory
+    changes its mtime), so repeated calls cost a few stats instead of
+    parsing and validating the registry.
+
+    Args:
+        registry_path: Knowledge prompt registry (default: latest in Config/)
+        root: Repository root for the extra corpus directories
+
+    Returns:
+        Sorted absolute paths: the registry's locally resolved text files plus References/*.md
+    """
+    registry_path = os.path.abspath(registry_path or find_latest_registry())
+    cache_key = (registry_path, os.path.abspath(root))
+    cached = _corpus_cache.get(cache_key)
+    if cached is not None and _fingerprint(cached[0]) == cached[1]:
+        return list(cached[2])
+
+    registry_stat = _fingerprint([registry_path])
+    with open(registry_path, 'r', encoding='utf-8') as f:
+        registry = yaml.safe_load(f) or {}
+    paths = set(validate_registry(registry).resolved.values())
+    directories = sorted({os.path.dirname(os.path.abspath(p)) for p in paths})
+    extra = [(os.path.join(root, directory), ext) for directory, ext in EXTRA_CORPUS_GLOBS]
+    watched = directories + [directory for directory, _ in extra]
+    # Fingerprint before listing: a change made while listing shows up on the next call
+    fingerprint = registry_stat + _fingerprint(watched)
+
+    for directory, ext in extra:
+        if os.path.isdir(directory):
+            paths.update(os.path.join(directory, n) for n in os.listdir(directory) if n.lower().endswith(ext))
+    corpus = sorted(os.path.abspath(p) for p in paths if p.lower().endswith(TEXT_EXTENSIONS) and os.path.isfile(p))
+    _corpus_cache[cache_key] = ([registry_path] + watched, fingerprint, corpus)
+    return list(corpus)
+
+class KnowledgeSearchIndex:
+    """
+    BM25 inverted index over corpus sections, persisted in a compact store
+    """
+
+    def __init__(
+        self,
+        index_dir: str = DEFAULT_INDEX_DIR,
+        root: str = REPO_ROOT,
+        content_cache: Optional[PromptContentCache] = None
+    ):
+        """
+        Open (or prepare) an index store
+
+        Args:
+            index_dir: Directory holding manifest.json, lexicon.json and postings.bin
+            root: Paths are stored relative to this directory
+            content_cache: Cache used to read corpus files (default: process-wide)
+        """
+        self.index_dir = index_dir
+        self.root = os.path.abspath(root)
+        self._content = content_cache or get_prompt_content_cache()
+        self._lock = threading.Lock()
+        self._checked_at: Optional[float] = None
+        self._load()
+
+    # ------------------------------------------------------------------------
+    # Store I/O
+    # ------------------------------------------------------------------------
+
+    def _load(self) -> None:
+        """Read the manifest and lexicon; postings are decoded lazily per term"""
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.docs: List[list] = []  # [relpath, heading, start_char, end_char, start_line, end_line, length]
+        self._lexicon: Dict[str, list] = {}
+        self._postings = b""
+        self._decoded: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+        try:
+            with open(os.path.join(self.index_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('format') != INDEX_FORMAT_VERSION:
+                raise ValueError("stale index format")
+            with open(os.path.join(self.index_dir, LEXICON_FILE), 'r', encoding='utf-8') as f:
+                lexicon = json.load(f)
+            with open(os.path.join(self.index_dir, POSTINGS_FILE), 'rb') as f:
+                postings = f.read()
+        except (FileNotFoundError, ValueError, KeyError):
+            self._set_lengths()
+            return
+
+        self.files = manifest['files']
+        self.docs = manifest['docs']
+        self._lexicon = lexicon
+        self._postings = postings
+        self._set_lengths()
+
+    def _set_lengths(self) -> None:
+        self._lengths = np.array([d[6] for d in self.docs], dtype=float)
+        self._avg_length = float(self._lengths.mean()) if len(self._lengths) else 0.0
+
+    def _write(self, files: Dict[str, Any], docs: List[list], postings: Dict[str, Tuple[List[int], List[int]]]) -> None:
+        """Write the store atomically (postings and lexicon first, manifest last)"""
+        os.makedirs(self.index_dir, exist_ok=True)
+        blob = bytearray()
+        lexicon = {}
+        for term in sorted(postings):
+            term_docs, term_tfs = postings[term]
+            data = encode_postings(term_docs, term_tfs)
+            lexicon[term] = [len(blob), len(data), len(term_docs)]
+            blob += data
+
+        manifest = {
+            'format': INDEX_FORMAT_VERSION,
+            'k1': BM25_K1,
+            'b': BM25_B,
+            'files': files,
+            'docs': docs
+        }
+        _atomic_write(self.index_dir, POSTINGS_FILE, bytes(blob))
+        _atomic_write(self.index_dir, LEXICON_FILE, json.dumps(lexicon, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        _atomic_write(self.index_dir, MANIFEST_FILE, json.dumps(manifest, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+    # ------------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------------
+
+    def update(self, paths: Optional[Iterable[str]] = None, max_age: Optional[float] = None) -> Dict[str, int]:
+        """
+        Bring the index up to date with the corpus
+
+        Args:
+            paths: Files to index (default: corpus_paths()); files indexed
+                before but not listed are removed
+            max_age: Skip the check if the whole corpus was checked less than
+                this many seconds ago (default: always check)
+
+        Returns:
+            Dictionary with added, updated, removed, unchanged and sections counts
+        """
+        full = paths is None
+        recently = self._checked_at is not None and max_age is not None and time.monotonic() - self._checked_at < max_age
+        if full and recently:
+            return {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': len(self.files), 'sections': len(self.docs)}
+
+        checked_at = time.monotonic()
+        paths = corpus_paths(root=self.root) if full else [os.path.abspath(p) for p in paths]
+        with self._lock:
+            if full:
+                self._checked_at = checked_at
+            stats = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+            files: Dict[str, Dict[str, Any]] = {}
+            fresh: Dict[str, Tuple[Any, List[_Section]]] = {}
+
+            for path in paths:
+                relpath = os.path.relpath(path, self.root)
+                entry = self.files.get(relpath)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if entry is not None and (entry['size'], entry['mtime_ns']) == (st.st_size, st.st_mtime_ns):
+                    files[relpath] = entry
+                    stats['unchanged'] += 1
+                    continue
+
+                prompt = self._content.read(path, max_age=0)
+                if entry is not None and entry['sha256'] == prompt.sha256:
+                    files[relpath] = dict(entry, size=prompt.size, mtime_ns=prompt.mtime_ns)
+                    stats['unchanged'] += 1
+                    continue
+                files[relpath] = {'size': prompt.size, 'mtime_ns': prompt.mtime_ns, 'sha256': prompt.sha256}
+                fresh[relpath] = (prompt, split_sections(path, prompt.content))
+                stats['updated' if entry is not None else 'added'] += 1
+
+            stats['removed'] = sum(1 for relpath in self.files if relpath not in files)
+            if not fresh and not stats['removed'] and all(
+                    self.files[r].get('mtime_ns') == files[r]['mtime_ns'] for r in files):
+                stats['sections'] = len(self.docs)
+                return stats
+
+            self._rebuild(files, fresh)
+            stats['sections'] = len(self.docs)
+            return stats
+
+    def rebuild(self, paths: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Re-tokenize every corpus file from scratch"""
+        with self._lock:
+            self.files, self.docs, self._lexicon, self._postings, self._decoded = {}, [], {}, b"", {}
+        return self.update(paths)
+
+    def _rebuild(self, files: Dict[str, Dict[str, Any]], fresh: Dict[str, Tuple[Any, List[_Section]]]) -> None:
+        """Merge carried-over postings of unchanged files with freshly tokenized files (lock held)"""
+        # Old doc id -> new doc id for sections of files that are kept as they are
+        kept: Dict[int, int] = {}
+        docs: List[list] = []
+        term_counts: List[Optional[Counter]] = []
+        for relpath in sorted(files):
+            entry = files[relpath]
+            if relpath in fresh:
+                prompt, sections = fresh[relpath]
+                entry['first_doc'] = len(docs)
+                for section in sections:
+                    counts = Counter(tokenize(prompt.content[section.start_char:section.end_char]))
+                    docs.append([relpath, section.heading, section.start_char, section.end_char,
+                                 section.start_line, section.end_line, sum(counts.values())])
+                    term_counts.append(counts)
+            else:
+                old = self.files[relpath]
+                first, count = old['first_doc'], old['sections']
+                entry['first_doc'] = len(docs)
+                for doc in range(first, first + count):
+                    kept[doc] = len(docs)
+                    docs.append(self.docs[doc])
+                    term_counts.append(None)
+            entry['sections'] = len(docs) - entry['first_doc']
+
+        postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        if kept:
+            for term in self._lexicon:
+                term_docs, term_tfs = decode_postings(self._term_bytes(term))
+                for doc, tf in zip(term_docs, term_tfs):
+                    new_doc = kept.get(doc)
+                    if new_doc is not None:
+                        postings.setdefault(term, ([], []))
+                        postings[term][0].append(new_doc)
+                        postings[term][1].append(tf)
+        for doc, counts in enumerate(term_counts):
+            if counts is None:
+                continue
+            for term, tf in counts.items():
+                postings.setdefault(term, ([], []))
+                postings[term][0].append(doc)
+                postings[term][1].append(tf)
+        for term_docs, term_tfs in postings.values():
+            if any(b < a for a, b in zip(term_docs, term_docs[1:])):
+                order = sorted(range(len(term_docs)), key=term_docs.__getitem__)
+                term_docs[:] = [term_docs[i] for i in order]
+                term_tfs[:] = [term_tfs[i] for i in order]
+
+        self._write(files, docs, postings)
+        self._load()
+
+    def _term_bytes(self, term: str) -> bytes:
+        offset, length, _ = self._lexicon[term]
+        return self._postings[offset:offset + length]
+
+    def _term_postings(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Decoded (doc ids, term frequencies) of a term, memoized"""
+        decoded = self._decoded.get(term)
+        if decoded is None and term in self._lexicon:
+            term_docs, term_tfs = decode_postings(self._term_bytes(term))
+            decoded = (np.array(term_docs, dtype=np.intp), np.array(term_tfs, dtype=float))
+            self._decoded[term] = decoded
+        return decoded
+
+    # ------------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        path_prefix: Optional[str] = None,
+        include_text: bool = False
+    ) -> List[SearchHit]:
+        """
+        Retrieve the best-matching sections for a query
+
+        Args:
+            query: Free text (English, Chinese or mixed)
+            top_k: Number of sections to return
+            path_prefix: Only return sections of files under this relative path (whole path components)
+                (e.g. "Knowledge Prompts/Layer 3")
+            include_text: Attach the full section text to each hit
+
+        Returns:
+            Hits ordered by BM25 score, highest first (empty if nothing matches)
+
+        Raises:
+            ValueError: If query is not a string, top_k not an integer or
+                path_prefix not a string
+        """
+        if not isinstance(query, str):
+            raise ValueError(f"query must be a string, got {type(query).__name__}")
+        if isinstance(top_k, bool) or not isinstance(top_k, int):
+            raise ValueError(f"top_k must be an integer, got {top_k!r}")
+        if path_prefix is not None and not isinstance(path_prefix, str):
+            raise ValueError(f"path_prefix must be a string, got {type(path_prefix).__name__}")
+
+        n = len(self.docs)
+        terms = set(tokenize(query))
+        if not n or not terms or top_k <= 0:
+            return []
+
+        scores = np.zeros(n)
+        norm = BM25_K1 * (1.0 - BM25_B + BM25_B * self._lengths / self._avg_length)
+        for term in terms:
+            postings = self._term_postings(term)
+            if postings is None:
+                continue
+            term_docs, term_tfs = postings
+            idf = math.log(1.0 + (n - len(term_docs) + 0.5) / (len(term_docs) + 0.5))
+            scores[term_docs] += idf * term_tfs * (BM25_K1 + 1.0) / (term_tfs + norm[term_docs])
+
+        if path_prefix:
+            prefix = os.path.normpath(path_prefix)
+            allowed = np.fromiter(
+                (d[0] == prefix or d[0].startswith(prefix + os.sep) for d in self.docs), dtype=bool, count=n
+            )
+            scores[~allowed] = 0.0
+
+        matched = np.flatnonzero(scores > 0)
+        if len(matched) > top_k:
+            matched = matched[np.argpartition(-scores[matched], top_k - 1)[:top_k]]
+        order = matched[np.argsort(-scores[matched], kind='stable')]
+        return [self._hit(int(doc), float(scores[doc]), include_text) for doc in order]
+
+    def _hit(self, doc: int, score: float, include_text: bool) -> SearchHit:
+        relpath, heading, start_char, end_char, start_line, end_line, _ = self.docs[doc]
+        path = os.path.join(self.root, relpath)
+        try:
+            text = self._content.read(path).content[start_char:end_char]
+        except FileNotFoundError:
+            text = ""
+        snippet = " ".join(text.split())[:SNIPPET_CHARS]
+        return SearchHit(
+            path=path,
+            relpath=relpath,
+            heading=heading,
+            start_line=start_line,
+            end_line=end_line,
+            score=score,
+            snippet=snippet,
+            text=text if include_text else None
+        )
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get index statistics
+
+        Returns:
+            Dictionary with files, sections, terms, postings_bytes and avg_section_tokens
+        """
+        return {
+            'index_dir': self.index_dir,
+            'files': len(self.files),
+            'sections': len(self.docs),
+            'terms': len(self._lexicon),
+            'postings_bytes': len(self._postings),
+            'avg_section_tokens': self._avg_length
+        }
+
+# ============================================================================
+# UTILITY FUNCTIONS
+# ============================================================================
+
+def _atomic_write(directory: str, name: str, data: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}-", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(directory, name))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def print_hits(hits: List[SearchHit]) -> None:
+    """Print search hits"""
+    for rank, hit in enumerate(hits, start=1):
+        print(f"{rank:>2}. {hit.score:6.2f}  {hit.relpath}:{hit.start_line}-{hit.end_line}")
+        print(f"    {hit.heading}")
+        print(f"    {hit.snippet}")
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Search the Knowledge Prompts corpus")
+    parser.add_argument('command', choices=['update', 'rebuild', 'search', 'status'])
+    parser.add_argument('query', nargs='?', default=None, help="search: query text")
+    parser.add_argument('-k', '--top-k', type=int, default=5)
+    parser.add_argument('--prefix', default=None, help="search: only files under this relative path")
+    parser.add_argument('--index-dir', default=DEFAULT_INDEX_DIR)
+    parser.add_argument('--no-update', action='store_true', help="search: skip the incremental update")
+    args = parser.parse_args(argv)
+
+    index = KnowledgeSearchIndex(args.index_dir)
+    if args.command in ('update', 'rebuild'):
+        stats = index.rebuild() if args.command == 'rebuild' else index.update()
+        print(", ".join(f"{k} {v}" for k, v in stats.items()))
+    elif args.command == 'search':
+        if not args.query:
+            parser.error("search needs a query")
+        if not args.no_update:
+            index.update()
+        print_hits(index.search(args.query, args.top_k, args.prefix))
+    else:
+        for key, value in index.status().items():
+            print(f"{key:<20} {value}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
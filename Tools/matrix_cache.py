@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+SHARED MATRIX CACHE v1.0
+
+Purpose: Process-wide, thread-safe cache of parsed YAML matrices and registries
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+Every GeotechnicalAssessment / KnowledgePromptsRouter instance that points at
+the same file receives the same parsed object. Entries are keyed by resolved
+path and loader (a file parsed two different ways is two entries), and are
+revalidated at most once per check_interval: an unchanged mtime/size
+is a hit, a changed mtime with identical content (SHA-256) is also a hit, and
+only a real content change triggers a reload. Reloads are serialized per path,
+so concurrent callers wait for one parse instead of all parsing at once, and
+the new object is swapped in atomically.
+
+Cached objects are shared: treat them as read-only.
+
+Usage:
+    from matrix_cache import get_shared_cache
+
+    cache = get_shared_cache()
+    registry = cache.get("Config/KNOWLEDGE_PROMPT_REGISTRY_v4.7.yaml")
+    print(cache.stats())
+"""
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import yaml
+
+# ============================================================================
+# DATA STRUCTURES
+# ============================================================================
+
+@dataclass
+class _CacheEntry:
+    """Parsed file plus the fingerprint it was parsed from"""
+    data: Any
+    mtime_ns: int
+    size: int
+    sha256: str
+    loaded_at: float
+    checked_at: float
+
+def load_yaml_file(path: str) -> Any:
+    """Default loader: parse a YAML file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+class SharedMatrixCache:
+    """
+    Thread-safe cache of parsed files keyed by resolved path and loader
+    """
+
+    def __init__(self, check_interval: float = 1.0):
+        """
+        Initialize an empty cache
+
+        Args:
+            check_interval: Seconds between on-disk freshness checks per path
+                (0 checks the file on every get)
+        """
+        self.check_interval = check_interval
+        self._entries: Dict[Tuple[str, Callable[[str], Any]], _CacheEntry] = {}
+        self._keys: Dict[str, str] = {}
+        self._path_locks: Dict[Tuple[str, Callable[[str], Any]], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._reloads = 0
+
+    def get(self, path: str, loader: Optional[Callable[[str], Any]] = None) -> Any:
+        """
+        Get the parsed contents of a file, loading or reloading as needed
+
+        Args:
+            path: File path (resolved before use as the cache key)
+            loader: Function that parses the file at a path (defaults to YAML)
+
+        Returns:
+            Parsed object, shared with every other caller of the same path and loader
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        real_path = self._keys.get(path)
+        if real_path is None:
+            # Resolving is a syscall per path component: do it once per path string
+            real_path = self._keys.setdefault(path, os.path.realpath(path))
+        loader = loader or load_yaml_file
+        key = (real_path, loader)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.checked_at < self.check_interval:
+                self._hits += 1
+                return entry.data
+            path_lock = self._path_locks.setdefault(key, threading.Lock())
+
+        with path_lock:
+            return self._revalidate(key)
+
+    def _revalidate(self, key: Tuple[str, Callable[[str], Any]]) -> Any:
+        """Check a path against its fingerprint and reload it if the content changed"""
+        path, loader = key
+        now = time.monotonic()
+        entry = self._entries.get(key)
+
+        # Another thread may have revalidated while we waited for the path lock
+        if entry is not None and now - entry.checked_at < self.check_interval:
+            with self._lock:
+                self._hits += 1
+            return entry.data
+
+        st = os.stat(path)
+        if entry is not None and (st.st_mtime_ns, st.st_size) == (entry.mtime_ns, entry.size):
+            entry.checked_at = now
+            with self._lock:
+                self._hits += 1
+            return entry.data
+
+        with open(path, 'rb') as f:
+            sha256 = hashlib.sha256(f.read()).hexdigest()
+
+        if entry is not None and sha256 == entry.sha256:
+            # Touched but not modified (e.g. checkout, copy): keep the parsed object
+            entry.mtime_ns, entry.size, entry.checked_at = st.st_mtime_ns, st.st_size, now
+            with self._lock:
+                self._hits += 1
+            return entry.data
+
+        data = loader(path)
+        new_entry = _CacheEntry(
+            data=data,
+            mtime_ns=st.st_mtime_ns,
+            size=st.st_size,
+            sha256=sha256,
+            loaded_at=time.time(),
+            checked_at=now
+        )
+        with self._lock:
+            self._entries[key] = new_entry
+            if entry is None:
+                self._misses += 1
+            else:
+                self._reloads += 1
+        return data
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """
+        Drop cached entries so the next get re-parses
+
+        Args:
+            path: File to drop, under every loader (all files if None)
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                real_path = os.path.realpath(path)
+                for key in [key for key in self._entries if key[0] == real_path]:
+                    del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+
+        Returns:
+            Dictionary with hits, misses, reloads, hit_ratio and per-path entries
+            (suffixed with the loader name when it is not the YAML default)
+        """
+        with self._lock:
+            lookups = self._hits + self._misses + self._reloads
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'reloads': self._reloads,
+                'hit_ratio': self._hits / lookups if lookups else 0.0,
+                'entries': {
+                    _entry_label(path, loader): {'sha256': e.sha256, 'size': e.size, 'loaded_at': e.loaded_at}
+                    for (path, loader), e in self._entries.items()
+                }
+            }
+
+def _entry_label(path: str, loader: Callable[[str], Any]) -> str:
+    """Stats key for an entry: the path, plus the loader name for non-default loaders"""
+    if loader is load_yaml_file:
+        return path
+    return f"{path} [{getattr(loader, '__qualname__', repr(loader))}]"
+
+# ============================================================================
+# PROCESS-WIDE INSTANCE
+# ============================================================================
+
+_shared_cache = SharedMatrixCache()
+
+def get_shared_cache() -> SharedMatrixCache:
+    """Get the process-wide cache used by the estimation engines"""
+    return _shared_cache
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+MATRIX OVERLAYS v1.0
+
+Purpose: Copy-on-write per-GC / per-tenant overrides of the shared geotechnical and renovation matrices
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+One process serves several GCs. Each GC may override individual matrix
+values, such as a region's risk premium or a building-type multiplier, without
+forking the matrix files. An override is a small nested delta:
+
+    geotech:
+      regions:
+        CA_Inland:
+          recommendations:
+            bidding_stage: {risk_premium: 0.03, total: 0.10}
+      building_type_adjustments:
+        healthcare: {adjustment_multiplier: 1.15}
+    renovation:
+      building_types:
+        healthcare:
+          recommendations:
+            bidding_stage: {heavy_factor: 2.4}
+
+apply_overrides() builds the tenant's view by path copying. Only the dicts
+on the path to an overridden value are copied, and shallowly. Every other
+subtree is the shared base object, so the view of a tenant with k overrides
+costs O(k x depth) dict copies, never a deep copy of the matrix. Each engine
+still sees plain dicts, so GeotechnicalAssessment and RenovationCostFactors
+need no special lookup code. They only take an overlay= argument, which is
+re-applied whenever the shared base matrix reloads.
+
+Geotech totals are derived, not overridden independently: a region stage
+or summary whose base_adjustment / risk_premium is overridden without a
+total gets total = base_adjustment + risk_premium in the view (see
+derive_geotech_totals()).
+
+Overlay files live in Data/gc_overlays/<GC_TYPE>.yaml (top-level keys
+geotech and / or renovation, optionally gc_type). The GC type is the same
+key the router's GC_SPECIFIC prompts use, e.g. UPRITE.
+
+Usage:
+    from matrix_overlays import MatrixOverlays
+
+    overlays = MatrixOverlays.from_directory()
+    overlays.register("ACME", geotech={'building_type_adjustments': {'healthcare': {'adjustment_multiplier': 1.15}}})
+    overlays.assessment("ACME").assess("CA_Inland", "healthcare", "BIDDING")
+    overlays.renovation("UPRITE").factor("healthcare", "heavy", "ca_inland")
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import yaml
+
+from geotechnical_cost_assessment import GeotechnicalAssessment
+from matrix_cache import SharedMatrixCache, get_shared_cache
+from matrix_snapshot import load_matrix
+from renovation_cost_factors import DEFAULT_RENOVATION_MATRIX_FILE, RenovationCostFactors
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_GEOTECH_MATRIX_FILE = os.path.join(REPO_ROOT, "Data", "GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml")
+DEFAULT_OVERLAY_DIR = os.path.join(REPO_ROOT, "Data", "gc_overlays")
+
+# Overlay file sections -> matrix they override
+OVERLAY_SECTIONS = ('geotech', 'renovation')
+
+# ============================================================================
+# COPY-ON-WRITE VIEWS
+# ============================================================================
+
+def apply_overrides(base: Mapping, overrides: Mapping) -> Dict:
+    """
+    Build a view of base with overrides applied, sharing every untouched subtree
+
+    Nested dicts in overrides descend into the matching base dict; any other
+    value (number, string, list) replaces the base value. New keys are added.
+
+    Args:
+        base: Shared matrix (never modified)
+        overrides: Nested delta
+
+    Returns:
+        New top-level dict; only dicts on overridden paths are (shallow) copies
+
+    Raises:
+        ValueError: If an override descends into a base value that is not a mapping
+    """
+    return _apply(base, overrides, ())
+
+def _apply(base: Mapping, overrides: Mapping, path: Tuple[str, ...]) -> Dict:
+    view = dict(base)
+    for key, value in overrides.items():
+        if isinstance(value, Mapping) and value:
+            current = base.get(key)
+            if current is None:
+                current = {}
+            elif not isinstance(current, Mapping):
+                raise ValueError(f"Cannot override inside {'.'.join(path + (str(key),))}: "
+                                 f"base value is {type(current).__name__}, not a mapping")
+            view[key] = _apply(current, value, path + (str(key),))
+        else:
+            view[key] = value
+    return view
+
+def derive_geotech_totals(view: Dict, overrides: Mapping) -> Dict:
+    """
+    Re-derive the totals of geotech entries whose components were overridden
+
+    A region's recommendations.<stage>.total and summary.total_adjustment are
+    stored next to the base_adjustment and risk_premium they add up. When an
+    overlay changes either component without giving the total, the stored
+    total is recomputed as base_adjustment + risk_premium in the view, so it
+    cannot go stale. An explicit total in the overlay is kept as given.
+
+    Args:
+        view: Result of apply_overrides(base, overrides); modified in place
+        overrides: The geotech delta
+
+    Returns:
+        The view
+
+    Raises:
+        ValueError: If a derived total's components are not numbers
+    """
+    for region, region_delta in (overrides.get('regions') or {}).items():
+        if not isinstance(region_delta, Mapping):
+            continue
+        entries = [(('summary',), region_delta.get('summary'), 'total_adjustment')]
+        stages = region_delta.get('recommendations')
+        if isinstance(stages, Mapping):
+            entries += [(('recommendations', stage), delta, 'total') for stage, delta in stages.items()]
+        for path, delta, total_key in entries:
+            if not isinstance(delta, Mapping) or total_key in delta:
+                continue
+            if 'base_adjustment' not in delta and 'risk_premium' not in delta:
+                continue
+            # Every dict on an overridden path is already the view's own copy
+            entry = view['regions'][region]
+            for key in path:
+                entry = entry[key]
+            base_adjustment, risk_premium = entry.get('base_adjustment'), entry.get('risk_premium')
+            if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (base_adjustment, risk_premium)):
+                raise ValueError(f"Cannot derive regions.{region}.{'.'.join(map(str, path))}.{total_key}: "
+                                 f"base_adjustment and risk_premium must be numbers, "
+                                 f"got {base_adjustment!r} and {risk_premium!r}")
+            entry[total_key] = round(base_adjustment + risk_premium, 10)
+    return view
+
+def override_paths(overrides: Mapping, prefix: str = "") -> Dict[str, Any]:
+    """
+    Flatten a delta into dotted paths
+
+    Returns:
+        {"regions.CA_Inland.recommendations.bidding_stage.risk_premium": 0.03, ...}
+    """
+    paths = {}
+    for key, value in overrides.items():
+        path = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, Mapping) and value:
+            paths.update(override_paths(value, path))
+        else:
+            paths[path] = value
+    return paths
+
+def build_view(base: Mapping, overrides: Mapping, derive: Optional[Callable[[Dict, Mapping], Dict]] = None) -> Mapping:
+    """Apply a delta (and its derivation) to a base matrix; an empty delta is the base itself"""
+    if not overrides:
+        return base
+    view = apply_overrides(base, overrides)
+    return derive(view, overrides) if derive is not None else view
+
+class MatrixOverlay:
+    """
+    A named delta over one matrix, with its view memoized per base matrix object
+    """
+
+    def __init__(self, name: str, overrides: Mapping, derive: Optional[Callable[[Dict, Mapping], Dict]] = None):
+        """
+        Args:
+            name: Tenant / GC the overlay belongs to
+            overrides: Nested delta (see apply_overrides)
+            derive: Fixes up dependent values of a fresh view (e.g. derive_geotech_totals)
+        """
+        self.name = name
+        self.overrides = overrides
+        self.derive = derive
+        self._base: Optional[Mapping] = None
+        self._view: Optional[Dict] = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<MatrixOverlay {self.name}: {len(override_paths(self.overrides))} overrides>"
+
+    def __reduce__(self):
+        # Process pool workers get the delta only; they build their own view and lock
+        return (MatrixOverlay, (self.name, self.overrides, self.derive))
+
+    def apply(self, base: Mapping) -> Dict:
+        """
+        Get the tenant view of a base matrix
+
+        The same view object is returned until the base object changes (i.e.
+        until the shared cache reloads the file), so engines keep their
+        compiled tables across calls.
+
+        Args:
+            base: Shared base matrix
+
+        Returns:
+            Copy-on-write view
+        """
+        with self._lock:
+            if self._base is not base:
+                self._view = build_view(base, self.overrides, self.derive)
+                self._base = base
+            return self._view
+
+# ============================================================================
+# TENANT REGISTRY
+# ============================================================================
+
+class MatrixOverlays:
+    """
+    Per-GC overlays and their lazily created engines over the shared base matrices
+    """
+
+    def __init__(
+        self,
+        geotech_matrix_file: str = DEFAULT_GEOTECH_MATRIX_FILE,
+        renovation_matrix_file: str = DEFAULT_RENOVATION_MATRIX_FILE,
+        cache: Optional[SharedMatrixCache] = None
+    ):
+        """
+        Initialize an empty registry
+
+        Args:
+            geotech_matrix_file: Base geotechnical matrix
+            renovation_matrix_file: Base renovation matrix
+            cache: Matrix cache shared by every tenant engine (defaults to the process-wide cache)
+        """
+        self.geotech_matrix_file = geotech_matrix_file
+        self.renovation_matrix_file = renovation_matrix_file
+        self._cache = cache or get_shared_cache()
+        self._overlays: Dict[str, Dict[str, MatrixOverlay]] = {}
+        self._engines: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_directory(cls, directory: str = DEFAULT_OVERLAY_DIR, **kwargs) -> "MatrixOverlays":
+        """
+        Create a registry from the overlay files of a directory
+
+        Args:
+            directory: Directory of <GC_TYPE>.yaml overlay files (missing = no overlays)
+            **kwargs: Passed to MatrixOverlays()
+
+        Returns:
+            MatrixOverlays with one tenant per file
+        """
+        overlays = cls(**kwargs)
+        if not os.path.isdir(directory):
+            return overlays
+        for name in sorted(os.listdir(directory)):
+            if name.lower().endswith(('.yaml', '.yml')):
+                overlays.load_file(os.path.join(directory, name))
+        return overlays
+
+    @staticmethod
+    def _key(tenant: Any) -> str:
+        return str(tenant).strip().casefold()
+
+    def load_file(self, path: str) -> str:
+        """
+        Register the overlay file of one GC
+
+        Args:
+            path: YAML file with geotech / renovation sections (gc_type defaults to the file name)
+
+        Returns:
+            Tenant name
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f) or {}
+        unknown = set(data) - set(OVERLAY_SECTIONS) - {'gc_type', 'description'}
+        if unknown:
+            print(f"Warning: Ignoring unknown overlay sections {sorted(unknown)} in {path}")
+        tenant = data.get('gc_type') or os.path.splitext(os.path.basename(path))[0]
+        self.register(tenant, data.get('geotech'), data.get('renovation'))
+        return tenant
+
+    def register(self, tenant: str, geotech: Optional[Mapping] = None, renovation: Optional[Mapping] = None) -> None:
+        """
+        Register (or replace) a tenant's overrides
+
+        Args:
+            tenant: GC type / tenant name (case-insensitive)
+            geotech: Delta over the geotechnical matrix
+            renovation: Delta over the renovation matrix
+        """
+        # Fail on registration rather than on the tenant's first query
+        for overrides, matrix_file, derive in (
+            (geotech, self.geotech_matrix_file, derive_geotech_totals),
+            (renovation, self.renovation_matrix_file, None)
+        ):
+            build_view(self._cache.get(matrix_file, loader=load_matrix), overrides or {}, derive)
+
+        key = self._key(tenant)
+        with self._lock:
+            self._overlays[key] = {
+                'geotech': MatrixOverlay(tenant, geotech or {}, derive_geotech_totals),
+                'renovation': MatrixOverlay(tenant, renovation or {})
+            }
+            self._engines.pop((key, 'geotech'), None)
+            self._engines.pop((key, 'renovation'), None)
+
+    def unregister(self, tenant: str) -> None:
+        """Drop a tenant's overrides and engines"""
+        key = self._key(tenant)
+        with self._lock:
+            self._overlays.pop(key, None)
+            self._engines.pop((key, 'geotech'), None)
+            self._engines.pop((key, 'renovation'), None)
+
+    def tenants(self) -> List[str]:
+        """Registered tenant names"""
+        return [sections['geotech'].name for sections in self._overlays.values()]
+
+    def __contains__(self, tenant: Any) -> bool:
+        return self._key(tenant) in self._overlays
+
+    def overrides(self, tenant: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get a tenant's overrides as dotted paths
+
+        Returns:
+            {'geotech': {path: value}, 'renovation': {path: value}} (empty if unknown)
+        """
+        sections = self._overlays.get(self._key(tenant)) or {}
+        return {name: override_paths(sections[name].overrides) if name in sections else {} for name in OVERLAY_SECTIONS}
+
+    def _engine(self, tenant: Optional[str], section: str) -> Any:
+        """Get (creating once) the engine of a tenant, or the shared base engine for unknown tenants"""
+        key = self._key(tenant) if tenant is not None and self._key(tenant) in self._overlays else ""
+        engine = self._engines.get((key, section))
+        if engine is not None:
+            return engine
+        with self._lock:
+            engine = self._engines.get((key, section))
+            if engine is None:
+                overlay = self._overlays[key][section] if key else None
+                if section == 'geotech':
+                    engine = GeotechnicalAssessment(self.geotech_matrix_file, cache=self._cache, overlay=overlay)
+                else:
+                    engine = RenovationCostFactors(self.renovation_matrix_file, cache=self._cache, overlay=overlay)
+                self._engines[(key, section)] = engine
+            return engine
+
+    def assessment(self, tenant: Optional[str] = None) -> GeotechnicalAssessment:
+        """
+        Get the geotechnical engine of a tenant
+
+        Args:
+            tenant: GC type / tenant (None or unregistered = the base matrix)
+
+        Returns:
+            GeotechnicalAssessment over the tenant's copy-on-write view
+        """
+        return self._engine(tenant, 'geotech')
+
+    def renovation(self, tenant: Optional[str] = None) -> RenovationCostFactors:
+        """
+        Get the renovation factor engine of a tenant
+
+        Args:
+            tenant: GC type / tenant (None or unregistered = the base matrix)
+
+        Returns:
+            RenovationCostFactors over the tenant's copy-on-write view
+        """
+        return self._engine(tenant, 'renovation')
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    overlays = MatrixOverlays()
+    overlays.register(
+        "ACME",
+        geotech={
+            'regions': {'CA_Inland': {'recommendations': {'bidding_stage': {'risk_premium': 0.03}}}},
+            'building_type_adjustments': {'healthcare': {'adjustment_multiplier': 1.15}}
+        },
+        renovation={'building_types': {'healthcare': {'recommendations': {'bidding_stage': {'heavy_factor': 2.4}}}}}
+    )
+
+    for tenant in (None, "ACME"):
+        geo = overlays.assessment(tenant).assess("CA_Inland", "healthcare", "BIDDING")
+        reno = overlays.renovation(tenant).factor("healthcare", "heavy", "ca_inland", "BIDDING")
+        print(f"{tenant or 'base':<6} geotech total {geo.total_adjustment:.2%} final {geo.final_adjustment:.2%}  renovation {reno:.3f}")
+
+    base = overlays.assessment().matrix
+    view = overlays.assessment("ACME").matrix
+    shared = sum(view['regions'][r] is base['regions'][r] for r in base['regions'])
+    print(f"Regions shared with the base matrix: {shared}/{len(base['regions'])}")
+    print(overlays.overrides("ACME"))
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+MATRIX SNAPSHOT MODULE v1.0
+
+Purpose: Compile YAML cost matrices into checksum-keyed binary snapshots for fast startup
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+A snapshot is a pickle file stored next to its YAML source. It holds a small
+header (format version + SHA-256 of the YAML bytes) followed by the parsed
+matrix. load_matrix() uses the snapshot when its checksum matches the YAML on
+disk and otherwise falls back to yaml.safe_load and refreshes the snapshot.
+Snapshots are local build artifacts: only load snapshots this tool wrote.
+
+Usage:
+    from matrix_snapshot import load_matrix
+
+    matrix = load_matrix("Data/GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml")
+
+    # Compile ahead of deployment / inspect freshness
+    python matrix_snapshot.py compile Data/GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml
+    python matrix_snapshot.py status Data/GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+import yaml
+
+# Bump when the snapshot layout changes; older snapshots are then treated as stale
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_SUFFIX = ".snapshot.pkl"
+
+# ============================================================================
+# SNAPSHOT I/O
+# ============================================================================
+
+def snapshot_path_for(yaml_path: str) -> str:
+    """Default snapshot location for a YAML source file"""
+    return yaml_path + SNAPSHOT_SUFFIX
+
+def source_checksum(raw: bytes) -> str:
+    """SHA-256 of the YAML source bytes (the snapshot key)"""
+    return hashlib.sha256(raw).hexdigest()
+
+def read_snapshot_header(snapshot_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read only the header of a snapshot file
+
+    Args:
+        snapshot_path: Path to the snapshot file
+
+    Returns:
+        Header dictionary, or None if the file is missing or unreadable
+    """
+    try:
+        with open(snapshot_path, 'rb') as f:
+            header = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    return header if isinstance(header, dict) else None
+
+def _write_snapshot(snapshot_path: str, checksum: str, source_path: str, data: Any) -> None:
+    """Atomically write header + payload so readers never see a partial file"""
+    header = {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'source_sha256': checksum,
+        'source_file': os.path.basename(source_path),
+        'created': datetime.now(timezone.utc).isoformat()
+    }
+    directory = os.path.dirname(os.path.abspath(snapshot_path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.snapshot-', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, snapshot_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def _read_fresh_snapshot(snapshot_path: str, checksum: str) -> Optional[Any]:
+    """Return the snapshot payload if it matches the checksum, else None"""
+    try:
+        with open(snapshot_path, 'rb') as f:
+            header = pickle.load(f)
+            if not isinstance(header, dict):
+                return None
+            if header.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+                return None
+            if header.get('source_sha256') != checksum:
+                return None
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
+def compile_snapshot(yaml_path: str, snapshot_path: Optional[str] = None) -> str:
+    """
+    Parse a YAML matrix and write its binary snapshot
+
+    Args:
+        yaml_path: Path to the YAML source file
+        snapshot_path: Output path (defaults to <yaml_path>.snapshot.pkl)
+
+    Returns:
+        Path of the written snapshot
+    """
+    snapshot_path = snapshot_path or snapshot_path_for(yaml_path)
+    with open(yaml_path, 'rb') as f:
+        raw = f.read()
+    data = yaml.safe_load(raw)
+    _write_snapshot(snapshot_path, source_checksum(raw), yaml_path, data)
+    return snapshot_path
+
+def load_matrix(
+    yaml_path: str,
+    snapshot_path: Optional[str] = None,
+    write_snapshot: bool = True
+) -> Any:
+    """
+    Load a YAML matrix, preferring a fresh binary snapshot
+
+    Args:
+        yaml_path: Path to the YAML source file (the source of truth)
+        snapshot_path: Snapshot path (defaults to <yaml_path>.snapshot.pkl)
+        write_snapshot: Refresh a missing or stale snapshot after parsing YAML
+
+    Returns:
+        Parsed matrix data
+
+    Raises:
+        FileNotFoundError: If the YAML source does not exist
+    """
+    snapshot_path = snapshot_path or snapshot_path_for(yaml_path)
+    with open(yaml_path, 'rb') as f:
+        raw = f.read()
+    checksum = source_checksum(raw)
+
+    data = _read_fresh_snapshot(snapshot_path, checksum)
+    if data is not None:
+        return data
+
+    data = yaml.safe_load(raw)
+    if write_snapshot:
+        try:
+            _write_snapshot(snapshot_path, checksum, yaml_path, data)
+        except OSError as e:
+            print(f"Warning: Could not write snapshot {snapshot_path}: {e}")
+    return data
+
+def snapshot_status(yaml_path: str, snapshot_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Report whether the snapshot for a YAML file is fresh
+
+    Args:
+        yaml_path: Path to the YAML source file
+        snapshot_path: Snapshot path (defaults to <yaml_path>.snapshot.pkl)
+
+    Returns:
+        Dictionary with paths, checksums and a 'fresh' flag
+    """
+    snapshot_path = snapshot_path or snapshot_path_for(yaml_path)
+    with open(yaml_path, 'rb') as f:
+        checksum = source_checksum(f.read())
+    header = read_snapshot_header(snapshot_path) or {}
+    return {
+        'yaml_path': yaml_path,
+        'snapshot_path': snapshot_path,
+        'source_sha256': checksum,
+        'snapshot_sha256': header.get('source_sha256'),
+        'format_version': header.get('format_version'),
+        'created': header.get('created'),
+        'fresh': (
+            header.get('format_version') == SNAPSHOT_FORMAT_VERSION
+            and header.get('source_sha256') == checksum
+        )
+    }
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compile / inspect binary snapshots of YAML matrices")
+    parser.add_argument('command', choices=['compile', 'status'])
+    parser.add_argument('yaml_paths', nargs='+', help="YAML matrix file(s)")
+    args = parser.parse_args(argv)
+
+    for yaml_path in args.yaml_paths:
+        if args.command == 'compile':
+            path = compile_snapshot(yaml_path)
+            print(f"Compiled {yaml_path} -> {path} ({os.path.getsize(path):,} bytes)")
+        else:
+            status = snapshot_status(yaml_path)
+            state = "FRESH" if status['fresh'] else "STALE"
+            print(f"{state:<6} {status['snapshot_path']} (created {status['created']})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+PROMPT CONTENT CACHE v1.0
+
+Purpose: Size-bounded LRU cache of knowledge prompt file contents
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+Keeps decoded prompt text plus its SHA-256 in memory so repeated chat turns do
+not re-open and re-read the same Layer 0-3 / GC-specific markdown files. Files
+at or above mmap_threshold are hashed and decoded straight from a read-only
+memory map instead of going through buffered reads. Entries are revalidated
+against the file's mtime/size at most once per check_interval, and the least
+recently used entries are evicted once the cached text exceeds max_bytes.
+
+The sha256 of a file is stable for as long as its bytes are, so the LLM layer
+can use it to decide whether a cached prompt prefix is still valid.
+
+Usage:
+    from prompt_content_cache import get_prompt_content_cache
+
+    cache = get_prompt_content_cache()
+    prompt = cache.read("LAYER2_PUBLIC_WORKS_v1.0.md")
+    print(prompt.sha256, len(prompt.content))
+"""
+
+import hashlib
+import mmap
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+# ============================================================================
+# DATA STRUCTURES
+# ============================================================================
+
+@dataclass(frozen=True)
+class PromptContent:
+    """Decoded prompt file and its fingerprint"""
+    path: str
+    content: str
+    sha256: str
+    size: int
+    mtime_ns: int
+
+@dataclass
+class _ContentEntry:
+    """Cached prompt plus the time it was last checked against the file"""
+    prompt: PromptContent
+    checked_at: float
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+class PromptContentCache:
+    """
+    Thread-safe LRU cache of prompt file contents keyed by resolved path
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 32 * 1024 * 1024,
+        mmap_threshold: int = 16 * 1024,
+        check_interval: float = 1.0
+    ):
+        """
+        Initialize an empty cache
+
+        Args:
+            max_bytes: Upper bound on the summed file sizes kept in memory
+            mmap_threshold: Files of at least this many bytes are read via mmap
+            check_interval: Seconds between mtime checks per file
+        """
+        self.max_bytes = max_bytes
+        self.mmap_threshold = mmap_threshold
+        self.check_interval = check_interval
+        self._entries: "OrderedDict[str, _ContentEntry]" = OrderedDict()
+        self._keys: Dict[str, str] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._reloads = 0
+        self._evictions = 0
+
+    def read(self, path: str, max_age: Optional[float] = None) -> PromptContent:
+        """
+        Get the content of a prompt file
+
+        Args:
+            path: File path
+            max_age: Seconds since the last mtime check before re-checking
+                (default: check_interval; 0 always re-checks)
+
+        Returns:
+            PromptContent with decoded text and SHA-256
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        key = self._keys.get(path)
+        if key is None:
+            key = self._keys.setdefault(path, os.path.realpath(path))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            interval = self.check_interval if max_age is None else max_age
+            if entry is not None and time.monotonic() - entry.checked_at < interval:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry.prompt
+
+        st = os.stat(key)
+        if entry is not None and (st.st_mtime_ns, st.st_size) == (entry.prompt.mtime_ns, entry.prompt.size):
+            with self._lock:
+                entry.checked_at = time.monotonic()
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                self._hits += 1
+            return entry.prompt
+
+        prompt = self._read_file(key, st)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.prompt.size
+            if entry is None:
+                self._misses += 1
+            else:
+                self._reloads += 1
+            if prompt.size <= self.max_bytes:
+                self._entries[key] = _ContentEntry(prompt=prompt, checked_at=time.monotonic())
+                self._bytes += prompt.size
+                self._evict()
+        return prompt
+
+    def _read_file(self, path: str, st: os.stat_result) -> PromptContent:
+        """Read, hash and decode a file, memory-mapping large ones"""
+        with open(path, 'rb') as f:
+            if st.st_size >= self.mmap_threshold and st.st_size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                    sha256 = hashlib.sha256(m).hexdigest()
+                    content = str(m, 'utf-8')
+            else:
+                raw = f.read()
+                sha256 = hashlib.sha256(raw).hexdigest()
+                content = raw.decode('utf-8')
+        return PromptContent(
+            path=path,
+            content=content,
+            sha256=sha256,
+            size=st.st_size,
+            mtime_ns=st.st_mtime_ns
+        )
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under max_bytes (lock held)"""
+        while self._bytes > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.prompt.size
+            self._evictions += 1
+
+    def invalidate(self) -> None:
+        """Drop every cached file"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+
+        Returns:
+            Dictionary with hits, misses, reloads, evictions, entries and cached bytes
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'reloads': self._reloads,
+                'evictions': self._evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes
+            }
+
+# ============================================================================
+# PROCESS-WIDE INSTANCE
+# ============================================================================
+
+_prompt_content_cache = PromptContentCache()
+
+def get_prompt_content_cache() -> PromptContentCache:
+    """Get the process-wide prompt content cache"""
+    return _prompt_content_cache
@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+"""
+REGION CALIBRATION v1.0
+
+Purpose: Incremental recalibration of regional historical_data from validated project outcomes
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+Each region's historical_data (total_projects, avg_adjustment, std_dev,
+min / max, by_building_type counts) in the geotechnical matrix is the prior.
+Actual geotechnical adjustments of completed projects are folded into it one
+at a time with Welford's streaming mean / variance, per region and per
+building type, so ingesting k new projects costs O(k) regardless of how many
+projects came before. An optional decay (0 < decay <= 1) scales the existing
+weight before every new project, giving an exponentially weighted mean and
+variance that follow recent work; decay = 1 weights all projects equally.
+The decay is stored in the overlay and reused by later runs; asking for a
+different one on an existing overlay is refused rather than mixing
+weighting schemes in the same accumulators.
+
+Each project's variance against the matrix prediction (final_adjustment at
+the FINAL stage) is tracked too. It replaces the hand-written
+validation_status notes ("VALIDATED (3 projects, variance -2.0 to -4.0 pts)").
+
+The state is written as a JSON overlay next to the matrix
+(<matrix>.calibration.json). GeotechnicalAssessment.get_historical_data()
+merges it over the matrix values, and the matrix YAML itself is never edited.
+Project IDs already folded in are remembered, so re-ingesting the case
+database only adds new cases.
+
+Usage:
+    from geotechnical_cost_assessment import GeotechnicalAssessment
+    from region_calibration import ProjectOutcome, RegionCalibration, outcomes_from_case_database
+
+    calibration = RegionCalibration(GeotechnicalAssessment(matrix_file), decay=0.98)
+    calibration.ingest(outcomes_from_case_database(calibration.assessment))
+    calibration.ingest([ProjectOutcome("P-2026-114", "CA_Inland", "warehouse", 0.065)])
+    calibration.save()
+
+    python region_calibration.py cases
+    python region_calibration.py outcomes actuals.jsonl --decay 0.98
+    python region_calibration.py show CA_Inland
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from case_similarity_matching import DEFAULT_CASE_DATABASE_FILE, facility_category, load_case_records
+from geotechnical_cost_assessment import GeotechnicalAssessment
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MATRIX_FILE = os.path.join(REPO_ROOT, "Data", "GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml")
+
+# Bump when the overlay layout changes
+OVERLAY_FORMAT_VERSION = 1
+
+# Stage whose prediction validated projects are compared against
+VALIDATION_STAGE = "FINAL"
+
+# by_building_type confidence by project count (matches the hand-maintained matrix values)
+CONFIDENCE_THRESHOLDS = ((12, "HIGH"), (5, "MEDIUM"), (0, "LOW"))
+
+# LAYER 3.2 case categories -> matrix building types
+CATEGORY_BUILDING_TYPES = {
+    'Healthcare': 'healthcare',
+    'Warehouse': 'warehouse',
+    'Commercial': 'commercial_office'
+}
+
+# Abbreviations / sub-regions used in the matrix region names -> places they cover
+PLACE_ALIASES = {
+    'la': ('los angeles',),
+    'sf': ('san francisco',),
+    'nyc': ('new york', 'new york city', 'manhattan', 'brooklyn', 'queens', 'bronx', 'staten island'),
+    'inland empire': ('san bernardino', 'riverside', 'ontario', 'colton', 'fontana', 'rancho cucamonga')
+}
+
+_REGION_PLACES = re.compile(r"\(([^)]*)\)")
+
+# ============================================================================
+# STREAMING STATISTICS
+# ============================================================================
+
+@dataclass
+class RunningStats:
+    """Weighted Welford accumulator of one statistic (mean, variance, range)"""
+    count: int = 0
+    weight: float = 0.0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+    @classmethod
+    def from_summary(
+        cls,
+        count: int,
+        mean: float,
+        std_dev: float = 0.0,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None
+    ) -> "RunningStats":
+        """Seed an accumulator from published summary statistics (count, mean, std_dev)"""
+        count = int(count or 0)
+        return cls(
+            count=count,
+            weight=float(count),
+            mean=float(mean or 0.0),
+            m2=float(std_dev or 0.0) ** 2 * count,
+            min=minimum,
+            max=maximum
+        )
+
+    def add(self, value: float, decay: float = 1.0) -> None:
+        """
+        Fold one observation in
+
+        Args:
+            value: Observed value
+            decay: Factor applied to the existing weight first (1.0 = equal weights)
+        """
+        self.weight = self.weight * decay + 1.0
+        self.m2 *= decay
+        delta = value - self.mean
+        self.mean += delta / self.weight
+        self.m2 += delta * (value - self.mean)
+        self.count += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.weight if self.weight > 0 else 0.0
+
+    @property
+    def std_dev(self) -> float:
+        return math.sqrt(max(self.variance, 0.0))
+
+@dataclass
+class ProjectOutcome:
+    """Actual geotechnical adjustment of one completed project"""
+    project_id: str
+    region: str
+    building_type: str
+    actual_adjustment: float
+    predicted_adjustment: Optional[float] = None   # default: matrix final_adjustment at VALIDATION_STAGE
+    source: Optional[str] = None
+
+@dataclass
+class _RegionState:
+    """Calibrated accumulators of one region"""
+    stats: RunningStats
+    by_building_type: Dict[str, RunningStats] = field(default_factory=dict)
+    variance: RunningStats = field(default_factory=RunningStats)
+
+# ============================================================================
+# CALIBRATION
+# ============================================================================
+
+class RegionCalibration:
+    """
+    Streaming recalibration of a matrix's regional historical_data
+    """
+
+    def __init__(
+        self,
+        assessment: GeotechnicalAssessment,
+        overlay_file: Optional[str] = None,
+        decay: Optional[float] = None
+    ):
+        """
+        Load the current calibration state
+
+        Args:
+            assessment: Engine whose matrix provides the priors and predictions
+            overlay_file: Overlay JSON (default: the engine's calibration_file)
+            decay: Recency weighting, 0 < decay <= 1 (1.0 = all projects weigh the same);
+                None uses the overlay's decay (1.0 for a new overlay)
+
+        Raises:
+            ValueError: If decay is out of range or differs from the decay the
+                existing overlay was built with
+        """
+        if decay is not None and not 0.0 < decay <= 1.0:
+            raise ValueError(f"decay must be in (0, 1], got {decay}")
+        self.assessment = assessment
+        self.overlay_file = overlay_file or assessment.calibration_file
+        self.decay = 1.0
+        self.regions: Dict[str, _RegionState] = {}
+        self.projects: set = set()
+        self._load()
+        if decay is not None and decay != self.decay:
+            if self.regions:
+                raise ValueError(
+                    f"Calibration overlay {self.overlay_file} was built with decay {self.decay}, got {decay}. "
+                    "Use the same decay or start a new overlay."
+                )
+            self.decay = decay
+
+    def _load(self) -> None:
+        """Read the overlay's accumulators (the derived historical_data is recomputed on save)"""
+        try:
+            with open(self.overlay_file, 'r', encoding='utf-8') as f:
+                overlay = json.load(f)
+        except FileNotFoundError:
+            return
+        if overlay.get('format') != OVERLAY_FORMAT_VERSION:
+            print(f"Warning: Ignoring calibration overlay with unknown format at {self.overlay_file}")
+            return
+
+        self.decay = float(overlay.get('decay', 1.0))
+        self.projects = set(overlay.get('projects', []))
+        for region, data in (overlay.get('regions') or {}).items():
+            self.regions[region] = _RegionState(
+                stats=RunningStats(**data['stats']),
+                by_building_type={bt: RunningStats(**s) for bt, s in (data.get('by_building_type') or {}).items()},
+                variance=RunningStats(**(data.get('variance') or {}))
+            )
+
+    def _region_state(self, region: str) -> _RegionState:
+        """Get a region's accumulators, seeding them from the matrix on first use"""
+        state = self.regions.get(region)
+        if state is None:
+            historical = self.assessment.regions[region].get('historical_data') or {}
+            state = _RegionState(stats=RunningStats.from_summary(
+                historical.get('total_projects'),
+                historical.get('avg_adjustment'),
+                historical.get('std_dev'),
+                historical.get('min_adjustment'),
+                historical.get('max_adjustment')
+            ))
+            self.regions[region] = state
+        return state
+
+    def _building_type_stats(self, region: str, state: _RegionState, key: str) -> RunningStats:
+        """Get a building type's accumulator, seeding it from the matrix on first use"""
+        stats = state.by_building_type.get(key)
+        if stats is None:
+            historical = self.assessment.regions[region].get('historical_data') or {}
+            prior = (historical.get('by_building_type') or {}).get(key) or {}
+            # Per-building-type priors carry no spread; borrow the region's
+            stats = RunningStats.from_summary(prior.get('count'), prior.get('avg_adjustment'), historical.get('std_dev'))
+            state.by_building_type[key] = stats
+        return stats
+
+    def ingest(self, outcomes: Iterable[ProjectOutcome]) -> Dict[str, int]:
+        """
+        Fold new project outcomes into the regional statistics
+
+        Args:
+            outcomes: Completed projects; IDs ingested before are skipped
+
+        Returns:
+            Dictionary with ingested, duplicates and rejected counts
+        """
+        counts = {'ingested': 0, 'duplicates': 0, 'rejected': 0}
+        for outcome in outcomes:
+            if outcome.project_id in self.projects:
+                counts['duplicates'] += 1
+                continue
+            region = self.assessment.region_keys.canonical(outcome.region)
+            building_type = self.assessment.building_type_keys.canonical(outcome.building_type)
+            if region is None or building_type is None:
+                print(f"Warning: Skipping {outcome.project_id}: unknown region / building type "
+                      f"'{outcome.region}' / '{outcome.building_type}'")
+                counts['rejected'] += 1
+                continue
+
+            predicted = outcome.predicted_adjustment
+            if predicted is None:
+                predicted = self.assessment.factors(region, building_type, VALIDATION_STAGE).final_adjustment
+
+            state = self._region_state(region)
+            key = _historical_key(self.assessment.regions[region], building_type)
+            actual = float(outcome.actual_adjustment)
+            state.stats.add(actual, self.decay)
+            self._building_type_stats(region, state, key).add(actual, self.decay)
+            state.variance.add(actual - predicted, self.decay)
+            self.projects.add(outcome.project_id)
+            counts['ingested'] += 1
+        return counts
+
+    def historical_data(self, region: str) -> Dict[str, Any]:
+        """
+        Calibrated historical_data of a region (only the fields the overlay replaces)
+
+        Args:
+            region: Region ID
+
+        Returns:
+            Dictionary in the matrix historical_data layout
+        """
+        state = self.regions[region]
+        return {
+            'total_projects': state.stats.count,
+            'avg_adjustment': round(state.stats.mean, 6),
+            'std_dev': round(state.stats.std_dev, 6),
+            'min_adjustment': state.stats.min,
+            'max_adjustment': state.stats.max,
+            'by_building_type': {
+                key: {
+                    'avg_adjustment': round(stats.mean, 6),
+                    'count': stats.count,
+                    'confidence': _confidence(stats.count)
+                }
+                for key, stats in state.by_building_type.items()
+            }
+        }
+
+    def validation_status(self, region: str) -> Optional[str]:
+        """Validation note of a region from its prediction variance (None before any project)"""
+        variance = self.regions[region].variance
+        if not variance.count:
+            return None
+        plural = "project" if variance.count == 1 else "projects"
+        return (f"VALIDATED ({variance.count} calibrated {plural}, variance "
+                f"{variance.min * 100:+.1f} to {variance.max * 100:+.1f} pts, mean {variance.mean * 100:+.1f})")
+
+    def save(self) -> str:
+        """
+        Write the overlay atomically
+
+        Returns:
+            Overlay file path
+        """
+        overlay = {
+            'format': OVERLAY_FORMAT_VERSION,
+            'matrix_file': os.path.basename(self.assessment.matrix_file),
+            'decay': self.decay,
+            'updated': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'projects': sorted(self.projects),
+            'regions': {
+                region: {
+                    'historical_data': self.historical_data(region),
+                    'validation_status': self.validation_status(region),
+                    'stats': asdict(state.stats),
+                    'by_building_type': {key: asdict(stats) for key, stats in state.by_building_type.items()},
+                    'variance': asdict(state.variance)
+                }
+                for region, state in self.regions.items()
+            }
+        }
+
+        directory = os.path.dirname(os.path.abspath(self.overlay_file))
+        fd, tmp_path = tempfile.mkstemp(prefix='.calibration-', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(overlay, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.overlay_file)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return self.overlay_file
+
+# ============================================================================
+# CASE DATABASE
+# ============================================================================
+
+def region_places(assessment: GeotechnicalAssessment) -> Dict[str, str]:
+    """
+    Map place names to regions from the matrix region names
+
+    "California Inland (Inland Empire, Tustin, Fresno, Bakersfield)" maps
+    tustin, fresno, ... (and the places PLACE_ALIASES lists for Inland
+    Empire) to CA_Inland. "Orange County" also maps the county "orange".
+
+    Returns:
+        Case-folded place -> region ID (the first region listing a place wins)
+    """
+    places: Dict[str, str] = {}
+    for region, data in assessment.regions.items():
+        match = _REGION_PLACES.search(str(data.get('region_name') or ''))
+        if not match:
+            continue
+        for place in match.group(1).split(','):
+            place = place.strip().casefold()
+            names = [place, *PLACE_ALIASES.get(place, ())]
+            if place.endswith(' county'):
+                names.append(place[:-len(' county')])
+            for name in names:
+                places.setdefault(name, region)
+    return places
+
+def case_region(record: Dict[str, Any], assessment: GeotechnicalAssessment, places: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """
+    Resolve the matrix region of a case record from its location
+
+    City first, then county; a state with a single region needs neither.
+
+    Returns:
+        Region ID, or None if the location is ambiguous or unknown
+    """
+    location = (record.get('Basic_Characteristics') or {}).get('Location') or {}
+    state = str(location.get('State') or '').strip().upper()
+    places = region_places(assessment) if places is None else places
+    for name in (location.get('City'), location.get('County')):
+        region = places.get(str(name or '').strip().casefold())
+        if region is not None and region.split('_', 1)[0].upper() == state:
+            return region
+    state_regions = [r for r in assessment.regions if r.split('_', 1)[0].upper() == state]
+    return state_regions[0] if len(state_regions) == 1 else None
+
+def outcomes_from_case_database(
+    assessment: GeotechnicalAssessment,
+    case_file: str = DEFAULT_CASE_DATABASE_FILE
+) -> List[ProjectOutcome]:
+    """
+    Extract geotechnical outcomes of the completed cases in the LAYER 3 case database
+
+    The actual adjustment is Regional_Characteristics.Geotechnical_Risk.
+
+    Args:
+        assessment: Engine whose regions / building types the cases are mapped to
+        case_file: Case database YAML
+
+    Returns:
+        One ProjectOutcome per usable case (cases without a region, building
+        type or geotechnical figure are reported and skipped)
+    """
+    places = region_places(assessment)
+    outcomes = []
+    for record in load_case_records(case_file):
+        case_id = record.get('Case_ID')
+        basic = record.get('Basic_Characteristics') or {}
+        actual = (record.get('Regional_Characteristics') or {}).get('Geotechnical_Risk')
+        category = facility_category(basic.get('Facility_Type'), basic.get('Project_Type'))
+        region = case_region(record, assessment, places)
+        if case_id is None or not isinstance(actual, (int, float)) or region is None or category is None:
+            print(f"Warning: Skipping case {case_id}: missing region, building type or Geotechnical_Risk")
+            continue
+        outcomes.append(ProjectOutcome(
+            project_id=str(case_id),
+            region=region,
+            building_type=CATEGORY_BUILDING_TYPES[category],
+            actual_adjustment=float(actual),
+            source=os.path.basename(case_file)
+        ))
+    return outcomes
+
+# ============================================================================
+# UTILITY FUNCTIONS
+# ============================================================================
+
+def _historical_key(region_data: Dict, building_type: str) -> str:
+    """by_building_type key of a building type (the matrix spells commercial_office as commercial)"""
+    by_building_type = (region_data.get('historical_data') or {}).get('by_building_type') or {}
+    if building_type in by_building_type:
+        return building_type
+    for key in by_building_type:
+        if building_type.startswith(key):
+            return key
+    return building_type
+
+def _confidence(count: int) -> str:
+    for threshold, label in CONFIDENCE_THRESHOLDS:
+        if count >= threshold:
+            return label
+    return CONFIDENCE_THRESHOLDS[-1][1]
+
+def load_outcomes(path: str) -> List[ProjectOutcome]:
+    """Read ProjectOutcome records from a JSONL file (one object per line)"""
+    outcomes = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                outcomes.append(ProjectOutcome(**json.loads(line)))
+    return outcomes
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Recalibrate regional historical data from project outcomes")
+    parser.add_argument('command', choices=['cases', 'outcomes', 'show'])
+    parser.add_argument('target', nargs='?', default=None,
+                        help="outcomes: JSONL file; show: region (default: all calibrated regions)")
+    parser.add_argument('--matrix', default=DEFAULT_MATRIX_FILE)
+    parser.add_argument('--overlay', default=None, help="Overlay JSON (default: <matrix>.calibration.json)")
+    parser.add_argument('--case-db', default=DEFAULT_CASE_DATABASE_FILE)
+    parser.add_argument('--decay', type=float, default=None, help="Recency weighting (default: the overlay's, else 1.0)")
+    args = parser.parse_args(argv)
+
+    calibration = RegionCalibration(GeotechnicalAssessment(args.matrix), args.overlay, args.decay)
+    if args.command == 'show':
+        regions = [args.target] if args.target else sorted(calibration.regions)
+        for region in regions:
+            region = calibration.assessment.region_keys.require(region)
+            if region not in calibration.regions:
+                print(f"{region}: not calibrated")
+                continue
+            print(json.dumps({region: {
+                'historical_data': calibration.historical_data(region),
+                'validation_status': calibration.validation_status(region)
+            }}, indent=2, ensure_ascii=False))
+        return 0
+
+    if args.command == 'cases':
+        outcomes = outcomes_from_case_database(calibration.assessment, args.case_db)
+    else:
+        if not args.target:
+            parser.error("outcomes needs a JSONL file")
+        outcomes = load_outcomes(args.target)
+    counts = calibration.ingest(outcomes)
+    path = calibration.save()
+    print(", ".join(f"{k} {v}" for k, v in counts.items()) + f" -> {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
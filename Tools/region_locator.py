@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+REGION LOCATOR v1.0
+
+Purpose: Resolve project coordinates (or ZIP codes) to geotechnical matrix regions through a grid index
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+Every region in the geotechnical matrix carries a geographic_bounds box
+(north / south / east / west, decimal degrees). The locator buckets those
+boxes into a uniform lat/lon grid once per matrix; a lookup computes the
+point's cell and tests only the few boxes registered there.
+
+Boxes overlap (CA_Coastal lies inside CA_Inland) and bounds are inclusive,
+so a point can fall in several regions. Ties are broken deterministically:
+the smallest box wins, then the region listed first in the matrix. Finer
+phase 2 subregions therefore take precedence over the broad regions that
+contain them.
+
+The batch variant encodes thousands of sites in a few NumPy operations and
+returns codes into region_ids, which follow the matrix order and can be
+passed straight to GeotechnicalAssessment.assess_batch().
+
+ZIP codes need a ZIP -> (lat, lon) centroid table; none ships with the
+matrix, so pass one in (zip_centroids= or load_zip_centroids() on a CSV with
+zip,lat,lon columns).
+
+Usage:
+    from region_locator import RegionLocator
+
+    locator = assessment.locator()                      # or RegionLocator.from_matrix(matrix)
+    locator.region_for_location(34.06, -117.32)         # -> "CA_Coastal"
+    codes = locator.codes_for_locations(lats, lons)     # -1 where no region matches
+    assessment.assess_batch(codes[codes >= 0], "warehouse", "BIDDING")
+"""
+
+import csv
+import math
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from batch_columns import require_numpy
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only required for the batch API
+    np = None
+
+# Grid cell size used when boxes are large (degrees, about 55 km of latitude)
+DEFAULT_CELL_DEGREES = 0.5
+# Smallest cell size the grid shrinks to for fine subregions
+MIN_CELL_DEGREES = 0.01
+# Upper bound on grid cells; the cell size grows to stay under it
+MAX_GRID_CELLS = 1 << 20
+
+# ============================================================================
+# LOCATOR
+# ============================================================================
+
+class RegionLocator:
+    """
+    Grid index over the geographic_bounds boxes of matrix regions
+    """
+
+    def __init__(
+        self,
+        regions: Mapping[str, Dict[str, Any]],
+        cell_degrees: Optional[float] = None,
+        zip_centroids: Optional[Mapping[str, Tuple[float, float]]] = None
+    ):
+        """
+        Build the grid index
+
+        Args:
+            regions: Region ID -> region data (the matrix 'regions' mapping);
+                regions without geographic_bounds are not locatable
+            cell_degrees: Grid cell size (default: derived from the box sizes)
+            zip_centroids: ZIP code -> (lat, lon), used by region_for_zip()
+        """
+        self.region_ids: List[str] = list(regions)
+        self.zip_centroids = dict(zip_centroids or {})
+
+        boxes = []
+        for code, (region_id, region) in enumerate(regions.items()):
+            box = _read_bounds(region_id, region)
+            if box is not None:
+                boxes.append((code, box))
+
+        # Candidate priority: smallest box, then matrix order
+        boxes.sort(key=lambda item: (_area(item[1]), item[0]))
+        self._boxes: Dict[int, Tuple[float, float, float, float]] = dict(boxes)
+        self._priority = [code for code, _ in boxes]
+
+        if boxes:
+            self._south = min(box[0] for _, box in boxes)
+            self._west = min(box[2] for _, box in boxes)
+            north = max(box[1] for _, box in boxes)
+            east = max(box[3] for _, box in boxes)
+        else:
+            self._south = self._west = north = east = 0.0
+        self._north, self._east = north, east
+        self.cell_degrees = cell_degrees or _default_cell_size(
+            [box for _, box in boxes], north - self._south, east - self._west)
+        self._rows = max(1, math.ceil((north - self._south) / self.cell_degrees))
+        self._cols = max(1, math.ceil((east - self._west) / self.cell_degrees))
+
+        cells: Dict[int, List[int]] = {}
+        for code in self._priority:
+            south, north, west, east = self._boxes[code]
+            row_lo, col_lo = self._cell(south, west)
+            row_hi, col_hi = self._cell(north, east)
+            for row in range(row_lo, row_hi + 1):
+                for col in range(col_lo, col_hi + 1):
+                    cells.setdefault(row * self._cols + col, []).append(code)
+        self._cells: Dict[int, Tuple[int, ...]] = {cell: tuple(codes) for cell, codes in cells.items()}
+        self._batch_tables = None
+
+    @classmethod
+    def from_matrix(cls, matrix: Dict[str, Any], **kwargs) -> "RegionLocator":
+        """Build a locator from a parsed geotechnical matrix"""
+        return cls(matrix.get('regions', {}), **kwargs)
+
+    def __len__(self) -> int:
+        """Number of locatable regions"""
+        return len(self._boxes)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        """Grid row / column of a point inside the grid extent (edges clamp inward)"""
+        row = min(int((lat - self._south) / self.cell_degrees), self._rows - 1)
+        col = min(int((lon - self._west) / self.cell_degrees), self._cols - 1)
+        return row, col
+
+    def _in_extent(self, lat: float, lon: float) -> bool:
+        return self._south <= lat <= self._north and self._west <= lon <= self._east
+
+    # ------------------------------------------------------------------------
+    # Single lookups
+    # ------------------------------------------------------------------------
+
+    def candidates(self, lat: float, lon: float) -> List[str]:
+        """
+        List every region whose box contains a point
+
+        Args:
+            lat: Latitude (decimal degrees)
+            lon: Longitude (decimal degrees, negative west)
+
+        Returns:
+            Region IDs in tie-breaking order (the first one is what
+            region_for_location() returns); empty if none matches
+        """
+        if not self._boxes or not self._in_extent(lat, lon):
+            return []
+        row, col = self._cell(lat, lon)
+        return [
+            self.region_ids[code]
+            for code in self._cells.get(row * self._cols + col, ())
+            if _contains(self._boxes[code], lat, lon)
+        ]
+
+    def code_for_location(self, lat: float, lon: float) -> int:
+        """Code (index into region_ids) of the region containing a point, -1 if none"""
+        if not self._boxes or not self._in_extent(lat, lon):
+            return -1
+        row, col = self._cell(lat, lon)
+        boxes = self._boxes
+        for code in self._cells.get(row * self._cols + col, ()):
+            south, north, west, east = boxes[code]
+            if south <= lat <= north and west <= lon <= east:
+                return code
+        return -1
+
+    def region_for_location(self, lat: float, lon: float) -> Optional[str]:
+        """
+        Find the matrix region for a project location
+
+        Args:
+            lat: Latitude (decimal degrees)
+            lon: Longitude (decimal degrees, negative west)
+
+        Returns:
+            Region ID (smallest containing box wins), or None outside every region
+        """
+        code = self.code_for_location(lat, lon)
+        return self.region_ids[code] if code >= 0 else None
+
+    def region_for_zip(self, zip_code: Any) -> Optional[str]:
+        """
+        Find the matrix region for a ZIP code through the centroid table
+
+        Args:
+            zip_code: ZIP or ZIP+4 (string or int)
+
+        Returns:
+            Region ID, or None if the ZIP is unknown or outside every region
+        """
+        centroid = self.zip_centroids.get(normalize_zip(zip_code))
+        if centroid is None:
+            return None
+        return self.region_for_location(*centroid)
+
+    # ------------------------------------------------------------------------
+    # Batch lookups
+    # ------------------------------------------------------------------------
+
+    def _compile_batch_tables(self) -> Dict[str, Any]:
+        """Dense cell -> candidate-list tables for vectorized lookups"""
+        require_numpy("batch region lookups")
+        lists = sorted(set(self._cells.values()))
+        slot_of = {codes: slot for slot, codes in enumerate(lists, start=1)}
+        width = max((len(codes) for codes in lists), default=1)
+
+        # Slot 0 is the empty candidate list
+        candidates = np.full((len(lists) + 1, width), -1, dtype=np.intp)
+        for codes, slot in slot_of.items():
+            candidates[slot, :len(codes)] = codes
+        cell_slot = np.zeros(self._rows * self._cols, dtype=np.int32)
+        for cell, codes in self._cells.items():
+            cell_slot[cell] = slot_of[codes]
+
+        bounds = np.full((len(self.region_ids) + 1, 4), np.nan)  # last row backs the -1 padding
+        for code, box in self._boxes.items():
+            bounds[code] = box
+        return {'cell_slot': cell_slot, 'candidates': candidates, 'bounds': bounds}
+
+    def codes_for_locations(self, lats: Sequence[float], lons: Sequence[float]) -> "np.ndarray":
+        """
+        Locate many sites at once
+
+        Args:
+            lats: Latitudes (list or NumPy array)
+            lons: Longitudes, same length
+
+        Returns:
+            Integer array of codes into region_ids, -1 where no region matches
+            (also for NaN coordinates)
+        """
+        require_numpy("batch region lookups")
+        if self._batch_tables is None:
+            self._batch_tables = self._compile_batch_tables()
+        tables = self._batch_tables
+
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        if lats.shape != lons.shape:
+            raise ValueError(f"lats and lons differ in shape: {lats.shape} vs {lons.shape}")
+        lats, lons = lats.ravel(), lons.ravel()
+        codes = np.full(lats.shape, -1, dtype=np.intp)
+        inside = (lats >= self._south) & (lats <= self._north) & (lons >= self._west) & (lons <= self._east)
+        if not self._boxes or not inside.any():
+            return codes
+
+        lat_in, lon_in = lats[inside], lons[inside]
+        rows = np.minimum(((lat_in - self._south) / self.cell_degrees).astype(np.intp), self._rows - 1)
+        cols = np.minimum(((lon_in - self._west) / self.cell_degrees).astype(np.intp), self._cols - 1)
+        candidates = tables['candidates'][tables['cell_slot'][rows * self._cols + cols]]
+
+        box = tables['bounds'][candidates]  # (n, width, 4); padding rows are NaN and never match
+        lat_col, lon_col = lat_in[:, None], lon_in[:, None]
+        hit = (box[..., 0] <= lat_col) & (lat_col <= box[..., 1]) & (box[..., 2] <= lon_col) & (lon_col <= box[..., 3])
+        # Candidates are stored in priority order, so the first hit wins
+        first = hit.argmax(axis=1)
+        found = hit[np.arange(len(first)), first]
+        codes[np.flatnonzero(inside)[found]] = candidates[found, first[found]]
+        return codes
+
+    def regions_for_locations(self, lats: Sequence[float], lons: Sequence[float]) -> List[Optional[str]]:
+        """Locate many sites at once, returning region IDs (None where no region matches)"""
+        region_ids = self.region_ids
+        return [region_ids[code] if code >= 0 else None for code in self.codes_for_locations(lats, lons).tolist()]
+
+# ============================================================================
+# UTILITY FUNCTIONS
+# ============================================================================
+
+def _read_bounds(region_id: str, region: Dict[str, Any]) -> Optional[Tuple[float, float, float, float]]:
+    """(south, north, west, east) of a region, or None if it has no usable bounds"""
+    bounds = region.get('geographic_bounds') if isinstance(region, dict) else None
+    if not bounds:
+        return None
+    try:
+        box = (float(bounds['south']), float(bounds['north']), float(bounds['west']), float(bounds['east']))
+    except (KeyError, TypeError, ValueError):
+        print(f"Warning: Region {region_id} has incomplete geographic_bounds; it cannot be located")
+        return None
+    if box[0] > box[1] or box[2] > box[3]:
+        print(f"Warning: Region {region_id} has inverted geographic_bounds {bounds}; it cannot be located")
+        return None
+    return box
+
+def _area(box: Tuple[float, float, float, float]) -> float:
+    return (box[1] - box[0]) * (box[3] - box[2])
+
+def _contains(box: Tuple[float, float, float, float], lat: float, lon: float) -> bool:
+    return box[0] <= lat <= box[1] and box[2] <= lon <= box[3]
+
+def _default_cell_size(boxes: List[Tuple[float, float, float, float]], height: float, width: float) -> float:
+    """Half the smallest box side (within MIN / DEFAULT), grown to respect MAX_GRID_CELLS"""
+    sides = [side for box in boxes for side in (box[1] - box[0], box[3] - box[2]) if side > 0]
+    cell = min(DEFAULT_CELL_DEGREES, max(MIN_CELL_DEGREES, min(sides, default=DEFAULT_CELL_DEGREES) / 2))
+    if height * width / (cell * cell) > MAX_GRID_CELLS:
+        cell = math.sqrt(height * width / MAX_GRID_CELLS)
+    return cell
+
+def normalize_zip(zip_code: Any) -> str:
+    """Five-digit ZIP string ('92324-1234' / 92324 / ' 2134' -> '92324' / '02134')"""
+    return str(zip_code).strip().split('-')[0][:5].zfill(5)
+
+def load_zip_centroids(csv_path: str) -> Dict[str, Tuple[float, float]]:
+    """
+    Load a ZIP centroid table
+
+    Args:
+        csv_path: CSV file with zip, lat and lon columns (header row required)
+
+    Returns:
+        Dictionary of five-digit ZIP -> (lat, lon)
+    """
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        return {
+            normalize_zip(row['zip']): (float(row['lat']), float(row['lon']))
+            for row in csv.DictReader(f)
+        }
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import os
+    from matrix_snapshot import load_matrix
+
+    matrix_file = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "Data", "GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml"
+    )
+    locator = RegionLocator.from_matrix(
+        load_matrix(matrix_file),
+        zip_centroids={'92324': (34.06, -117.32), '92780': (33.74, -117.82)}
+    )
+    print(f"{len(locator)} regions indexed, {locator.cell_degrees}° cells")
+
+    sites = {
+        "Colton, CA": (34.07, -117.31),
+        "San Jose, CA": (37.34, -121.89),
+        "Corpus Christi, TX": (27.80, -97.40),
+        "Manhattan, NY": (40.78, -73.97),
+        "Denver, CO": (39.74, -104.99)
+    }
+    for name, (lat, lon) in sites.items():
+        print(f"{name:<16} -> {locator.region_for_location(lat, lon)}  (all: {locator.candidates(lat, lon)})")
+    for zip_code in ("92324", "92780-1234"):
+        print(f"ZIP {zip_code:<11} -> {locator.region_for_zip(zip_code)}")
+
+    lats, lons = zip(*sites.values())
+    print(f"Batch: {locator.regions_for_locations(lats, lons)}")
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+REGISTRY RESOLVER v1.0
+
+Purpose: Latest knowledge prompt registry discovery and registry-to-local path resolution
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+Python counterpart of getLatestRegistryPath() / resolveLocalPath() in
+src/lib/knowledge.ts. Registry file_path entries are absolute paths from the
+authoring machine (/home/ubuntu/...), so they are remapped to the local
+"Knowledge Prompts" / Data / Tools / Config / References tree by basename.
+
+The local tree is scanned once into a basename index holding the keys of every
+fuzzy pass the TypeScript resolver makes:
+
+    1. Exact normalized name + extension (or a ".md.docx" copy of a ".md" entry)
+    2. Version-agnostic name (normalized name with vX.Y stripped)
+    3. Token overlap (at least 70% of the entry's significant words)
+
+Resolutions are memoized, so a registry is validated in a single up-front pass
+and routers never walk or open missing files on the query path.
+
+Usage:
+    from registry_resolver import find_latest_registry, get_local_path_index, validate_registry
+
+    registry_file = find_latest_registry()
+    validation = validate_registry(yaml.safe_load(open(registry_file)), get_local_path_index())
+    validation.report()
+"""
+
+import bisect
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DEFAULT_CONFIG_DIR = os.path.join(REPO_ROOT, "Config")
+
+REGISTRY_PREFIX = "KNOWLEDGE_PROMPT_REGISTRY_"
+REGISTRY_SUFFIX = ".yaml"
+
+# Same search order as knowledge.ts; "" indexes the files at the repo root
+SEARCH_DIRS = ("", "Knowledge Prompts", "Data", "Tools", "Config", "References")
+
+# Build artifacts living next to the sources (matrix snapshots, case stores, bytecode)
+_SKIPPED_DIRS = ("__pycache__", "node_modules")
+_SKIPPED_DIR_SUFFIXES = (".store",)
+_SKIPPED_FILE_SUFFIXES = (".pkl", ".pyc")
+
+# Minimum version-stripped name length for a version-agnostic match
+MIN_UNVERSIONED_LENGTH = 6
+# Share of a registry name's significant words an entry must contain
+TOKEN_MATCH_THRESHOLD = 0.7
+
+_REGISTRY_VERSION = re.compile(r"v(\d+)[._](\d+)", re.IGNORECASE)
+_DEPRECATED = re.compile(r"deprecated", re.IGNORECASE)
+_SEPARATORS = re.compile(r"[\s._\-]")
+_VERSION = re.compile(r"v\d+[\d.]*")
+
+# ============================================================================
+# NAME NORMALIZATION (mirrors src/lib/knowledge.ts)
+# ============================================================================
+
+def is_deprecated_path(path: str) -> bool:
+    """Check whether a path is marked deprecated (skipped during resolution)"""
+    return bool(_DEPRECATED.search(path))
+
+def normalize_name(name: str) -> str:
+    """Lowercase a name and drop whitespace, dots, underscores and dashes"""
+    return _SEPARATORS.sub("", name.lower())
+
+def strip_version(name: str) -> str:
+    """Normalize a name and remove its vX.Y version markers"""
+    return _VERSION.sub("", normalize_name(name))
+
+def normalize_with_ext(name: str) -> str:
+    """Normalize a file name, keeping its (lowercased) extension"""
+    base, ext = os.path.splitext(name)
+    return normalize_name(base) + ext.lower()
+
+def name_tokens(name: str) -> List[str]:
+    """Significant (3+ character) words of a name, versions removed"""
+    return [t for t in _SEPARATORS.split(_VERSION.sub("", name.lower())) if len(t) > 2]
+
+# ============================================================================
+# REGISTRY DISCOVERY
+# ============================================================================
+
+def registry_version(file_name: str) -> Tuple[int, int]:
+    """
+    Extract the (major, minor) version of a registry file name
+
+    Args:
+        file_name: Registry file name, e.g. KNOWLEDGE_PROMPT_REGISTRY_v4.7.yaml
+
+    Returns:
+        (major, minor), or (0, 0) if the name carries no version
+    """
+    match = _REGISTRY_VERSION.search(file_name)
+    return (int(match.group(1)), int(match.group(2))) if match else (0, 0)
+
+def find_latest_registry(config_dir: str = DEFAULT_CONFIG_DIR) -> str:
+    """
+    Find the highest-versioned knowledge prompt registry in a Config directory
+
+    Versions compare numerically, so v4.10 is newer than v4.9.
+
+    Args:
+        config_dir: Directory holding KNOWLEDGE_PROMPT_REGISTRY_*.yaml files
+
+    Returns:
+        Path of the latest registry file
+
+    Raises:
+        FileNotFoundError: If the directory or a registry file is missing
+    """
+    try:
+        names = os.listdir(config_dir)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config directory not found at {config_dir}") from None
+
+    registries = [n for n in names if n.startswith(REGISTRY_PREFIX) and n.endswith(REGISTRY_SUFFIX)]
+    if not registries:
+        raise FileNotFoundError(f"No {REGISTRY_PREFIX}*{REGISTRY_SUFFIX} found in {config_dir}")
+
+    return os.path.join(config_dir, max(registries, key=lambda n: (registry_version(n), n)))
+
+# ============================================================================
+# LOCAL PATH INDEX
+# ============================================================================
+
+@dataclass(frozen=True)
+class _IndexedFile:
+    """Precomputed match keys of one local file"""
+    path: str
+    name_lower: str
+    norm_ext: str
+    tokens: Tuple[str, ...]
+
+class LocalPathIndex:
+    """
+    Basename index of the local knowledge tree
+
+    Built once from a directory walk; resolve() is then a few dictionary
+    lookups (plus a token scan for names no cheaper pass matches), memoized
+    per registry path.
+    """
+
+    def __init__(self, root: str = REPO_ROOT, search_dirs: Tuple[str, ...] = SEARCH_DIRS):
+        """
+        Initialize and build the index
+
+        Args:
+            root: Repository root the search directories are relative to
+            search_dirs: Directories to index, in priority order ("" = root files)
+        """
+        self.root = root
+        self.search_dirs = tuple(search_dirs)
+        self._lock = threading.Lock()
+        self.rebuild()
+
+    def _walk(self) -> Iterator[str]:
+        """Yield indexable files in priority order (sorted within each directory)"""
+        seen = set()
+        for search_dir in self.search_dirs:
+            top = os.path.join(self.root, search_dir)
+            if not os.path.isdir(top):
+                continue
+            for dirpath, dirnames, filenames in os.walk(top):
+                if not search_dir:
+                    # Root: only its own files; subtrees come from their search dirs
+                    dirnames[:] = []
+                else:
+                    dirnames[:] = sorted(
+                        d for d in dirnames
+                        if not d.startswith(".")
+                        and d not in _SKIPPED_DIRS
+                        and not d.endswith(_SKIPPED_DIR_SUFFIXES)
+                        and not is_deprecated_path(d)
+                    )
+                for name in sorted(filenames):
+                    if name.startswith(".") or name.endswith(_SKIPPED_FILE_SUFFIXES) or is_deprecated_path(name):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    if path not in seen:
+                        seen.add(path)
+                        yield path
+
+    def rebuild(self) -> None:
+        """Rescan the local tree and drop memoized resolutions"""
+        files = []
+        exact = {}
+        unversioned = {}
+        for path in self._walk():
+            name = os.path.basename(path)
+            indexed = _IndexedFile(
+                path=path,
+                name_lower=name.lower(),
+                norm_ext=normalize_with_ext(name),
+                tokens=tuple(name_tokens(os.path.splitext(name)[0]))
+            )
+            files.append(indexed)
+            exact.setdefault(indexed.norm_ext, path)
+            unversioned.setdefault(strip_version(os.path.splitext(name)[0]), path)
+
+        # Sorted (norm_ext, priority) pairs for prefix lookups of ".md" -> ".md.docx"
+        prefixes = sorted((f.norm_ext, i) for i, f in enumerate(files))
+
+        with self._lock:
+            self._files = files
+            self._exact = exact
+            self._unversioned = unversioned
+            self._prefix_keys = [key for key, _ in prefixes]
+            self._prefix_order = [i for _, i in prefixes]
+            self._resolved: Dict[str, Optional[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def resolve(self, registry_path: str) -> Optional[str]:
+        """
+        Resolve a registry file_path to a local file
+
+        Args:
+            registry_path: Path as written in the registry
+
+        Returns:
+            Local file path, or None if the path is deprecated or has no local match
+        """
+        resolved = self._resolved.get(registry_path, False)
+        if resolved is not False:
+            return resolved
+
+        if is_deprecated_path(registry_path):
+            resolved = None
+        elif os.path.isfile(registry_path):
+            resolved = registry_path
+        else:
+            resolved = self._match(os.path.basename(registry_path))
+
+        with self._lock:
+            self._resolved[registry_path] = resolved
+        return resolved
+
+    def _match(self, target: str) -> Optional[str]:
+        """Run the knowledge.ts fuzzy passes against the index"""
+        target_base = os.path.splitext(target)[0]
+
+        # Pass 1: exact normalized name, else a longer name on disk (".md.docx" for ".md")
+        path = self._exact.get(normalize_with_ext(target))
+        if path:
+            return path
+        base_norm = normalize_name(target_base)
+        if base_norm:
+            start = bisect.bisect_left(self._prefix_keys, base_norm)
+            candidates = []
+            for key, i in zip(self._prefix_keys[start:], self._prefix_order[start:]):
+                if not key.startswith(base_norm):
+                    break
+                if base_norm in self._files[i].name_lower:
+                    candidates.append(i)
+            if candidates:
+                return self._files[min(candidates)].path
+
+        # Pass 2: version-agnostic name
+        no_version = strip_version(target_base)
+        if len(no_version) >= MIN_UNVERSIONED_LENGTH:
+            path = self._unversioned.get(no_version)
+            if path:
+                return path
+
+        # Pass 3: token overlap ("PROMPT" vs "PRODUCTION" and the like)
+        target_tokens = name_tokens(target_base)
+        if target_tokens:
+            for indexed in self._files:
+                matched = sum(
+                    1 for tt in target_tokens
+                    if any(et in tt or tt in et for et in indexed.tokens)
+                )
+                if matched / len(target_tokens) >= TOKEN_MATCH_THRESHOLD:
+                    return indexed.path
+
+        return None
+
+_shared_indexes: Dict[str, LocalPathIndex] = {}
+_shared_lock = threading.Lock()
+
+def get_local_path_index(root: str = REPO_ROOT) -> LocalPathIndex:
+    """Get the process-wide local path index of a repository root"""
+    root = os.path.abspath(root)
+    with _shared_lock:
+        index = _shared_indexes.get(root)
+        if index is None:
+            index = LocalPathIndex(root)
+            _shared_indexes[root] = index
+        return index
+
+# ============================================================================
+# REGISTRY VALIDATION
+# ============================================================================
+
+@dataclass
+class RegistryValidation:
+    """Outcome of resolving every file_path of a registry"""
+    resolved: Dict[str, str] = field(default_factory=dict)
+    missing: List[str] = field(default_factory=list)
+    deprecated: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing
+
+    def report(self, label: str = "registry") -> None:
+        """Print a single warning listing the unresolved files, if any"""
+        if self.missing:
+            print(f"Warning: {len(self.missing)} {label} file(s) not found locally: " + ", ".join(
+                os.path.basename(p) for p in self.missing))
+
+def iter_registry_paths(node: Any) -> Iterator[str]:
+    """Yield every file_path value of a parsed registry, depth first"""
+    if isinstance(node, dict):
+        file_path = node.get("file_path")
+        if isinstance(file_path, str) and file_path:
+            yield file_path
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                yield from iter_registry_paths(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from iter_registry_paths(value)
+
+def validate_registry(registry: Dict[str, Any], index: Optional[LocalPathIndex] = None) -> RegistryValidation:
+    """
+    Resolve every file_path of a registry against the local tree
+
+    Args:
+        registry: Parsed registry
+        index: Local path index (defaults to the process-wide repo index)
+
+    Returns:
+        RegistryValidation mapping registry paths to local files, plus the
+        missing and deprecated ones
+    """
+    index = index or get_local_path_index()
+    validation = RegistryValidation()
+    for registry_path in iter_registry_paths(registry or {}):
+        if registry_path in validation.resolved:
+            continue
+        local_path = index.resolve(registry_path)
+        if local_path:
+            validation.resolved[registry_path] = local_path
+        elif is_deprecated_path(registry_path):
+            validation.deprecated.append(registry_path)
+        elif registry_path not in validation.missing:
+            validation.missing.append(registry_path)
+    return validation
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import yaml
+
+    registry_file = find_latest_registry()
+    print(f"Using registry: {os.path.relpath(registry_file, REPO_ROOT)}")
+
+    index = get_local_path_index()
+    with open(registry_file, "r", encoding="utf-8") as f:
+        validation = validate_registry(yaml.safe_load(f), index)
+
+    print(f"Indexed {len(index)} local files")
+    for registry_path, local_path in validation.resolved.items():
+        print(f"  {os.path.basename(registry_path):<60} -> {os.path.relpath(local_path, REPO_ROOT)}")
+    validation.report()
@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""
+RENOVATION COST FACTOR MODULE v1.0
+
+Purpose: Evaluate renovation cost factors from the renovation cost factor matrix
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+Implements the matrix's usage instructions:
+
+    final_factor = base_factor (building type x scope x stage recommendation)
+                   x regional_adjustment (building type region, else top-level region)
+    renovation_cost = new_construction_cost x final_factor
+
+Every (building type, scope, region, stage) combination is precompiled into a
+flat dictionary when the matrix is loaded, so factor() is a single dict lookup
+and cheap enough for per-line-item loops. assess() adds the breakdown
+(confidence, reuse factors, cost indices, risk adders) and assess_batch()
+evaluates whole columns through dense NumPy tables.
+
+Usage:
+    from renovation_cost_factors import RenovationCostFactors
+
+    renovation = RenovationCostFactors()
+    factor = renovation.factor("commercial_office", "moderate", "ca_bay_area", "BIDDING")
+    result = renovation.assess("commercial_office", "moderate", "ca_bay_area", new_construction_cost=400)
+    print(result.final_factor, result.renovation_cost)
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from batch_columns import batch_length, encode_column, require_numpy
+from canonical_keys import MAX_LEARNED_ALIASES, RECOMMENDATION_KEYS, STAGES, KeyAliases
+from instrumentation import INSTRUMENTATION
+from matrix_cache import SharedMatrixCache, get_shared_cache
+from matrix_snapshot import load_matrix
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only required for the batch API
+    np = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RENOVATION_MATRIX_FILE = os.path.join(REPO_ROOT, "Data", "RENOVATION_COST_FACTOR_MATRIX_v1.1.yaml")
+
+# Renovation scopes, their recommendation keys and their renovation_factors level
+RENOVATION_SCOPES = ('light', 'moderate', 'heavy')
+SCOPE_LEVELS = {
+    'light': 'level_1_cosmetic',
+    'moderate': 'level_2_moderate',
+    'heavy': 'level_3_major'
+}
+SCOPES = KeyAliases(
+    RENOVATION_SCOPES,
+    aliases={f"{scope}_renovation": scope for scope in RENOVATION_SCOPES},
+    label="Renovation scope"
+)
+
+# ============================================================================
+# DATA STRUCTURES
+# ============================================================================
+
+@dataclass
+class RenovationFactorResult:
+    """Result of a renovation cost factor lookup"""
+    building_type: str
+    renovation_scope: str
+    region: str
+    stage: str
+    base_factor: float
+    regional_adjustment: float
+    final_factor: float
+    confidence: str
+    breakdown: Dict
+    new_construction_cost: Optional[float] = None
+    renovation_cost: Optional[float] = None
+
+# ============================================================================
+# RENOVATION FACTOR ENGINE
+# ============================================================================
+
+class RenovationCostFactors:
+    """
+    Precompiled renovation factor tables over the renovation cost factor matrix
+    """
+
+    def __init__(
+        self,
+        matrix_file: str = DEFAULT_RENOVATION_MATRIX_FILE,
+        cache: Optional[SharedMatrixCache] = None,
+        auto_reload: bool = True,
+        overlay: Optional[Any] = None
+    ):
+        """
+        Initialize the engine with matrix data
+
+        Args:
+            matrix_file: Path to the renovation cost factor matrix YAML
+            cache: Matrix cache (defaults to the process-wide shared cache)
+            auto_reload: Pick up matrix file changes on the next call
+            overlay: Copy-on-write overrides applied to the shared matrix
+                (a matrix_overlays.MatrixOverlay, e.g. one GC's factors)
+        """
+        self.matrix_file = matrix_file
+        self.overlay = overlay
+        self.auto_reload = auto_reload
+        self._cache = cache or get_shared_cache()
+        self._bind(self._load_matrix())
+
+    def _load_matrix(self) -> Dict:
+        """Load the matrix from YAML (via its binary snapshot when fresh)"""
+        start = time.perf_counter() if INSTRUMENTATION.enabled else None
+        try:
+            matrix = self._overlaid(self._cache.get(self.matrix_file, loader=load_matrix))
+        except FileNotFoundError:
+            print(f"Warning: Matrix file not found at {self.matrix_file}")
+            return {}
+        if start is not None:
+            INSTRUMENTATION.observe("matrix_load_seconds", time.perf_counter() - start,
+                                    file=os.path.basename(self.matrix_file))
+        return matrix
+
+    def _overlaid(self, matrix: Dict) -> Dict:
+        """Apply this engine's overlay, if any, to the shared matrix"""
+        return matrix if self.overlay is None else self.overlay.apply(matrix)
+
+    def _bind(self, matrix: Dict) -> None:
+        """Point the engine at a (shared, read-only) matrix and precompile its factors"""
+        self.matrix = matrix
+        self.building_types = matrix.get('building_types', {})
+        self.regional_adjustments = matrix.get('regional_adjustments', {})
+        # Region / building type spellings (CA_Inland, CA_INLAND) resolve to this matrix's keys
+        self.region_keys = KeyAliases(self._region_ids(), label="Region")
+        self.building_type_keys = KeyAliases(self.building_types.keys(), label="Building type")
+        self._factors = self._compile_factors()
+        self._aliases: Dict[tuple, Tuple[float, float, float]] = {}
+        self._lookup_tables = None
+
+    def refresh(self) -> bool:
+        """
+        Re-bind to the current matrix if the file changed on disk
+
+        Returns:
+            True if a newer matrix was picked up
+        """
+        start = time.perf_counter() if INSTRUMENTATION.enabled else None
+        try:
+            matrix = self._overlaid(self._cache.get(self.matrix_file, loader=load_matrix))
+        except FileNotFoundError:
+            return False
+        if matrix is self.matrix:
+            return False
+        if start is not None:
+            INSTRUMENTATION.observe("matrix_load_seconds", time.perf_counter() - start,
+                                    file=os.path.basename(self.matrix_file))
+        self._bind(matrix)
+        return True
+
+    # ------------------------------------------------------------------------
+    # Compilation
+    # ------------------------------------------------------------------------
+
+    def _region_ids(self) -> List[str]:
+        """Regions known to the matrix: top-level first, then building-type-only ones"""
+        region_ids = list(self.regional_adjustments.keys())
+        for bt_data in self.building_types.values():
+            for region in (bt_data.get('regional_adjustments') or {}):
+                if region not in region_ids:
+                    region_ids.append(region)
+        return region_ids
+
+    def _regional_adjustment(self, building_type: str, region: str) -> Optional[float]:
+        """Building-type regional adjustment, falling back to the top-level factor"""
+        bt_regions = self.building_types[building_type].get('regional_adjustments') or {}
+        if region in bt_regions and 'adjustment' in bt_regions[region]:
+            return float(bt_regions[region]['adjustment'])
+        if region in self.regional_adjustments and 'adjustment_factor' in self.regional_adjustments[region]:
+            return float(self.regional_adjustments[region]['adjustment_factor'])
+        return None
+
+    def _compile_factors(self) -> Dict[Tuple[str, str, str, str], Tuple[float, float, float]]:
+        """Flatten the matrix into (bt, scope, region, stage) -> (base, regional, final)"""
+        factors = {}
+        region_ids = self.region_keys.ids
+        for building_type, bt_data in self.building_types.items():
+            recommendations = bt_data.get('recommendations') or {}
+            for region in region_ids:
+                regional = self._regional_adjustment(building_type, region)
+                if regional is None:
+                    continue
+                for stage in STAGES.ids:
+                    rec = recommendations.get(RECOMMENDATION_KEYS[stage]) or {}
+                    for scope in SCOPES.ids:
+                        base = rec.get(f"{scope}_factor")
+                        if base is None:
+                            continue
+                        base = float(base)
+                        factors[(building_type, scope, region, stage)] = (base, regional, base * regional)
+        return factors
+
+    # ------------------------------------------------------------------------
+    # Key normalization
+    # ------------------------------------------------------------------------
+
+    def _normalize(self, building_type: str, renovation_scope: str, region: str, stage: Any) -> Tuple[Any, ...]:
+        """Map user spellings (CA_Bay_Area, light_renovation, bidding, Stage.FINAL) to matrix keys (None if unknown)"""
+        return (
+            self.building_type_keys.canonical(building_type),
+            SCOPES.canonical(renovation_scope),
+            self.region_keys.canonical(region),
+            STAGES.canonical(stage)
+        )
+
+    def _lookup(self, building_type: str, renovation_scope: str, region: str, stage: Any) -> Tuple[float, float, float]:
+        """Find the precompiled factors of a query, remembering the spelling on a hit"""
+        if self.auto_reload:
+            self.refresh()
+        raw_key = (building_type, renovation_scope, region, stage)
+        factors = self._factors.get(raw_key) or self._aliases.get(raw_key)
+        if factors is not None:
+            return factors
+
+        key = self._normalize(building_type, renovation_scope, region, stage)
+        factors = self._factors.get(key)
+        if factors is None:
+            self._raise_unknown(key, (building_type, renovation_scope, region, stage))
+        # Remember alternate spellings for the next call, capped like KeyAliases: callers'
+        # case / whitespace variants must not grow the memo without bound
+        if len(self._aliases) < MAX_LEARNED_ALIASES:
+            self._aliases[raw_key] = factors
+        return factors
+
+    def _raise_unknown(self, key: Tuple[Any, ...], raw_key: Tuple[Any, ...]) -> None:
+        """Raise a ValueError naming the first query component the matrix lacks"""
+        building_type, scope, region, stage = key
+        if building_type is None:
+            _count_failure("building_type", raw_key[0])
+            raise ValueError(f"Building type '{raw_key[0]}' not found. Available: {list(self.building_types.keys())}")
+        if scope is None:
+            _count_failure("renovation_scope", raw_key[1])
+            raise ValueError(f"Renovation scope '{raw_key[1]}' not found. Available: {list(RENOVATION_SCOPES)}")
+        if region is None:
+            _count_failure("region", raw_key[2])
+            raise ValueError(f"Region '{raw_key[2]}' not found in matrix. Available: {list(self.region_keys.ids)}")
+        _count_failure("stage", raw_key[3])
+        raise ValueError(f"No {scope} factor for {building_type} at stage '{stage or raw_key[3]}'")
+
+    # ------------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------------
+
+    def factor(
+        self,
+        building_type: str,
+        renovation_scope: str,
+        region: str,
+        stage: str = "BIDDING"
+    ) -> float:
+        """
+        Get the final renovation factor (base x regional adjustment)
+
+        Args:
+            building_type: Building type (commercial_office, warehouse, healthcare)
+            renovation_scope: Renovation scope (light, moderate, heavy)
+            region: Region (e.g., "ca_inland", "CA_Bay_Area")
+            stage: Project stage (BIDDING, POST_AWARD, FINAL)
+
+        Returns:
+            Final renovation factor
+        """
+        if not INSTRUMENTATION.enabled:
+            return self._lookup(building_type, renovation_scope, region, stage)[2]
+        start = time.perf_counter()
+        final = self._lookup(building_type, renovation_scope, region, stage)[2]
+        INSTRUMENTATION.observe("renovation_stage_seconds", time.perf_counter() - start, stage="factor")
+        return final
+
+    def assess(
+        self,
+        building_type: str,
+        renovation_scope: str = "moderate",
+        region: str = "ca_inland",
+        stage: str = "BIDDING",
+        new_construction_cost: Optional[float] = None
+    ) -> RenovationFactorResult:
+        """
+        Get the renovation factor of a project with its breakdown
+
+        Args:
+            building_type: Building type (commercial_office, warehouse, healthcare)
+            renovation_scope: Renovation scope (light, moderate, heavy)
+            region: Region (e.g., "ca_inland", "CA_Bay_Area")
+            stage: Project stage (BIDDING, POST_AWARD, FINAL)
+            new_construction_cost: New construction cost ($ or $/SF) to convert (optional)
+
+        Returns:
+            RenovationFactorResult with breakdown
+        """
+        start = time.perf_counter() if INSTRUMENTATION.enabled else None
+        base, regional, final = self._lookup(building_type, renovation_scope, region, stage)
+        bt, scope, region_key, stage_value = self._normalize(building_type, renovation_scope, region, stage)
+
+        bt_data = self.building_types[bt]
+        scope_history = ((bt_data.get('historical_data') or {}).get('by_renovation_scope') or {}).get(scope) or {}
+        region_data = self.regional_adjustments.get(region_key) or {}
+        level = SCOPE_LEVELS[scope]
+
+        breakdown = {
+            'formula': "final_factor = base_factor × regional_adjustment",
+            'stage_rationale': ((bt_data.get('recommendations') or {})
+                                .get(RECOMMENDATION_KEYS[stage_value]) or {}).get('rationale'),
+            'renovation_level': level,
+            'reuse_factors': dict((bt_data.get('renovation_factors') or {}).get(level) or {}),
+            'historical_avg_factor': scope_history.get('avg_factor'),
+            'historical_project_count': scope_history.get('count'),
+            'region_name': region_data.get('region_name'),
+            'labor_cost_index': region_data.get('labor_cost_index'),
+            'material_cost_index': region_data.get('material_cost_index'),
+            'risk_adders': {
+                name: {'trigger': adder.get('trigger'), 'value': adder.get('value'), 'note': adder.get('note')}
+                for name, adder in (bt_data.get('risk_adders') or {}).items()
+            }
+        }
+
+        result = RenovationFactorResult(
+            building_type=bt,
+            renovation_scope=scope,
+            region=region_key,
+            stage=stage_value,
+            base_factor=base,
+            regional_adjustment=regional,
+            final_factor=final,
+            confidence=scope_history.get('confidence', 'LOW'),
+            breakdown=breakdown
+        )
+        if new_construction_cost:
+            result.new_construction_cost = new_construction_cost
+            result.renovation_cost = new_construction_cost * final
+        if start is not None:
+            INSTRUMENTATION.observe("renovation_stage_seconds", time.perf_counter() - start, stage="assess")
+        return result
+
+    def lookup_tables(self) -> Dict[str, Any]:
+        """
+        Get the dense building type x scope x region x stage factor tables
+
+        Returns:
+            Dictionary with building_type_ids, scope_ids, region_ids, stage_ids,
+            their *_index dicts, and base_factor / regional_adjustment /
+            final_factor arrays (NaN where the matrix has no value)
+        """
+        if self.auto_reload:
+            self.refresh()
+        if self._lookup_tables is None:
+            self._lookup_tables = self._compile_lookup_tables()
+        return self._lookup_tables
+
+    def _compile_lookup_tables(self) -> Dict[str, Any]:
+        """Scatter the precompiled factors into NumPy arrays"""
+        require_numpy("batch renovation factors")
+
+        building_type_ids = list(self.building_type_keys.ids)
+        scope_ids = list(SCOPES.ids)
+        region_ids = list(self.region_keys.ids)
+        stage_ids = list(STAGES.ids)
+
+        building_type_index = self.building_type_keys.index()
+        scope_index = SCOPES.index()
+        region_index = self.region_keys.index()
+        stage_index = STAGES.index()
+
+        shape = (len(building_type_ids), len(scope_ids), len(region_ids), len(stage_ids))
+        base = np.full(shape, np.nan)
+        regional = np.full(shape, np.nan)
+        final = np.full(shape, np.nan)
+        for (bt, scope, region, stage), values in self._factors.items():
+            idx = (building_type_index[bt], scope_index[scope], region_index[region], stage_index[stage])
+            base[idx], regional[idx], final[idx] = values
+
+        return {
+            'building_type_ids': building_type_ids,
+            'scope_ids': scope_ids,
+            'region_ids': region_ids,
+            'stage_ids': stage_ids,
+            'building_type_index': building_type_index,
+            'scope_index': scope_index,
+            'region_index': region_index,
+            'stage_index': stage_index,
+            'base_factor': base,
+            'regional_adjustment': regional,
+            'final_factor': final
+        }
+
+    def assess_batch(
+        self,
+        building_types: Union[str, Sequence],
+        renovation_scopes: Union[str, Sequence] = "moderate",
+        regions: Union[str, Sequence] = "ca_inland",
+        stages: Union[str, Sequence] = "BIDDING",
+        new_construction_costs: Union[float, Sequence, None] = None
+    ) -> Dict[str, Any]:
+        """
+        Get renovation factors for many line items at once
+
+        Each argument is either a scalar, broadcast to every row, or a list /
+        NumPy array with one value per row. Integer arrays are taken as
+        pre-encoded indices into the '*_ids' lists of lookup_tables().
+
+        Args:
+            building_types: Building type(s)
+            renovation_scopes: Renovation scope(s) (light, moderate, heavy)
+            regions: Region(s) (matrix keys in any case, e.g. ca_inland or CA_Inland)
+            stages: Project stage(s) (BIDDING, POST_AWARD, FINAL)
+            new_construction_costs: New construction cost(s) to convert (optional)
+
+        Returns:
+            Dictionary of NumPy arrays: base_factor, regional_adjustment,
+            final_factor and renovation_cost (NaN where no cost was given)
+        """
+        tables = self.lookup_tables()
+
+        n = batch_length(building_types, renovation_scopes, regions, stages, new_construction_costs)
+        bt_idx = encode_column(building_types, tables['building_type_index'], n, 'Building type', tables['building_type_ids'])
+        scope_idx = encode_column(renovation_scopes, tables['scope_index'], n, 'Renovation scope', tables['scope_ids'])
+        region_idx = encode_column(regions, tables['region_index'], n, 'Region', tables['region_ids'])
+        stage_idx = encode_column(stages, tables['stage_index'], n, 'Stage', tables['stage_ids'])
+
+        idx = (bt_idx, scope_idx, region_idx, stage_idx)
+        final_factor = tables['final_factor'][idx]
+        if np.isnan(final_factor).any():
+            missing = np.flatnonzero(np.isnan(final_factor))[:5]
+            combos = [
+                (tables['building_type_ids'][bt_idx[i]], tables['scope_ids'][scope_idx[i]],
+                 tables['region_ids'][region_idx[i]], tables['stage_ids'][stage_idx[i]])
+                for i in missing.tolist()
+            ]
+            raise ValueError(f"No renovation factor for (building_type, scope, region, stage): {combos}")
+
+        if new_construction_costs is None:
+            renovation_cost = np.full(n, np.nan)
+        else:
+            renovation_cost = np.broadcast_to(np.asarray(new_construction_costs, dtype=float), (n,)) * final_factor
+
+        return {
+            'base_factor': tables['base_factor'][idx],
+            'regional_adjustment': tables['regional_adjustment'][idx],
+            'final_factor': final_factor,
+            'renovation_cost': renovation_cost
+        }
+
+# ============================================================================
+# UTILITY FUNCTIONS
+# ============================================================================
+
+def _count_failure(field: str, value: Any) -> None:
+    """Count a rejected factor query per field / value"""
+    if INSTRUMENTATION.enabled:
+        INSTRUMENTATION.increment("renovation_validation_failures_total", field=field, value=value)
+
+def print_renovation_factor(result: RenovationFactorResult) -> None:
+    """Print a formatted renovation factor result"""
+    print("\n" + "="*80)
+    print(f"RENOVATION COST FACTOR - {result.building_type.upper()} / {result.renovation_scope.upper()}")
+    print("="*80)
+    print(f"Region: {result.region} ({result.breakdown.get('region_name')})")
+    print(f"Stage: {result.stage}")
+    print(f"Confidence: {result.confidence}")
+    print("-"*80)
+    print(f"Base Factor:         {result.base_factor:.2f}x")
+    print(f"Regional Adjustment: {result.regional_adjustment:.2f}x")
+    print(f"Final Factor:        {result.final_factor:.3f}x")
+    if result.renovation_cost is not None:
+        print(f"Renovation Cost:     {result.new_construction_cost:,.2f} → {result.renovation_cost:,.2f}")
+    print("="*80 + "\n")
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+
+    renovation = RenovationCostFactors()
+
+    print("\n### EXAMPLE 1: YTEC Scott Boulevard (commercial office, moderate, Bay Area) ###")
+    print_renovation_factor(renovation.assess("commercial_office", "moderate", "ca_bay_area", "BIDDING",
+                                              new_construction_cost=400))
+
+    print("\n### EXAMPLE 2: Hypothetical healthcare renovation (Houston, TX) ###")
+    print_renovation_factor(renovation.assess("healthcare", "moderate", "TX_Coastal", "BIDDING",
+                                              new_construction_cost=600))
+
+    print("\n### EXAMPLE 3: Line items in one batch ###")
+    batch = renovation.assess_batch(
+        ["commercial_office", "warehouse", "healthcare"],
+        ["light", "moderate", "heavy"],
+        "ca_inland",
+        "POST_AWARD",
+        new_construction_costs=[250.0, 180.0, 600.0]
+    )
+    for name, values in batch.items():
+        print(f"{name:<20} {values}")
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+REPO PATHS v1.0
+
+Purpose: Default data file locations and the versioned router loader shared by the tool entry points
+Status: PRODUCTION - Phase 1
+Created: 2026-10-18
+
+The estimation service and the benchmark harness start the same engines from
+the same files. Keeping the paths here lets the service import them without
+importing the benchmarks. Nothing is resolved at import time: the latest
+registry is looked up when default_registry_file() is called.
+
+Usage:
+    from repo_paths import DEFAULT_MATRIX_FILE, default_registry_file, load_router_module
+
+    router = load_router_module().KnowledgePromptsRouter(default_registry_file())
+"""
+
+import importlib.util
+import os
+
+from registry_resolver import DEFAULT_CONFIG_DIR, REPO_ROOT, find_latest_registry
+
+DEFAULT_MATRIX_FILE = os.path.join(REPO_ROOT, "Data", "GEOTECHNICAL_COST_DRIVER_MATRIX_v1.0.yaml")
+ROUTER_MODULE_FILE = os.path.join(REPO_ROOT, "Knowledge Prompts", "Layer 1", "knowledge_prompts_router_v2.3.py")
+
+def default_registry_file() -> str:
+    """Path of the highest-versioned knowledge prompt registry in Config/"""
+    return find_latest_registry(DEFAULT_CONFIG_DIR)
+
+def load_router_module():
+    """Import the versioned knowledge prompts router module from its file path"""
+    spec = importlib.util.spec_from_file_location("knowledge_prompts_router", ROUTER_MODULE_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module